@@ -0,0 +1,54 @@
+"""Add composite and partial indexes for hot query paths
+
+Revision ID: 3f9c2a7d1b4e
+Revises: e5071c293f65
+Create Date: 2026-10-18 12:05:20.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d1b4e'
+down_revision: Union[str, Sequence[str], None] = 'e5071c293f65'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, partial-index predicate)
+INDEXES = [
+    ('ix_research_sources_request_user_status', 'research_sources', ['request_id', 'user_id', 'verification_status'], None),
+    ('ix_summaries_request_user', 'summaries', ['request_id', 'user_id'], None),
+    ('ix_content_queue_request_user', 'content_queue', ['request_id', 'user_id'], None),
+    ('ix_content_queue_user_status_scheduled', 'content_queue', ['user_id', 'status', 'scheduled_for'], None),
+    ('ix_content_queue_due', 'content_queue', ['scheduled_for'], "status = 'scheduled' AND deleted_at IS NULL"),
+    ('ix_content_queue_posting', 'content_queue', ['dispatch_started_at'], "status = 'posting'"),
+    ('ix_requests_user_created', 'requests', ['user_id', 'created_at', 'id'], None),
+    ('ix_thread_metadata_content_queue_id', 'thread_metadata', ['content_queue_id'], None),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction, and keeps writes to these
+    # (large) tables flowing while each index builds
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
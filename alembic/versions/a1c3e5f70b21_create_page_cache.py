@@ -0,0 +1,44 @@
+"""Create page_cache table
+
+Revision ID: a1c3e5f70b21
+Revises: 
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c3e5f70b21'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'page_cache',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('url_hash', sa.String(length=64), nullable=False),
+        sa.Column('url', sa.Text(), nullable=False),
+        sa.Column('final_url', sa.Text(), nullable=True),
+        sa.Column('status_code', sa.Integer(), nullable=False),
+        sa.Column('etag', sa.String(length=255), nullable=True),
+        sa.Column('last_modified', sa.String(length=64), nullable=True),
+        sa.Column('title', sa.Text(), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('snippet', sa.Text(), nullable=True),
+        sa.Column('fetched_at', sa.DateTime(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('url_hash')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('page_cache')
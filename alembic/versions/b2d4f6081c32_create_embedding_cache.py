@@ -0,0 +1,37 @@
+"""Create embedding_cache table
+
+Revision ID: b2d4f6081c32
+Revises: a1c3e5f70b21
+Create Date: 2026-10-18 14:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d4f6081c32'
+down_revision: Union[str, Sequence[str], None] = 'a1c3e5f70b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'embedding_cache',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('text_hash', sa.String(length=64), nullable=False),
+        sa.Column('vector', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('model', 'text_hash', name='uq_embedding_model_text')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('embedding_cache')
@@ -0,0 +1,58 @@
+"""Create pipeline_jobs table
+
+Revision ID: c3e5071a2d43
+Revises: b2d4f6081c32
+Create Date: 2026-10-18 14:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e5071a2d43'
+down_revision: Union[str, Sequence[str], None] = 'b2d4f6081c32'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'pipeline_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('request_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('stage', sa.String(length=20), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('run_after', sa.DateTime(), nullable=False),
+        sa.Column('locked_by', sa.String(length=100), nullable=True),
+        sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['request_id'], ['requests.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_pipeline_jobs_claim', 'pipeline_jobs', ['status', 'stage', 'run_after'], unique=False)
+    op.create_index(op.f('ix_pipeline_jobs_request_id'), 'pipeline_jobs', ['request_id'], unique=False)
+    op.create_index(
+        'uq_pipeline_jobs_active_request',
+        'pipeline_jobs',
+        ['request_id'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_pipeline_jobs_active_request', table_name='pipeline_jobs')
+    op.drop_index(op.f('ix_pipeline_jobs_request_id'), table_name='pipeline_jobs')
+    op.drop_index('ix_pipeline_jobs_claim', table_name='pipeline_jobs')
+    op.drop_table('pipeline_jobs')
@@ -0,0 +1,28 @@
+"""Add content_queue.dispatch_started_at for the post dispatcher
+
+Revision ID: d4f6182b3e54
+Revises: c3e5071a2d43
+Create Date: 2026-10-18 14:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f6182b3e54'
+down_revision: Union[str, Sequence[str], None] = 'c3e5071a2d43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('content_queue', sa.Column('dispatch_started_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('content_queue', 'dispatch_started_at')
@@ -0,0 +1,28 @@
+"""Add user_configurations.x_access_token for native X posting
+
+Revision ID: e5071c293f65
+Revises: d4f6182b3e54
+Create Date: 2026-10-18 14:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5071c293f65'
+down_revision: Union[str, Sequence[str], None] = 'd4f6182b3e54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('user_configurations', sa.Column('x_access_token', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('user_configurations', 'x_access_token')
@@ -6,14 +6,18 @@ using user configurations and request parameters.
 """
 
 import datetime
-from app.llm.engine import generate_completion
+from app.llm.engine import generate_completion, agenerate_completion, astream_completion
 from app.config import settings
+from app.database import SessionLocal
 from app.models.research_sources import ResearchSource
 from app.models.content_queue import ContentQueue
 from app.models.thread_metadata import ThreadMetadata
+from app.models.requests import Request
+from app.models.summaries import Summary
 from app.services.content_validation import validate_thread_structure, validate_article_length
 from app.utils.offensive_filter import is_offensive_content_enabled, check_offensive_content
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 # --- Core Function ---
 def create_content(
@@ -26,10 +30,93 @@ def create_content(
     """
     Generate content using LLM and save to content_queue (+ thread_metadata if thread).
     """
+    prompt = build_prompt_for_request(request, summary, research_sources, user_config)
+    llm_output = generate_completion(prompt, agent="content_agent")
+    return save_generated_content(db, request, summary, llm_output)
+
+
+async def acreate_content(
+    db: Session,
+    request,
+    summary,
+    research_sources: list[ResearchSource],
+    user_config: dict
+):
+    """
+    Async version of create_content().
+    The LLM call runs on the async engine; validation and persistence run in the threadpool.
+    """
+    prompt = build_prompt_for_request(request, summary, research_sources, user_config)
+    llm_output = await agenerate_completion(prompt, agent="content_agent")
+    return await run_in_threadpool(save_generated_content, db, request, summary, llm_output)
+
+
+async def astream_content(
+    request,
+    summary,
+    research_sources: list[ResearchSource],
+    user_config: dict
+):
+    """
+    Streaming version of create_content().
+    Yields (event, data) pairs as the completion arrives:
+    - ("token", {"text"}) for every delta from the LLM
+    - ("tweet", {"index", "text"}) for threads, as soon as each ==== separator arrives
+    - ("done", {"content_id", "status", "tweets"}) once the rows are saved
+
+    Persistence opens its own session, since the request's session may be gone
+    by the time the stream finishes.
+    """
+    prompt = build_prompt_for_request(request, summary, research_sources, user_config)
+    splitter = TweetStreamSplitter(request.thread_tweet_count) if request.content_type == "thread" else None
+    parts = []
+
+    async for delta in astream_completion(prompt, agent="content_agent"):
+        parts.append(delta)
+        yield "token", {"text": delta}
+        if splitter:
+            for index, tweet in splitter.feed(delta):
+                yield "tweet", {"index": index, "text": tweet}
+
+    if splitter:
+        for index, tweet in splitter.finish():
+            yield "tweet", {"index": index, "text": tweet}
+
+    llm_output = "".join(parts).strip()
+    result = await run_in_threadpool(persist_generated_content, request.id, summary.id, llm_output)
+    yield "done", result
+
+
+def persist_generated_content(request_id: int, summary_id: int, llm_output: str) -> dict:
+    """
+    Saves streamed output through save_generated_content() in a fresh session.
+    """
+    db = SessionLocal()
+    try:
+        request = db.query(Request).filter_by(id=request_id).one()
+        summary = db.query(Summary).filter_by(id=summary_id).one()
+        content = save_generated_content(db, request, summary, llm_output)
+        meta = db.query(ThreadMetadata).filter_by(content_queue_id=content.id).first()
+        return {
+            "content_id": content.id,
+            "status": content.status,
+            "tweets": [t["tweet"] for t in meta.thread_structure] if meta else [],
+        }
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def build_prompt_for_request(request, summary, research_sources: list[ResearchSource], user_config: dict) -> str:
+    """
+    Builds the content prompt from the request settings and its summary.
+    """
     if not summary or not summary.combined_summary:
         raise ValueError("Missing summary content. Cannot generate post.")
     
-    prompt = build_content_prompt(
+    return build_content_prompt(
         request.content_topic,
         summary.combined_summary,
         summary.combined_key_points,
@@ -43,8 +130,12 @@ def create_content(
         # request.max_tweet_length  # <-- Enable this once added to model
     )
 
-    llm_output = generate_completion(prompt, agent="content_agent")
-    print("This is the twwet generation LLM output: \n{llm_output}")
+
+def save_generated_content(db: Session, request, summary, llm_output: str):
+    """
+    Validates the LLM output and saves it to content_queue (+ thread_metadata if thread).
+    """
+    print(f"This is the twwet generation LLM output: \n{llm_output}")
 
     # Optional: Validate structure
     if request.content_type == "thread":
@@ -63,6 +154,7 @@ def create_content(
         tweets = validate_thread_structure(tweets, request.thread_tweet_count)
     else:
         validate_article_length(llm_output, request.max_article_length)
+        joined_thread = llm_output
 
     # Optional: Offensive content check
     if is_offensive_content_enabled() and check_offensive_content(llm_output):
@@ -154,6 +246,39 @@ def split_into_tweets(text: str, max_parts: int = 10) -> list[str]:
     numbered_tweets = [f"{i+1}/{total}  \n{tweet.strip()}" for i, tweet in enumerate(tweets)]
     return numbered_tweets
 
+class TweetStreamSplitter:
+    """
+    Incremental counterpart of split_into_tweets() for streamed output.
+    feed() returns each tweet once the ==== after it has arrived; finish()
+    flushes the last one. Empty parts are skipped and at most max_parts are
+    returned. Tweets are unnumbered: the total is only known at the end.
+    """
+    SEPARATOR = "===="
+
+    def __init__(self, max_parts: int = 10):
+        self.max_parts = max_parts or 10
+        self.buffer = ""
+        self.emitted = 0
+
+    def feed(self, delta: str) -> list[tuple[int, str]]:
+        self.buffer += delta
+        tweets = []
+        while self.SEPARATOR in self.buffer:
+            part, self.buffer = self.buffer.split(self.SEPARATOR, 1)
+            tweets.extend(self._emit(part))
+        return tweets
+
+    def finish(self) -> list[tuple[int, str]]:
+        part, self.buffer = self.buffer, ""
+        return self._emit(part)
+
+    def _emit(self, part: str) -> list[tuple[int, str]]:
+        part = part.strip()
+        if not part or self.emitted >= self.max_parts:
+            return []
+        self.emitted += 1
+        return [(self.emitted, part)]
+
 # Selects top N citations based on relevance and freshness
 def select_top_citations(sources: list, max_count: int) -> list:
     """
@@ -193,8 +318,8 @@ def join_tweets_for_platform(tweets: list[str], platform: str) -> str:
         return "\n\n\n\n".join(tweets)
 
     elif platform == "x":
-        # Future: Use actual threading via Twitter/X API per tweet
-        # For now, join like Typefully
+        # X threads are posted tweet by tweet from ThreadMetadata (thread_publisher);
+        # the joined text is kept for display
         return "\n\n\n\n".join(tweets)
 
     else:
@@ -7,25 +7,299 @@ Fetches high-quality sources for a given topic using AI + Google,
 verifies each one, scores for relevance, and stores the best into the database.
 """
 
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime
+from app.config import settings
 from app.database import SessionLocal
 from app.models.research_sources import ResearchSource
 
 # Modular services
-from app.services.google_search import get_google_search_results
-from app.services.ai_source_discovery import discover_sources_with_ai
+from app.services.source_discovery import discover_sources
 from app.services.source_verification import (
-    is_url_accessible,
-    extract_page_metadata,
+    fetch_page,
     check_relevance_with_ai,
 )
-from app.services.embedding_similarity import calculate_embedding_similarity
-from app.services.source_reuse import is_source_overused, increment_source_usage
+from app.services.embedding_similarity import score_texts_against, relevance_threshold
+from app.services.relevance_cascade import bm25_scores, is_relevant_verdict, record_stage
+from app.services.batch_summariser import summarise_fallback, summarise_sources
+from app.services.source_reuse import (
+    buffer_source_usage,
+    fetch_usage_counts,
+    get_usage_counts,
+    is_overused_count,
+    record_source_usage,
+)
 
 from app.llm.engine import generate_completion
 from app.prompts.summary_prompt import build_source_summary_prompt
 from app.agents.summary_agent import parse_llm_output
+from app.utils.simhash import hamming_distance, simhash
+from app.utils.url import canonicalize_url
+
+def fetch_candidate(source: dict, cancel_event: threading.Event = None) -> dict:
+    """
+    Runs the page fetch for a single candidate source.
+    Safe to call from a worker thread: it never touches the DB.
+
+    Args:
+        source (dict): Candidate with a standardised "url" key
+        cancel_event (threading.Event, optional): Set when the run no longer needs results
+
+    Returns:
+        dict: {"outcome": "fetched" | "failed" | "skipped" | "cancelled", ...}
+    """
+    url = source["url"]
+
+    if cancel_event is not None and cancel_event.is_set():
+        return {"outcome": "cancelled"}
+
+    # --- Check accessibility and extract metadata in one fetch ---
+    page = fetch_page(url)
+    if not page["accessible"]:
+        print(f"❌ URL not accessible: {url} | Reason: {page['status']}")
+        return {"outcome": "failed", "access_status": page["status"]}
+
+    meta = page["metadata"]
+    if not meta or "snippet" not in meta:
+        print(f"⚠️ Skipping: Metadata missing for {url}")
+        return {"outcome": "skipped"}
+
+    return {"outcome": "fetched", "meta": meta, "final_url": page.get("final_url") or url}
+
+
+def judge_candidate(source: dict, fetched: dict, content_topic: str, cancel_event: threading.Event = None) -> dict:
+    """
+    Runs the LLM relevance check for a candidate that already passed
+    lexical and embedding scoring. Any verdict not labelled "Relevant" rejects it.
+
+    Returns:
+        dict: {"outcome": "verified" | "skipped" | "cancelled", ...}, without a summary
+    """
+    url = source["url"]
+    meta = fetched["meta"]
+
+    if cancel_event is not None and cancel_event.is_set():
+        return {"outcome": "cancelled"}
+
+    # --- Use LLM for a quick relevance judgement ---
+    relevance_summary = check_relevance_with_ai(meta["snippet"], content_topic)
+    print(f"🧠 Relevance = {fetched['relevance_score']:.2f} | {relevance_summary[:80]}... | {url}")
+    if settings.cascade_llm_verdict:
+        relevant = is_relevant_verdict(relevance_summary)
+        record_stage("llm", 1, 0 if relevant else 1)
+        if not relevant:
+            return {"outcome": "skipped"}
+
+    return {"outcome": "verified", "meta": meta, "relevance_score": fetched["relevance_score"]}
+
+
+def summary_text(source: dict, meta: dict) -> str:
+    return meta.get("snippet") or meta.get("title") or source["url"]
+
+
+def summarise_candidate(source: dict, fetched: dict, content_topic: str, cancel_event: threading.Event = None) -> dict:
+    """
+    Runs the LLM relevance check and then the source summary for one candidate.
+
+    The cancel_event is checked between the two LLM calls so in-flight
+    work stops early once the run has enough sources.
+
+    Returns:
+        dict: {"outcome": "verified" | "skipped" | "cancelled", ...}
+    """
+    result = judge_candidate(source, fetched, content_topic, cancel_event)
+    if result["outcome"] != "verified":
+        return result
+
+    if cancel_event is not None and cancel_event.is_set():
+        return {"outcome": "cancelled"}
+
+    # Summarise the snippet/title
+    summary_prompt = build_source_summary_prompt(summary_text(source, result["meta"]))
+    llm_response = generate_completion(summary_prompt, agent="source_summariser")
+    result["summary"], result["key_points"] = parse_llm_output(llm_response)
+    return result
+
+
+def _run_pool(fn, jobs: dict, max_workers: int, stop_after: int = None) -> dict:
+    """
+    Runs fn(*args, cancel_event) for each job on a bounded thread pool.
+
+    If stop_after is given, the pool stops once that many jobs return
+    outcome "verified": pending jobs are cancelled and in-flight ones are
+    told to stop at their next checkpoint; their results are discarded.
+
+    Args:
+        fn: Worker function taking (*args, cancel_event)
+        jobs (dict): Job key -> args tuple
+        max_workers (int): Pool width
+        stop_after (int, optional): Verified results needed before stopping
+
+    Returns:
+        dict: Job key -> result, for finished jobs only
+    """
+    results = {}
+    if not jobs:
+        return results
+
+    workers = max(1, min(max_workers, len(jobs)))
+    cancel_event = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="research-verify")
+    try:
+        futures = {executor.submit(fn, *args, cancel_event): key for key, args in jobs.items()}
+
+        verified = 0
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"⚠️ Verification step {fn.__name__} crashed: {e}")
+                continue
+
+            results[key] = result
+            if stop_after is not None and result["outcome"] == "verified":
+                verified += 1
+                if verified >= stop_after:
+                    cancel_event.set()
+                    break
+    finally:
+        # Don't wait for in-flight calls; they exit at the next checkpoint
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return results
+
+
+def collapse_duplicates(candidates: list[dict], results: dict, max_distance: int = None) -> int:
+    """
+    Marks fetched candidates as skipped when an earlier candidate (by index)
+    redirected to the same canonical URL or has a near-identical snippet
+    (SimHash within max_distance bits). Runs before any embedding or LLM call.
+
+    Returns:
+        int: Number of candidates collapsed
+    """
+    max_distance = settings.near_duplicate_max_distance if max_distance is None else max_distance
+    kept_urls = {}
+    kept_prints = []
+    collapsed = 0
+
+    for idx in sorted(i for i, r in results.items() if r["outcome"] == "fetched"):
+        final_url = canonicalize_url(results[idx].get("final_url") or candidates[idx]["url"])
+        fingerprint = simhash(results[idx]["meta"]["snippet"])
+
+        duplicate_of = kept_urls.get(final_url)
+        if duplicate_of is None and fingerprint:
+            duplicate_of = next(
+                (i for i, fp in kept_prints if hamming_distance(fp, fingerprint) <= max_distance), None
+            )
+
+        if duplicate_of is not None:
+            print(f"🪞 Duplicate of {candidates[duplicate_of]['url']}: {candidates[idx]['url']}")
+            results[idx] = {"outcome": "skipped"}
+            collapsed += 1
+            continue
+
+        kept_urls[final_url] = idx
+        if fingerprint:
+            kept_prints.append((idx, fingerprint))
+    return collapsed
+
+
+def run_verification_stage(
+    candidates: list[dict],
+    content_topic: str,
+    limit: int,
+    max_workers: int = None,
+) -> dict[int, dict]:
+    """
+    Verifies candidates through a cascade, cheapest filter first:
+    1. Fetch every page concurrently on a bounded thread pool, then collapse
+       redirect and near-duplicate copies
+    2. Score snippets lexically (BM25) and drop those at or below the lexical
+       threshold (by default: no topic term at all). Skipped when no snippet
+       shares a topic term, since then it cannot tell candidates apart
+    3. Embed the topic once and the remaining snippets in one batch, then score them together
+    4. Run the LLM checks concurrently for candidates above the embedding threshold,
+       stopping once `limit` have passed
+    5. Summarise the verified sources: batched JSON requests when
+       settings.batch_source_summaries is on (sources a batch misses are retried
+       one at a time on the pool), else one call each inside step 4.
+       A source that cannot be summarised is dropped
+
+    Args:
+        candidates (list): Deduplicated candidate sources
+        content_topic (str): Refined topic to research
+        limit (int): Number of verified sources needed
+        max_workers (int, optional): Pool width (defaults to settings)
+
+    Returns:
+        dict: Candidate index -> result, for candidates that reached a final outcome
+    """
+    workers = max_workers or settings.research_verification_workers
+
+    # --- 1. Fetch ---
+    results = _run_pool(
+        fetch_candidate,
+        {idx: (source,) for idx, source in enumerate(candidates)},
+        workers,
+    )
+    collapse_duplicates(candidates, results)
+
+    # --- 2. Lexical pre-filter ---
+    fetched_idx = sorted(idx for idx, r in results.items() if r["outcome"] == "fetched")
+    lexical = bm25_scores(content_topic, [results[idx]["meta"]["snippet"] for idx in fetched_idx])
+    # With no snippet sharing a topic term (e.g. only synonyms), leave it to the embeddings
+    lexical_threshold = settings.cascade_lexical_threshold if any(lexical) else -1.0
+    lexical_pass = []
+    for idx, score in zip(fetched_idx, lexical):
+        if score <= lexical_threshold:
+            print(f"⚠️ No lexical match ({score:.2f}): {candidates[idx]['url']}")
+            results[idx] = {"outcome": "skipped"}
+        else:
+            lexical_pass.append(idx)
+    record_stage("lexical", len(fetched_idx), len(fetched_idx) - len(lexical_pass))
+
+    # --- 3. Score the remaining snippets against the topic in one batch ---
+    threshold = settings.cascade_embedding_threshold
+    if threshold is None:
+        threshold = relevance_threshold()
+    scores = score_texts_against(content_topic, [results[idx]["meta"]["snippet"] for idx in lexical_pass])
+
+    survivors = {}
+    for idx, score in zip(lexical_pass, scores):
+        results[idx]["relevance_score"] = score
+        if score < threshold:
+            print(f"⚠️ Too weak relevance ({score:.2f}): {candidates[idx]['url']}")
+            results[idx] = {"outcome": "skipped"}
+        else:
+            survivors[idx] = (candidates[idx], results.pop(idx), content_topic)
+    record_stage("embedding", len(lexical_pass), len(lexical_pass) - len(survivors))
+
+    # --- 4. LLM checks for survivors, stopping at limit ---
+    if not settings.batch_source_summaries:
+        results.update(_run_pool(summarise_candidate, survivors, workers, stop_after=limit))
+        return results
+
+    results.update(_run_pool(judge_candidate, survivors, workers, stop_after=limit))
+
+    # --- 5. Summarise every verified source in as few requests as the token budget allows ---
+    verified_idx = sorted(idx for idx, r in results.items() if r["outcome"] == "verified")
+    texts = {idx: summary_text(candidates[idx], results[idx]["meta"]) for idx in verified_idx}
+    summaries = dict(zip(verified_idx, summarise_sources([texts[idx] for idx in verified_idx])))
+    # Sources a batch missed are summarised one by one, in parallel
+    missed = {idx: (texts[idx],) for idx, summarised in summaries.items() if summarised is None}
+    summaries.update(_run_pool(summarise_fallback, missed, workers))
+    for idx in verified_idx:
+        summarised = summaries.get(idx)
+        if summarised is None:
+            print(f"⚠️ No summary, dropping: {candidates[idx]['url']}")
+            results[idx] = {"outcome": "skipped"}
+            continue
+        results[idx]["summary"], results[idx]["key_points"] = summarised
+    return results
 
 
 def generate_research_sources(
@@ -37,11 +311,15 @@ def generate_research_sources(
 ) -> bool:
     """
     Runs the full research pipeline:
-    1. Discovers sources via AI and Google
-    2. Deduplicates by URL
-    3. Verifies each source (accessibility, relevance, reuse)
-    4. Scores relevance via embeddings
-    5. Stores valid sources to research_sources table
+    1. Discovers sources via AI and Google, in parallel with per-provider timeouts
+    2. Deduplicates by canonical URL and drops sources overused for this topic
+    3. Verifies candidates in parallel (accessibility), collapsing near-duplicate pages
+    4. Filters by lexical score, then batched embeddings, then LLM checks for the best
+    5. Stores valid sources to research_sources table, in discovery order
+
+    All DB work shares one session: reuse counts are prefetched in one query,
+    and sources plus usage increments are written in a single commit (or the
+    increments go to the write-behind buffer, see source_reuse.py).
 
     Args:
         request_id (int): ID of the content request
@@ -57,46 +335,57 @@ def generate_research_sources(
     try:
         print(f"\n🔍 Starting research for topic: {content_topic}")
 
-        # --- 1. Discover sources from AI and Google ---
-        ai_sources = discover_sources_with_ai(content_topic, limit, preference)
-        google_sources = get_google_search_results(content_topic, limit)
-        all_sources = ai_sources + google_sources
+        # --- 1. Discover sources from AI and Google concurrently ---
+        all_sources = discover_sources(content_topic, limit, preference)
 
         print(f"\n📦 Total discovered: {len(all_sources)} sources")
 
-        # --- 2. Deduplicate by URL ---
+        # --- 2. Deduplicate by canonical URL (first variant seen is kept) ---
         seen_urls = set()
         deduped_sources = []
         for src in all_sources:
             url = src.get("url") or src.get("source_url")
-            if url and url not in seen_urls:
+            canonical = canonicalize_url(url) if url else None
+            if canonical and canonical not in seen_urls:
                 src["url"] = url  # standardise
                 deduped_sources.append(src)
-                seen_urls.add(url)
+                seen_urls.add(canonical)
 
         print(f"🔁 Deduplicated to {len(deduped_sources)} unique URLs")
 
-        verified = 0
+        # --- Skip if already in DB for this request ---
+        stored_urls = {
+            canonicalize_url(row.url) for row in db.query(ResearchSource.url).filter(
+                ResearchSource.request_id == request_id
+            )
+        }
+        write_behind = settings.source_reuse_write_behind
+        load_counts = get_usage_counts if write_behind else fetch_usage_counts
+        usage_counts = load_counts(db, user_id, content_topic, [src["url"] for src in deduped_sources])
+        candidates = []
         for source in deduped_sources:
-            url = source["url"]
-
-            # --- Skip if already in DB for this request ---
-            existing = db.query(ResearchSource).filter_by(request_id=request_id, url=url).first()
-            if existing:
-                print(f"🗃️ Already stored: {url}")
+            if canonicalize_url(source["url"]) in stored_urls:
+                print(f"🗃️ Already stored: {source['url']}")
                 continue
-
-            # --- Skip if overused for this user+topic ---
-            if is_source_overused(user_id, content_topic, url):
-                print(f"🚫 Overused for topic: {url}")
+            if is_overused_count(usage_counts.get(source["url"], 0)):
+                print(f"🚫 Overused for topic: {source['url']}")
                 continue
+            candidates.append(source)
+
+        # --- 3. Verify candidates concurrently ---
+        results = run_verification_stage(candidates, content_topic, limit)
 
-            # --- Check accessibility ---
-            accessible, status = is_url_accessible(url)
-            if not accessible:
-                print(f"❌ URL not accessible: {url} | Reason: {status}")
+        # --- Store in candidate order so runs are reproducible ---
+        verified = 0
+        used_urls = []
+        for idx in sorted(results):
+            source = candidates[idx]
+            result = results[idx]
+            url = source["url"]
+
+            if result["outcome"] == "failed":
                 # Log it in DB anyway for analysis
-                db_source = ResearchSource(
+                db.add(ResearchSource(
                     request_id=request_id,
                     user_id=user_id,
                     source_type=source.get("source", "unknown"),
@@ -104,68 +393,38 @@ def generate_research_sources(
                     title=source.get("title", "N/A"),
                     author=source.get("authors", "N/A"),
                     verification_status="failed",
-                    access_status=status[:50],
+                    access_status=result["access_status"][:50],
                     verification_attempts=1,
                     last_verified_at=datetime.utcnow()
-                )
-                db.add(db_source)
-                db.commit()
-                continue
-
-            # --- Extract metadata from page ---
-            meta = extract_page_metadata(url)
-            if not meta or "snippet" not in meta:
-                print(f"⚠️ Skipping: Metadata missing for {url}")
-                continue
-
-            snippet = meta["snippet"]
+                ))
 
-            # --- Use LLM for a quick relevance judgement ---
-            relevance_summary = check_relevance_with_ai(snippet, content_topic)
-
-            # --- Use embeddings for numerical similarity ---
-            relevance_score = calculate_embedding_similarity(content_topic, snippet)
-            print(f"🧠 Relevance = {relevance_score:.2f} | {relevance_summary[:80]}...")
-
-            if relevance_score < 0.7:
-                print(f"⚠️ Too weak relevance: {url}")
-                continue
-
-            # Summarise the snippet/title and store result
-            summary_prompt = build_source_summary_prompt(snippet or meta.get("title") or url)
-            llm_response = generate_completion(summary_prompt, agent="source_summariser")
-            summary, key_points = parse_llm_output(llm_response)
-
-            db_source.summary = summary
-            db_source.key_points = key_points
-
-
-            # --- Store to DB ---
-            db_source = ResearchSource(
-                request_id=request_id,
-                user_id=user_id,
-                source_type=source.get("source", "unknown"),
-                url=url,
-                title=meta.get("title") or source.get("title"),
-                author=source.get("authors", "N/A"),
-                publication_date=None,
-                verification_status="verified",
-                relevance_score=relevance_score,
-                freshness_score=0.5,  # ⏳: placeholder
-                summary=summary,
-                key_points=key_points,
-                is_used=False,
-                verification_attempts=1,
-                last_verified_at=datetime.utcnow()
-            )
-            db.add(db_source)
-            increment_source_usage(user_id, content_topic, url)
-            verified += 1
-
-            if verified >= limit:
-                break
+            elif result["outcome"] == "verified" and verified < limit:
+                meta = result["meta"]
+                db.add(ResearchSource(
+                    request_id=request_id,
+                    user_id=user_id,
+                    source_type=source.get("source", "unknown"),
+                    url=url,
+                    title=meta.get("title") or source.get("title"),
+                    author=source.get("authors", "N/A"),
+                    publication_date=None,
+                    verification_status="verified",
+                    relevance_score=result["relevance_score"],
+                    freshness_score=0.5,  # ⏳: placeholder
+                    summary=result["summary"],
+                    key_points=result["key_points"],
+                    is_used=False,
+                    verification_attempts=1,
+                    last_verified_at=datetime.utcnow()
+                ))
+                used_urls.append(url)
+                verified += 1
 
+        if not write_behind:
+            record_source_usage(db, user_id, content_topic, used_urls)
         db.commit()
+        if write_behind:
+            buffer_source_usage(user_id, content_topic, used_urls)
 
         if verified > 0:
             print(f"\n✅ Stored {verified} verified sources.")
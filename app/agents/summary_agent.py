@@ -4,13 +4,14 @@ Combines verified source summaries and key points, generates a clean summary,
 and stores results in the `summaries` table.
 """
 
-from app.llm.engine import generate_completion
+from app.llm.engine import generate_completion, agenerate_completion
 from app.prompts.summary_prompt import build_summary_prompt
 from app.database import SessionLocal
 from app.models.research_sources import ResearchSource
 from app.models.requests import Request
 from app.models.summaries import Summary
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 def combine_summaries(sources: list[dict]) -> str:
     """
@@ -73,6 +74,31 @@ def generate_and_store_summary(request_id: int, verified_sources: list[dict], ta
         content_type (str): 'thread' or 'article'.
         user_id (int): The user initiating the request.
     """
+    prompt = build_combined_summary_prompt(request_id, verified_sources, target_length, content_type)
+    if prompt is None:
+        return None
+
+    llm_output = generate_completion(prompt, agent="summary_agent")
+    return store_summary(request_id, user_id, llm_output, len(verified_sources))
+
+
+async def agenerate_and_store_summary(request_id: int, verified_sources: list[dict], target_length: int, content_type: str, user_id: int):
+    """
+    Async version of generate_and_store_summary().
+    The LLM call runs on the async engine; the insert runs in the threadpool.
+    """
+    prompt = build_combined_summary_prompt(request_id, verified_sources, target_length, content_type)
+    if prompt is None:
+        return None
+
+    llm_output = await agenerate_completion(prompt, agent="summary_agent")
+    return await run_in_threadpool(store_summary, request_id, user_id, llm_output, len(verified_sources))
+
+
+def build_combined_summary_prompt(request_id: int, verified_sources: list[dict], target_length: int, content_type: str):
+    """
+    Builds the summary prompt, or returns None when there is nothing to summarise.
+    """
     if not verified_sources:
         print(f"⚠️ No verified sources provided for request {request_id}. Skipping summary generation.")
         
@@ -86,8 +112,13 @@ def generate_and_store_summary(request_id: int, verified_sources: list[dict], ta
         print(f"⚠️ Empty combined summary for request {request_id}. Skipping.")
         return None
 
-    prompt = build_summary_prompt(combined_summary_text, combined_key_points, target_length, content_type)
-    llm_output = generate_completion(prompt, agent="summary_agent")
+    return build_summary_prompt(combined_summary_text, combined_key_points, target_length, content_type)
+
+
+def store_summary(request_id: int, user_id: int, llm_output: str, source_count: int):
+    """
+    Parses the LLM output and inserts the summaries row.
+    """
     summary, final_key_points = parse_llm_output(llm_output)
 
     with SessionLocal() as session:
@@ -96,7 +127,7 @@ def generate_and_store_summary(request_id: int, verified_sources: list[dict], ta
             user_id=user_id,
             combined_summary=summary,
             combined_key_points=final_key_points,
-            source_count=len(verified_sources),
+            source_count=source_count,
             is_used=False
         )
         session.add(summary_obj)
@@ -7,11 +7,12 @@ It also updates the database request row with the new topic and status.
 """
 
 from app.prompts.topic_prompt import build_topic_prompt
-from app.llm.engine import generate_completion
+from app.llm.engine import generate_completion, agenerate_completion
 from app.database import SessionLocal
 from app.models.requests import Request
 from sqlalchemy.orm.exc import NoResultFound
 from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
 import logging
 
 logger = logging.getLogger(__name__)
@@ -42,6 +43,32 @@ def generate_content_topic(request_id: int, original_topic: str, user_config: di
         raise HTTPException(status_code=500, detail="Failed to generate topic. Please try again.")
 
     # Step 3: Update DB
+    store_content_topic(request_id, user_id, content_topic)
+    return content_topic
+
+
+async def agenerate_content_topic(request_id: int, original_topic: str, user_config: dict, content_type: str, user_id: int) -> str:
+    """
+    Async version of generate_content_topic().
+    The LLM call runs on the async engine; the DB update runs in the threadpool.
+    """
+    prompt = build_topic_prompt(original_topic, user_config, content_type)
+
+    try:
+        result = await agenerate_completion(prompt)
+        content_topic = result.strip()
+    except Exception as e:
+        logger.error(f"[TopicAgent] LLM failed for request_id={request_id}, user_id={user_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to generate topic. Please try again.")
+
+    await run_in_threadpool(store_content_topic, request_id, user_id, content_topic)
+    return content_topic
+
+
+def store_content_topic(request_id: int, user_id: int, content_topic: str):
+    """
+    Saves the refined topic and moves the request on to research.
+    """
     db = SessionLocal()
     try:
         request = db.query(Request).filter_by(id=request_id, user_id=user_id).one()
@@ -57,5 +84,3 @@ def generate_content_topic(request_id: int, original_topic: str, user_config: di
         raise HTTPException(status_code=500, detail="Could not update database with topic.")
     finally:
         db.close()
-
-    return content_topic
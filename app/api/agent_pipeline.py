@@ -2,46 +2,111 @@
 """
 Routes to manually run each agent (Topic, Research, Summary, Content) step-by-step.
 This allows testing the full pipeline through Swagger.
+
+Routes are async: LLM calls go through the async engine, and blocking work
+(DB reads, research fetching, DB writes) runs in the threadpool, so neither
+the event loop nor a worker is held for the duration of each LLM call.
+/content/stream is the server-sent events variant of /content.
+/run queues the whole chain on the background pool; poll /status for progress.
 """
 
-from fastapi import APIRouter, Depends, Path
+import json
+from fastapi import APIRouter, Depends, Path, Query, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.dependencies import get_db, get_current_user
-from app.agents.topic_agent import generate_content_topic
+from app.agents.topic_agent import agenerate_content_topic
 from app.agents.research_agent import generate_research_sources
-from app.agents.summary_agent import generate_and_store_summary
-from app.agents.content_agent import create_content
+from app.agents.summary_agent import agenerate_and_store_summary
+from app.agents.content_agent import acreate_content, astream_content
 from app.models.requests import Request
 from app.models.user_configurations import UserConfiguration
 from app.models.research_sources import ResearchSource
 from app.models.summaries import Summary
+from app.services.pipeline_runner import PIPELINE_STAGES, submit_pipeline, get_pipeline_status
 
 router = APIRouter(prefix="/pipeline", tags=["Pipeline Agents"])
 
-@router.post("/{request_id}/topic")
-def run_topic_agent(
-    request_id: int = Path(...),
-    db: Session = Depends(get_db),
-    user_id: int = Depends(get_current_user)
-):
+@router.get("/research/cascade-stats")
+def get_research_cascade_stats(user_id: int = Depends(get_current_user)):
     """
-    Run Topic Agent to refine the original topic.
+    Candidates evaluated and rejected by each research filter stage in this process.
     """
-    request = db.query(Request).filter_by(id=request_id, user_id=user_id).first()
-    config = db.query(UserConfiguration).filter_by(user_id=user_id).first()
+    from app.services.relevance_cascade import cascade_stats
+
+    return {"success": True, "cascade": cascade_stats()}
+
+
+# --- DB reads for the async routes: plain functions run via run_in_threadpool ---
 
-    config_dict = {
+def _config_dict(config: UserConfiguration) -> dict:
+    return {
         "persona": config.persona,
         "tone": config.tone,
         "style": config.style,
         "language": config.language,
     }
 
-    content_topic = generate_content_topic(
+
+def _load_request(db: Session, request_id: int, user_id: int) -> Request:
+    request = db.query(Request).filter_by(id=request_id, user_id=user_id).first()
+    if not request:
+        raise HTTPException(status_code=404, detail="Request not found")
+    return request
+
+
+def _load_config(db: Session, user_id: int) -> UserConfiguration:
+    return db.query(UserConfiguration).filter_by(user_id=user_id).first()
+
+
+def _load_summary_sources(db: Session, request_id: int) -> list[dict]:
+    verified_sources = db.query(ResearchSource).filter_by(
+        request_id=request_id,
+        verification_status="verified"
+    ).filter(ResearchSource.summary.isnot(None)).all()
+
+    return [
+        {
+            "summary": src.summary,
+            "key_points": src.key_points if isinstance(src.key_points, list) else []
+        } for src in verified_sources
+    ]
+
+
+def _load_content_inputs(db: Session, request_id: int, user_id: int):
+    """
+    Returns (request, summary, verified sources, config dict) for the content routes.
+    """
+    request = _load_request(db, request_id, user_id)
+    config = _load_config(db, user_id)
+    summary = db.query(Summary).filter_by(request_id=request_id).first()
+    if not summary:
+        raise HTTPException(status_code=400, detail="No summary found for this request")
+    sources = db.query(ResearchSource).filter_by(
+        request_id=request_id,
+        verification_status="verified"
+    ).all()
+    return request, summary, sources, _config_dict(config)
+
+
+@router.post("/{request_id}/topic")
+async def run_topic_agent(
+    request_id: int = Path(...),
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user)
+):
+    """
+    Run Topic Agent to refine the original topic.
+    """
+    request = await run_in_threadpool(_load_request, db, request_id, user_id)
+    config = await run_in_threadpool(_load_config, db, user_id)
+
+    content_topic = await agenerate_content_topic(
         request_id,
         request.original_topic,
-        config_dict,
+        _config_dict(config),
         request.content_type,
         user_id
     )
@@ -49,7 +114,7 @@ def run_topic_agent(
 
 
 @router.post("/{request_id}/research")
-def run_research_agent(
+async def run_research_agent(
     request_id: int = Path(...),
     db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user)
@@ -57,10 +122,11 @@ def run_research_agent(
     """
     Run Research Agent to find and verify sources.
     """
-    request = db.query(Request).filter_by(id=request_id, user_id=user_id).first()
-    config = db.query(UserConfiguration).filter_by(user_id=user_id).first()
+    request = await run_in_threadpool(_load_request, db, request_id, user_id)
+    config = await run_in_threadpool(_load_config, db, user_id)
 
-    success = generate_research_sources(
+    success = await run_in_threadpool(
+        generate_research_sources,
         request_id,
         request.content_topic,
         user_id,
@@ -71,7 +137,7 @@ def run_research_agent(
 
 
 @router.post("/{request_id}/summary")
-def run_summary_agent(
+async def run_summary_agent(
     request_id: int = Path(...),
     db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user)
@@ -79,24 +145,13 @@ def run_summary_agent(
     """
     Run Summary Agent to generate a combined summary from verified sources.
     """
-    request = db.query(Request).filter_by(id=request_id, user_id=user_id).first()
+    request = await run_in_threadpool(_load_request, db, request_id, user_id)
+    source_data = await run_in_threadpool(_load_summary_sources, db, request_id)
 
-    verified_sources = db.query(ResearchSource).filter_by(
-        request_id=request_id,
-        verification_status="verified"
-    ).filter(ResearchSource.summary.isnot(None)).all()
-
-    if not verified_sources:
+    if not source_data:
         return {"success": False, "error": "No verified sources with summaries."}
 
-    source_data = [
-        {
-            "summary": src.summary,
-            "key_points": src.key_points if isinstance(src.key_points, list) else []
-        } for src in verified_sources
-    ]
-
-    summary_obj=generate_and_store_summary(
+    summary_obj = await agenerate_and_store_summary(
         request_id=request_id,
         verified_sources=source_data,
         target_length=500,
@@ -112,7 +167,7 @@ def run_summary_agent(
 
 
 @router.post("/{request_id}/content")
-def run_content_agent(
+async def run_content_agent(
     request_id: int = Path(...),
     db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user)
@@ -120,22 +175,77 @@ def run_content_agent(
     """
     Run Content Agent to generate thread or article from summary.
     """
-    request = db.query(Request).filter_by(id=request_id, user_id=user_id).first()
-    config = db.query(UserConfiguration).filter_by(user_id=user_id).first()
-    summary = db.query(Summary).filter_by(request_id=request_id).first()
-    if not summary:
-        raise HTTPException(status_code=400, detail="No summary found for this request")
-    sources = db.query(ResearchSource).filter_by(
-        request_id=request_id,
-        verification_status="verified"
-    ).all()
+    request, summary, sources, config_dict = await run_in_threadpool(_load_content_inputs, db, request_id, user_id)
 
-    config_dict = {
-        "persona": config.persona,
-        "tone": config.tone,
-        "style": config.style,
-        "language": config.language,
-    }
-
-    result = create_content(db, request, summary, sources, config_dict)
+    result = await acreate_content(db, request, summary, sources, config_dict)
     return {"success": True, "content_id": result.id}
+
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/{request_id}/content/stream")
+async def stream_content_agent(
+    request_id: int = Path(...),
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user)
+):
+    """
+    Run Content Agent with server-sent events.
+    Emits `token` events as the LLM writes, a `tweet` event as each tweet of a
+    thread completes, then `done` with the saved content_id (or `error`).
+    """
+    request, summary, sources, config_dict = await run_in_threadpool(_load_content_inputs, db, request_id, user_id)
+
+    async def events():
+        try:
+            async for event, data in astream_content(request, summary, sources, config_dict):
+                yield _sse(event, data)
+        except Exception as e:
+            print(f"❌ Content stream failed for request {request_id}: {e}")
+            yield _sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/{request_id}/run", status_code=202)
+def run_full_pipeline(
+    request_id: int = Path(...),
+    start_stage: str = Query("topic", description="First stage to run: topic, research, summary or content"),
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user)
+):
+    """
+    Queue Topic → Research → Summary → Content for background execution.
+    Returns immediately; poll GET /pipeline/{request_id}/status for progress.
+    """
+    if start_stage not in PIPELINE_STAGES:
+        raise HTTPException(status_code=400, detail=f"Unknown stage: {start_stage}")
+    request = db.query(Request.id).filter_by(id=request_id, user_id=user_id).first()
+    if not request:
+        raise HTTPException(status_code=404, detail="Request not found")
+
+    if not submit_pipeline(request_id, user_id, start_stage):
+        raise HTTPException(status_code=409, detail="Pipeline already running for this request")
+    return {"success": True, "request_id": request_id, "status": "queued"}
+
+
+@router.get("/{request_id}/status")
+def get_run_status(
+    request_id: int = Path(...),
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user)
+):
+    """
+    Lightweight poll endpoint for a pipeline run.
+    """
+    status = get_pipeline_status(db, request_id, user_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Request not found")
+    return status
@@ -4,11 +4,13 @@ Routes for managing content lifecycle:
 - Approve draft content
 - Schedule approved content
 - Post content (simulated)
+- Bulk approve/schedule/post by ids or filter
 
 These call the business logic in app/services/content_queue.py
 """
 
-from fastapi import APIRouter, Depends, Path, Body
+from fastapi import APIRouter, Depends, Path, Body, Query
+from typing import Optional
 from sqlalchemy.orm import Session
 from datetime import datetime
 from app.services.content_queue import delete_scheduled_content
@@ -18,7 +20,13 @@ from app.services.content_queue import (
     approve_content,
     schedule_content,
     post_content,
+    bulk_approve_content,
+    bulk_schedule_content,
+    bulk_post_content,
 )
+from app.schemas.content_queue import BulkApproveRequest, BulkScheduleRequest, BulkPostRequest
+from app.models.content_queue import ContentQueue
+from app.utils.pagination import keyset_page, select_fields
 
 # Define the router for this module
 router = APIRouter(prefix="/content/queue", tags=["Content Queue"])
@@ -71,34 +79,104 @@ def delete_scheduled_content_route(
 ):
     return delete_scheduled_content(content_id=content_id, db=db)
 
+SCHEDULED_FIELDS = {
+    "id": ContentQueue.id,
+    "request_id": ContentQueue.request_id,
+    "content_type": ContentQueue.content_type,
+    "status": ContentQueue.status,
+    "scheduled_for": ContentQueue.scheduled_for,
+    "deleted_at": ContentQueue.deleted_at,
+    "platform": ContentQueue.platform,
+    "generated_content": ContentQueue.generated_content,
+}
+SCHEDULED_DEFAULT_FIELDS = [
+    "content_type", "status", "scheduled_for", "deleted_at", "platform", "generated_content"
+]
+
+
 @router.get("/scheduled")
 def get_scheduled_content(
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    fields: Optional[str] = Query(None, description="Comma-separated fields; omit generated_content for a light list"),
     db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user)
 ):
     """
-    Return all scheduled or previously scheduled-and-deleted posts.
+    Return scheduled or previously scheduled-and-deleted posts, soonest first,
+    one page at a time.
     """
-    from app.models.content_queue import ContentQueue
-
-    results = db.query(ContentQueue).filter(
-        ContentQueue.user_id == user_id,
-        ContentQueue.status.in_(["scheduled", "scheduled_deleted"])
-    ).order_by(ContentQueue.scheduled_for.asc()).all()
+    selected = select_fields(fields, SCHEDULED_FIELDS, SCHEDULED_DEFAULT_FIELDS)
+    rows, next_cursor = keyset_page(
+        lambda columns: db.query(*columns).filter(
+            ContentQueue.user_id == user_id,
+            ContentQueue.status.in_(["scheduled", "scheduled_deleted"]),
+            ContentQueue.scheduled_for.isnot(None)
+        ),
+        SCHEDULED_FIELDS,
+        selected,
+        sort_key="scheduled_for",
+        cursor=cursor,
+        limit=limit,
+    )
+
+    return {"success": True, "data": rows, "next_cursor": next_cursor}
+
+@router.get("/dispatcher/stats")
+def get_dispatcher_stats(
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user)
+):
+    """
+    The user's scheduled-post backlog, plus dispatch lag and throughput over
+    the last hour, computed from the queue so every dispatcher process counts.
+    """
+    from app.services.post_dispatcher import dispatch_history, scheduled_backlog
 
     return {
         "success": True,
-        "data": [
-            {
-                "id": c.id,
-                "content_type": c.content_type,
-                "status": c.status,
-                "scheduled_for": c.scheduled_for,
-                "deleted_at": c.deleted_at,
-                "platform": c.platform,
-                "generated_content": c.generated_content,
-            } for c in results
-        ]
+        "backlog": scheduled_backlog(db, user_id),
+        "dispatcher": dispatch_history(db, user_id),
     }
 
 
+@router.post("/bulk/approve")
+def bulk_approve_route(
+    payload: BulkApproveRequest,
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user)
+):
+    """
+    Approves many drafts in one transaction. Unlike the single approve route,
+    nothing is posted; returns a result per item.
+    """
+    return bulk_approve_content(db, user_id, **payload.dict(exclude_none=True))
+
+
+@router.post("/bulk/schedule")
+def bulk_schedule_route(
+    payload: BulkScheduleRequest,
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user)
+):
+    """
+    Schedules many items in one transaction, optionally spaced apart.
+    """
+    selection = payload.dict(exclude_none=True, exclude={"scheduled_for", "interval_minutes"})
+    return bulk_schedule_content(db, user_id, payload.scheduled_for, payload.interval_minutes, **selection)
+
+
+@router.post("/bulk/post", status_code=202)
+def bulk_post_route(
+    payload: BulkPostRequest,
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user)
+):
+    """
+    Queues many approved/scheduled items for the post dispatcher to send now.
+    Returns 202 with the queued ids once they are claimed; they are only sent
+    while scripts/run_post_dispatcher.py is running, and platform results land
+    on each row.
+    """
+    selection = payload.dict(exclude_none=True, exclude={"dry_run"})
+    return bulk_post_content(db, user_id, dry_run=payload.dry_run, **selection)
@@ -3,12 +3,13 @@
 Submit new content generation requests (user topic, content type, etc.)
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from app.dependencies import get_db, get_current_user
 from app.schemas.content_requests import CreateContentRequest, RequestListItem
 from app.models.requests import Request
-from typing import List
+from app.utils.pagination import keyset_page, select_fields
+from typing import List, Optional
 
 
 
@@ -45,84 +46,77 @@ def submit_content_request(
     }
 
 
-@router.get("", response_model=List[RequestListItem])
+REQUEST_LIST_FIELDS = {
+    "id": Request.id,
+    "original_topic": Request.original_topic,
+    "content_topic": Request.content_topic,
+    "content_type": Request.content_type,
+    "status": Request.status,
+    "platform": Request.platform,
+    "created_at": Request.created_at,
+    "updated_at": Request.updated_at,
+    "error_message": Request.error_message,
+}
+
+
+@router.get("")
 def get_user_requests(
+    response: Response,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    fields: Optional[str] = Query(None, description="Comma-separated fields, e.g. id,status,created_at"),
     db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user)
 ):
     """
-    Fetch all content generation requests for the current user.
+    Fetch the current user's content generation requests, newest first.
+    Returns a list (RequestListItem fields by default); when more pages exist,
+    the X-Next-Cursor header holds the cursor for the next one.
     """
-    requests = db.query(Request).filter(Request.user_id == user_id).order_by(Request.created_at.desc()).all()
-    return requests
+    selected = select_fields(fields, REQUEST_LIST_FIELDS, list(RequestListItem.__fields__))
+    rows, next_cursor = keyset_page(
+        lambda columns: db.query(*columns).filter(Request.user_id == user_id),
+        REQUEST_LIST_FIELDS,
+        selected,
+        sort_key="created_at",
+        cursor=cursor,
+        limit=limit,
+        descending=True,
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows
 
 
-from fastapi import Path
-from app.models.research_sources import ResearchSource
-from app.models.summaries import Summary
-from app.models.content_queue import ContentQueue
+from fastapi import Path, Header
+from app.services.request_detail import cached_detail_etag, etag_matches, get_request_detail as load_detail
+
 
 @router.get("/{request_id}")
 def get_request_detail(
+    response: Response,
     request_id: int = Path(...),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user),
 ):
     """
     Returns full detail of a single request:
     topic, sources, summary, and content.
+    Supports If-None-Match: unchanged detail returns 304, without a database
+    query when this process served it in the last few seconds.
     """
+    cached_etag = cached_detail_etag(request_id, user_id)
+    if etag_matches(if_none_match, cached_etag):
+        return Response(status_code=304, headers={"ETag": cached_etag})
 
-    # Get request record
-    request = db.query(Request).filter_by(id=request_id, user_id=user_id).first()
-    if not request:
+    payload, etag = load_detail(db, request_id, user_id)
+    if payload is None:
         raise HTTPException(status_code=404, detail="Request not found")
 
-    # Get verified sources
-    sources = db.query(ResearchSource).filter_by(
-        request_id=request_id,
-        user_id=user_id,
-        verification_status="verified"
-    ).all()
-
-    source_data = [{
-        "title": s.title,
-        "url": s.url,
-        "source_type": s.source_type,
-        "relevance_score": s.relevance_score,
-        "summary": s.summary,
-        "key_points": s.key_points,
-    } for s in sources]
-
-    # Get summary
-    summary = db.query(Summary).filter_by(request_id=request_id, user_id=user_id).first()
-
-    # Get draft content
-    content = db.query(ContentQueue).filter_by(request_id=request_id, user_id=user_id).first()
-
-    return {
-        "success": True,
-        "data": {
-            "request": {
-                "id": request.id,
-                "original_topic": request.original_topic,
-                "content_topic": request.content_topic,
-                "content_type": request.content_type,
-                "status": request.status,
-                "platform": request.platform,
-                "created_at": request.created_at,
-            },
-            "sources": source_data,
-            "summary": {
-                "combined_summary": summary.combined_summary if summary else None,
-                "key_points": summary.combined_key_points if summary else [],
-            },
-            "content": {
-                "id": content.id if content else None,
-                "generated_content": content.generated_content if content else "",
-                "status": content.status if content else "missing",
-                "deleted_at": content.deleted_at if content else None
-            }
-        }
-    }
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
 
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    return payload
@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from app.dependencies import get_db, get_current_user
 from app.models.user_configurations import UserConfiguration
 from app.models.users import User
-from app.schemas.user_configurations import UpdateUserConfig
+from app.schemas.user_configurations import UpdateUserConfig, UserConfigOut
 
 
 #router = APIRouter()
@@ -25,7 +25,7 @@ def get_user_configurations(
         db.commit()
         db.refresh(config)
 
-    return {"success": True, "data": config}
+    return {"success": True, "data": UserConfigOut.from_config(config)}
 
 
 @router.put("/users/configurations")
@@ -50,7 +50,7 @@ def update_user_configurations(
     db.commit()
     db.refresh(config)
 
-    return {"success": True, "data": config}
+    return {"success": True, "data": UserConfigOut.from_config(config)}
 
 
 @router.get("/users/usage-stats")
@@ -1,12 +1,20 @@
 # app/config.py
 # Loads environment variables using Pydantic v2 (from pydantic-settings)
 
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     #Database
     database_url: str
     redis_url: str = ""
+    db_pool_size: int = 10  # Persistent connections per process
+    db_max_overflow: int = 20  # Extra connections opened under load, closed when returned
+    db_pool_timeout_seconds: float = 30.0  # Wait for a free connection before raising
+    db_pool_recycle_seconds: int = 1800  # Reconnect connections older than this
+    db_pool_pre_ping: bool = True  # Test connections on checkout, replacing dead ones
+    db_statement_timeout_ms: int = 30000  # Postgres statement_timeout; 0 disables
+    db_pgbouncer: bool = False  # Behind PgBouncer (transaction mode): no client-side pool, SET LOCAL timeouts
     
     #Secrets and keys
     secret_key: str = ""
@@ -25,10 +33,89 @@ class Settings(BaseSettings):
     openai_model_summary_agent: str = "gpt-4.1"
     openai_model_content_agent: str = "gpt-4o"
     openai_model_research_agent: str = "gpt-4o"
+    embedding_model: str = "text-embedding-ada-002"
+    embedding_backend: str = "openai"  # "openai" or "hashing" (local, no network)
+    local_embedding_dim: int = 4096  # Vector size for the hashing backend; smaller sizes add collision noise
+    # From scripts/benchmark_embeddings.py at 4096 dims: relevant pairs score 0.02–0.29,
+    # unrelated pairs 0.00. Hashing only sees shared words, so this sits just above noise.
+    local_embedding_relevance_threshold: float = 0.015
+
+    #Async LLM client
+    llm_max_connections: int = 200  # Pooled keep-alive connections to the LLM API
+    llm_http2: bool = True  # Needs h2 (installed via httpx[http2])
+    llm_timeout_seconds: float = 60.0
+    llm_max_concurrency_per_model: int = 32  # In-flight async calls per model
+    llm_requests_per_minute: int = 500  # Token-bucket rate limit per model
+
+    #LLM response cache
+    llm_cache_backend: str = "memory"  # "memory", "sqlite" or "redis" (uses redis_url)
+    llm_cache_agents: str = "research_agent,source_summariser"  # Comma-separated agents that opt in
+    llm_cache_ttl_seconds: int = 86400
+    llm_cache_max_entries: int = 2048  # Memory backend only
+    llm_cache_sqlite_path: str = "llm_cache.sqlite3"  # SQLite backend only
 
     #Feature Toggles
     enable_offensive_check: bool = True  # Toggle for content profanity check
 
+    #Research pipeline
+    discovery_providers: str = "ai,google"  # Comma-separated, in merge order: ai, google, arxiv, local
+    discovery_ai_timeout_seconds: float = 60.0  # AI source suggestions (one LLM call)
+    discovery_google_timeout_seconds: float = 15.0  # All Google result pages together
+    discovery_arxiv_timeout_seconds: float = 15.0
+    discovery_cache_ttl_seconds: int = 3600  # Same (provider, query) is answered from memory for this long
+    discovery_cache_size: int = 512
+    discovery_fixture_path: str = ""  # JSON list for the offline "local" provider; empty uses app/fixtures/discovery_sources.json
+    google_search_page_workers: int = 5  # Result pages fetched in parallel
+    cascade_lexical_threshold: float = 0.0  # Snippets at or below this normalised BM25 are not embedded; 0.0 drops only those with no topic term
+    cascade_embedding_threshold: Optional[float] = None  # None uses the embedding backend's own threshold
+    cascade_llm_verdict: bool = True  # Reject candidates the LLM relevance check calls "Not relevant"
+    near_duplicate_max_distance: int = 8  # SimHash bits (of 64) two snippets may differ by and still count as one source; see test_url_canonicalization
+    research_verification_workers: int = 4  # Candidates verified in parallel per research run
+    batch_source_summaries: bool = True  # Summarise a run's verified sources in shared JSON requests
+    summary_batch_token_budget: int = 6000  # Prompt tokens per batched summary request
+    page_fetch_max_kb: int = 256  # Only the first N KB of each candidate page are downloaded
+    enable_page_cache: bool = True  # Reuse fetched page metadata across research runs
+    page_cache_ttl_seconds: int = 86400  # Cached pages are served without a request for this long
+    page_cache_max_age_seconds: int = 604800  # Stale entries are kept for revalidation, then evicted
+    embedding_batch_size: int = 256  # Max texts per embeddings request
+    embedding_cache_size: int = 4096  # In-process LRU of embedding vectors
+    enable_embedding_store: bool = True  # Persist embedding vectors in the embedding_cache table
+    # Opt-in: batches usage increments per process. Other workers see them up to
+    # source_reuse_flush_interval_seconds late, and a crash loses unflushed ones
+    source_reuse_write_behind: bool = False
+    source_reuse_cache_size: int = 50000  # Overused (user, topic, url) keys remembered
+    source_reuse_flush_interval_seconds: float = 5.0  # Max delay before other workers see an increment
+    source_reuse_flush_batch_size: int = 500  # Pending keys that trigger an early flush
+
+    #API read models
+    request_detail_cache_ttl_seconds: float = 2.0  # Detail polls within this window can 304 without a query
+
+    #Pipeline runner
+    pipeline_workers: int = 4  # Requests run end-to-end in parallel by POST /pipeline/{id}/run
+    pipeline_backend: str = "thread"  # "thread" (in-process pool) or "queue" (pipeline_jobs table + worker script)
+
+    #Job queue (scripts/run_pipeline_worker.py)
+    job_lease_seconds: int = 300  # Visibility timeout; renewed by heartbeats while a stage runs
+    job_max_attempts: int = 3
+    job_retry_base_seconds: float = 10.0  # Backoff doubles per attempt, with jitter
+    job_retry_max_seconds: float = 600.0
+    job_poll_interval_seconds: float = 2.0
+    job_stage_concurrency: str = "topic:8,research:4,summary:8,content:8"  # Per worker process
+
+    #Post dispatcher (scripts/run_post_dispatcher.py)
+    dispatch_batch_size: int = 50  # Due posts claimed per poll
+    dispatch_workers: int = 8  # Posts sent concurrently per dispatcher
+    dispatch_poll_interval_seconds: float = 15.0
+    dispatch_rate_limits: str = "typefully:30,x:50"  # Posts per minute per platform, per dispatcher
+    dispatch_stale_after_seconds: int = 900  # Posts still sending this long after the send began are marked failed
+
+    #Platform publishing
+    publish_connect_timeout_seconds: float = 5.0
+    publish_read_timeout_seconds: float = 30.0
+    publish_max_retries: int = 3  # Retries on 429 and connection failures (never 5xx)
+    publish_retry_base_seconds: float = 1.0  # Backoff doubles per retry, with full jitter
+    publish_retry_max_seconds: float = 60.0  # Also caps Retry-After
+
 
     class Config:
         env_file = ".env"
@@ -1,15 +1,137 @@
 # app/database.py
 # Sets up SQLAlchemy DB engine and session factory
+#
+# Pool behaviour comes from Settings (db_*):
+# - default: QueuePool with pre-ping, recycle and a per-connection statement_timeout
+# - db_pgbouncer: NullPool, leaving pooling to PgBouncer (transaction mode);
+#   statement_timeout is then applied with SET LOCAL at the start of each
+#   transaction, since startup options and session SETs don't survive pooling
+#
+# pool_stats() reports checked-out connections, overflow and checkout wait times.
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import threading
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from sqlalchemy.pool import NullPool, QueuePool
 from app.config import settings
 
+_stats_lock = threading.Lock()
+_stats = {
+    "checkouts": 0,
+    "timeouts": 0,
+    "connects": 0,
+    "invalidated": 0,
+    "wait_ms_total": 0.0,
+    "wait_ms_max": 0.0,
+}
+
+
+def _record(**changes):
+    with _stats_lock:
+        for key, value in changes.items():
+            if key == "wait_ms_max":
+                _stats[key] = max(_stats[key], value)
+            else:
+                _stats[key] += value
+
+
+class MeteredQueuePool(QueuePool):
+    """
+    QueuePool that records how long each checkout waited for a connection.
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except Exception:
+            _record(timeouts=1)
+            raise
+        waited = (time.perf_counter() - start) * 1000
+        _record(checkouts=1, wait_ms_total=waited, wait_ms_max=waited)
+        return conn
+
+
+def engine_options(url: str) -> dict:
+    """
+    Builds create_engine() keyword arguments for a database URL from settings.
+    """
+    if url.startswith("sqlite"):
+        return {}
+    if settings.db_pgbouncer:
+        return {"poolclass": NullPool, "pool_pre_ping": settings.db_pool_pre_ping}
+
+    options = {
+        "poolclass": MeteredQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if settings.db_statement_timeout_ms and url.startswith("postgresql"):
+        options["connect_args"] = {"options": f"-c statement_timeout={settings.db_statement_timeout_ms}"}
+    return options
+
+
 # Create DB engine using URL from .env
-engine = create_engine(settings.database_url)
+engine = create_engine(settings.database_url, **engine_options(settings.database_url))
+
+
+@event.listens_for(engine, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    _record(connects=1)
+
+
+@event.listens_for(engine, "invalidate")
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    _record(invalidated=1)
+
 
 # Create a SessionLocal factory for DB sessions
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+@event.listens_for(SessionLocal, "after_begin")
+def _set_local_statement_timeout(session, transaction, connection):
+    if settings.db_pgbouncer and settings.db_statement_timeout_ms and connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(settings.db_statement_timeout_ms)}")
+
+
+def pool_stats() -> dict:
+    """
+    Returns current pool occupancy plus checkout counters since start-up.
+    """
+    pool = engine.pool
+    with _stats_lock:
+        stats = dict(_stats)
+    checkouts = stats.pop("checkouts")
+    wait_total = stats.pop("wait_ms_total")
+    occupancy = {}
+    if isinstance(pool, QueuePool):
+        occupancy = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(0, pool.overflow()),
+        }
+    return {
+        "mode": "pgbouncer" if settings.db_pgbouncer else "pooled",
+        "pool": type(pool).__name__,
+        **occupancy,
+        "checkouts": checkouts,
+        "wait_ms_avg": round(wait_total / checkouts, 3) if checkouts else 0.0,
+        "wait_ms_max": round(stats.pop("wait_ms_max"), 3),
+        **stats,
+    }
+
+
+def reset_pool_stats():
+    with _stats_lock:
+        for key in _stats:
+            _stats[key] = 0 if isinstance(_stats[key], int) else 0.0
+
+
 # Base class for models to inherit from
 Base = declarative_base()
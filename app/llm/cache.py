@@ -0,0 +1,226 @@
+# app/llm/cache.py
+
+"""
+Response cache for LLM completions.
+
+Completions are keyed by (model, temperature, max_tokens, sha256 of prompt)
+and kept in a pluggable store selected by Settings.llm_cache_backend:
+- "memory": in-process LRU (default)
+- "sqlite": local file at Settings.llm_cache_sqlite_path, shared by processes on one host
+- "redis":  Settings.redis_url, shared by every worker (needs the `redis` package)
+
+Agents opt in through Settings.llm_cache_agents, or per call with use_cache=True.
+"""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from app.config import settings
+from app.utils.hash import hash_string
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+def make_cache_key(model: str, temperature: float, max_tokens: int, prompt: str) -> str:
+    return f"llm:{model}:{temperature}:{max_tokens}:{hash_string(prompt)}"
+
+
+class MemoryResponseStore:
+    """
+    Thread-safe LRU with per-entry expiry.
+    """
+    blocking = False
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: int):
+        with self._lock:
+            self._data[key] = (value, time.time() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteResponseStore:
+    """
+    Single-table SQLite store; expired rows are ignored on read and purged on write.
+    """
+    blocking = True
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM llm_cache WHERE key = ? AND expires_at >= ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str, ttl: int):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, now + ttl)
+            )
+            self._conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (now,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+
+class RedisResponseStore:
+    """
+    Redis store using SETEX so expiry is handled by Redis itself.
+    """
+    blocking = True
+
+    def __init__(self, url: str):
+        if redis is None:
+            raise RuntimeError("The redis package is required for llm_cache_backend=redis")
+        if not url:
+            raise RuntimeError("REDIS_URL must be set for llm_cache_backend=redis")
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+
+    def get(self, key: str):
+        return self._client.get(key)
+
+    def set(self, key: str, value: str, ttl: int):
+        self._client.setex(key, ttl, value)
+
+    def clear(self):
+        for key in self._client.scan_iter("llm:*"):
+            self._client.delete(key)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def build_response_store(backend: str = None):
+    backend = backend or settings.llm_cache_backend
+    if backend == "memory":
+        return MemoryResponseStore(settings.llm_cache_max_entries)
+    if backend == "sqlite":
+        return SQLiteResponseStore(settings.llm_cache_sqlite_path)
+    if backend == "redis":
+        return RedisResponseStore(settings.redis_url)
+    raise ValueError(f"Unsupported LLM cache backend: {backend}")
+
+
+def get_response_store():
+    """
+    Returns the process-wide store. Falls back to memory if the configured
+    backend cannot be initialised.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            try:
+                _store = build_response_store()
+            except Exception as e:
+                print(f"⚠️ LLM cache backend '{settings.llm_cache_backend}' unavailable ({e}); using memory")
+                _store = MemoryResponseStore(settings.llm_cache_max_entries)
+        return _store
+
+
+def set_response_store(store):
+    """
+    Replaces the process-wide store (used by tests and scripts).
+    """
+    global _store
+    with _store_lock:
+        _store = store
+
+
+def cached_response(key: str):
+    """
+    Returns the cached completion for a key, or None. Store errors count as a miss.
+    """
+    try:
+        return get_response_store().get(key)
+    except Exception as e:
+        print(f"⚠️ LLM cache read failed: {e}")
+        return None
+
+
+def store_response(key: str, value: str, ttl: int = None):
+    """
+    Saves a completion. Store errors are logged and ignored.
+    """
+    try:
+        get_response_store().set(key, value, ttl or settings.llm_cache_ttl_seconds)
+    except Exception as e:
+        print(f"⚠️ LLM cache write failed: {e}")
+
+
+def store_is_blocking() -> bool:
+    return getattr(get_response_store(), "blocking", False)
+
+
+def is_cache_enabled_for(agent: str) -> bool:
+    agents = {a.strip() for a in settings.llm_cache_agents.split(",") if a.strip()}
+    return agent in agents
+
+
+# --- Metrics ---
+
+_stats_lock = threading.Lock()
+_stats = {}
+
+
+def record(agent: str, hit: bool):
+    with _stats_lock:
+        counters = _stats.setdefault(agent, {"hits": 0, "misses": 0})
+        counters["hits" if hit else "misses"] += 1
+
+
+def llm_cache_stats() -> dict:
+    """
+    Returns hit/miss counters per agent plus totals.
+    """
+    with _stats_lock:
+        by_agent = {agent: dict(counters) for agent, counters in _stats.items()}
+    return {
+        "hits": sum(c["hits"] for c in by_agent.values()),
+        "misses": sum(c["misses"] for c in by_agent.values()),
+        "by_agent": by_agent,
+    }
+
+
+def reset_llm_cache_stats():
+    with _stats_lock:
+        _stats.clear()
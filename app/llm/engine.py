@@ -3,10 +3,32 @@
 """
 Handles communication with the configured LLM provider (OpenAI or Anthropic).
 Supports per-agent model overrides. Defaults fall back to OPENAI_MODEL from .env.
+
+Two entry points share the same model resolution:
+- generate_completion(): blocking call on the module-level openai client
+- agenerate_completion(): async call on an AsyncOpenAI client with a pooled
+  keep-alive HTTP/2 client, per-model concurrency semaphores and a per-model
+  token-bucket rate limit (one set per running event loop)
+
+Both consult the response cache (app/llm/cache.py) for agents that opt in.
+astream_completion() streams deltas through the same async limits.
 """
 
+import asyncio
+import threading
+import time
+import weakref
+import httpx
 import openai
+from openai import AsyncOpenAI
 from app.config import settings
+from app.llm import cache as response_cache
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx; installed via httpx[http2])
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 # Set provider (only OpenAI supported for now)
 DEFAULT_PROVIDER = settings.default_ai_provider
@@ -19,7 +41,44 @@ DEFAULT_MODELS = {
     "research_agent":settings.openai_model_research_agent or "gpt-4-turbo",
 }
 
-def generate_completion(prompt: str, model_name: str = None, agent: str = "default") -> str:
+SYSTEM_PROMPT = "You are a helpful AI assistant."
+DEFAULT_TEMPERATURE = 0.7
+DEFAULT_MAX_TOKENS = 1500
+
+
+def resolve_model(model_name: str = None, agent: str = "default") -> str:
+    """
+    Returns the explicit model override, else the agent default, else OPENAI_MODEL.
+    """
+    if DEFAULT_PROVIDER != "openai":
+        raise NotImplementedError("Only OpenAI is supported at the moment.")
+    return model_name or DEFAULT_MODELS.get(agent, settings.openai_model)
+
+
+def build_messages(prompt: str) -> list[dict]:
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _cache_key_for(prompt: str, model: str, agent: str, use_cache: bool = None):
+    """
+    Returns the response-cache key, or None when caching is off for this call.
+    """
+    enabled = response_cache.is_cache_enabled_for(agent) if use_cache is None else use_cache
+    if not enabled:
+        return None
+    return response_cache.make_cache_key(model, DEFAULT_TEMPERATURE, DEFAULT_MAX_TOKENS, prompt)
+
+
+def generate_completion(
+    prompt: str,
+    model_name: str = None,
+    agent: str = "default",
+    use_cache: bool = None,
+    cache_ttl: int = None,
+) -> str:
     """
     Sends a prompt to the configured LLM and returns the generated response.
 
@@ -27,24 +86,204 @@ def generate_completion(prompt: str, model_name: str = None, agent: str = "defau
         prompt (str): Prompt text to send.
         model_name (str, optional): Override model name directly.
         agent (str, optional): Agent name ('topic_agent', etc.) for default model lookup.
+        use_cache (bool, optional): Force the response cache on/off (defaults to the agent opt-in).
+        cache_ttl (int, optional): Seconds to keep a cached response (defaults to settings).
 
     Returns:
         str: Generated response from the LLM.
     """
-    if DEFAULT_PROVIDER != "openai":
-        raise NotImplementedError("Only OpenAI is supported at the moment.")
+    selected_model = resolve_model(model_name, agent)
+    cache_key = _cache_key_for(prompt, selected_model, agent, use_cache)
+    if cache_key:
+        cached = response_cache.cached_response(cache_key)
+        response_cache.record(agent, hit=cached is not None)
+        if cached is not None:
+            print(f"♻️ Cached completion for {agent}: {selected_model}")
+            return cached
 
-    selected_model = model_name or DEFAULT_MODELS.get(agent, settings.openai_model)
     print(f"🤖 Using model for {agent}: {selected_model}")
 
     response = openai.chat.completions.create(
         model=selected_model,
-        messages=[
-            {"role": "system", "content": "You are a helpful AI assistant."},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.7,
-        max_tokens=1500
+        messages=build_messages(prompt),
+        temperature=DEFAULT_TEMPERATURE,
+        max_tokens=DEFAULT_MAX_TOKENS
     )
 
-    return response.choices[0].message.content.strip()
+    result = response.choices[0].message.content.strip()
+    if cache_key:
+        response_cache.store_response(cache_key, result, cache_ttl)
+    return result
+
+
+# --------------------------
+# Async engine
+# --------------------------
+
+class TokenBucket:
+    """
+    Async token bucket: `rate` tokens per second, bursting up to `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+
+class _LoopResources:
+    """
+    The async client and per-model limits for one event loop. asyncio locks,
+    semaphores and httpx connection pools are bound to the loop that first
+    uses them, so each loop (the app's, a worker script's asyncio.run, a test)
+    gets its own set instead of sharing one that breaks on the next loop.
+    """
+
+    def __init__(self):
+        self.client = None
+        self.semaphores = {}
+        self.buckets = {}
+
+
+_loop_resources = weakref.WeakKeyDictionary()  # event loop -> _LoopResources
+_loop_resources_lock = threading.Lock()
+
+
+def _resources() -> _LoopResources:
+    loop = asyncio.get_running_loop()
+    with _loop_resources_lock:
+        resources = _loop_resources.get(loop)
+        if resources is None:
+            resources = _loop_resources[loop] = _LoopResources()
+        return resources
+
+
+def get_async_client() -> AsyncOpenAI:
+    """
+    Returns the AsyncOpenAI client for the running event loop, created on first
+    use so it binds to that loop's connection pool. Must be called from a coroutine.
+    """
+    resources = _resources()
+    if resources.client is None:
+        http_client = httpx.AsyncClient(
+            http2=settings.llm_http2 and HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=settings.llm_max_connections,
+                max_keepalive_connections=settings.llm_max_connections,
+                keepalive_expiry=60,
+            ),
+            timeout=httpx.Timeout(settings.llm_timeout_seconds, connect=10.0),
+        )
+        resources.client = AsyncOpenAI(api_key=settings.openai_api_key, http_client=http_client)
+    return resources.client
+
+
+def _model_limits(model: str) -> tuple[asyncio.Semaphore, TokenBucket]:
+    """
+    Per-model concurrency semaphore and token bucket for the running event loop.
+    """
+    resources = _resources()
+    if model not in resources.semaphores:
+        resources.semaphores[model] = asyncio.Semaphore(settings.llm_max_concurrency_per_model)
+        rpm = settings.llm_requests_per_minute
+        resources.buckets[model] = TokenBucket(rate=rpm / 60.0, capacity=max(1.0, rpm / 60.0 * 5))
+    return resources.semaphores[model], resources.buckets[model]
+
+
+async def _off_loop_if_blocking(fn, *args):
+    """
+    Runs a cache call, in a worker thread when the store does I/O.
+    """
+    if response_cache.store_is_blocking():
+        return await asyncio.to_thread(fn, *args)
+    return fn(*args)
+
+
+async def agenerate_completion(
+    prompt: str,
+    model_name: str = None,
+    agent: str = "default",
+    use_cache: bool = None,
+    cache_ttl: int = None,
+) -> str:
+    """
+    Async version of generate_completion().
+    Waits for a rate-limit token and a per-model concurrency slot before calling the API.
+
+    Args:
+        prompt (str): Prompt text to send.
+        model_name (str, optional): Override model name directly.
+        agent (str, optional): Agent name ('topic_agent', etc.) for default model lookup.
+        use_cache (bool, optional): Force the response cache on/off (defaults to the agent opt-in).
+        cache_ttl (int, optional): Seconds to keep a cached response (defaults to settings).
+
+    Returns:
+        str: Generated response from the LLM.
+    """
+    selected_model = resolve_model(model_name, agent)
+    cache_key = _cache_key_for(prompt, selected_model, agent, use_cache)
+    if cache_key:
+        cached = await _off_loop_if_blocking(response_cache.cached_response, cache_key)
+        response_cache.record(agent, hit=cached is not None)
+        if cached is not None:
+            print(f"♻️ Cached completion for {agent} (async): {selected_model}")
+            return cached
+
+    print(f"🤖 Using model for {agent} (async): {selected_model}")
+
+    semaphore, bucket = _model_limits(selected_model)
+    await bucket.acquire()
+    async with semaphore:
+        response = await get_async_client().chat.completions.create(
+            model=selected_model,
+            messages=build_messages(prompt),
+            temperature=DEFAULT_TEMPERATURE,
+            max_tokens=DEFAULT_MAX_TOKENS
+        )
+
+    result = response.choices[0].message.content.strip()
+    if cache_key:
+        await _off_loop_if_blocking(response_cache.store_response, cache_key, result, cache_ttl)
+    return result
+
+
+async def astream_completion(prompt: str, model_name: str = None, agent: str = "default"):
+    """
+    Streams a completion as text deltas. Shares the rate limit and concurrency
+    slot of agenerate_completion(); streamed responses are not cached.
+
+    Yields:
+        str: Each non-empty content delta as it arrives.
+    """
+    selected_model = resolve_model(model_name, agent)
+    print(f"🤖 Streaming model for {agent}: {selected_model}")
+
+    semaphore, bucket = _model_limits(selected_model)
+    await bucket.acquire()
+    async with semaphore:
+        stream = await get_async_client().chat.completions.create(
+            model=selected_model,
+            messages=build_messages(prompt),
+            temperature=DEFAULT_TEMPERATURE,
+            max_tokens=DEFAULT_MAX_TOKENS,
+            stream=True
+        )
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
@@ -60,6 +60,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],  # Pagination cursor; ETag for conditional detail polls
 )
 
 
@@ -87,3 +88,15 @@ app.include_router(content_requests.router)  # 👈 add this too
 
 from app.api import users  # <- make sure this import is here
 app.include_router(users.router)
+
+from fastapi import Depends
+from app.database import pool_stats
+from app.dependencies import get_current_user
+
+
+@app.get("/health/db-pool", tags=["Health"])
+def get_db_pool_stats(user_id: int = Depends(get_current_user)):
+    """
+    Database connection pool occupancy and checkout wait times for this process.
+    """
+    return {"success": True, "pool": pool_stats()}
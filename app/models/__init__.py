@@ -11,5 +11,9 @@ from .summaries import Summary
 from .topic_source_usage import TopicSourceUsage
 from .content_queue import ContentQueue
 from .thread_metadata import ThreadMetadata
+from .page_cache import PageCache
 
 
+from .embedding_cache import EmbeddingCache
+from .pipeline_jobs import PipelineJob
+from .publish_ledger import PublishLedger
@@ -4,13 +4,31 @@ SQLAlchemy model for the content_queue table.
 Stores generated content drafts, status, scheduling info, and platform metadata.
 """
 
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, DateTime, Boolean, TIMESTAMP
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, DateTime, Boolean, TIMESTAMP, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 
 class ContentQueue(Base):
     __tablename__ = "content_queue"
+    __table_args__ = (
+        # Request detail and pipeline status: content of a request
+        Index("ix_content_queue_request_user", "request_id", "user_id"),
+        # Scheduled listing: a user's rows by status, in posting order
+        Index("ix_content_queue_user_status_scheduled", "user_id", "status", "scheduled_for"),
+        # Post dispatcher: only due-able rows, so the index stays small
+        Index(
+            "ix_content_queue_due",
+            "scheduled_for",
+            postgresql_where=text("status = 'scheduled' AND deleted_at IS NULL"),
+        ),
+        # Post dispatcher stale recovery
+        Index(
+            "ix_content_queue_posting",
+            "dispatch_started_at",
+            postgresql_where=text("status = 'posting'"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     request_id = Column(Integer, ForeignKey("requests.id", ondelete="CASCADE"), nullable=False)
@@ -18,7 +36,7 @@ class ContentQueue(Base):
 
     content_type = Column(String(20), nullable=False)  # "thread" or "article"
     generated_content = Column(Text, nullable=False)
-    status = Column(String(20), default="draft")  # draft/approved/posted/flagged/scheduled
+    status = Column(String(20), default="draft")  # draft/approved/posted/flagged/scheduled/posting/partially_posted
     scheduled_for = Column(DateTime, nullable=True)
     platform = Column(String(20), nullable=False)
     post_response = Column(Text, nullable=True)  # API response from X/Typefully
@@ -26,6 +44,7 @@ class ContentQueue(Base):
 
     created_at = Column(DateTime, server_default=func.now())
     posted_at = Column(DateTime, nullable=True)
+    dispatch_started_at = Column(DateTime, nullable=True)  # Set when the post dispatcher claims the row
     platform_posted_id = Column(String, nullable=True)
     deleted_at = Column(TIMESTAMP, nullable=True)
     was_scheduled_then_deleted = Column(Boolean, default=False, server_default="false")
@@ -0,0 +1,23 @@
+# app/models/embedding_cache.py
+"""
+SQLAlchemy model for the embedding_cache table.
+Persists embedding vectors keyed by (model, sha256 of text) so repeated
+topics and snippets are not re-embedded across runs and processes.
+"""
+
+from sqlalchemy import Column, Integer, String, LargeBinary, DateTime, UniqueConstraint
+from datetime import datetime
+from app.database import Base
+
+class EmbeddingCache(Base):
+    __tablename__ = "embedding_cache"
+
+    id = Column(Integer, primary_key=True)
+    model = Column(String(100), nullable=False)
+    text_hash = Column(String(64), nullable=False)
+    vector = Column(LargeBinary, nullable=False)  # float32 bytes
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("model", "text_hash", name="uq_embedding_model_text"),
+    )
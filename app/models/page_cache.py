@@ -0,0 +1,26 @@
+# app/models/page_cache.py
+"""
+SQLAlchemy model for the page_cache table.
+Stores extracted metadata for fetched source pages, keyed by a hash of the
+normalised URL, so research runs can skip re-downloading popular pages.
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from datetime import datetime
+from app.database import Base
+
+class PageCache(Base):
+    __tablename__ = "page_cache"
+
+    id = Column(Integer, primary_key=True)
+    url_hash = Column(String(64), unique=True, nullable=False)  # sha256 of normalised URL
+    url = Column(Text, nullable=False)
+    final_url = Column(Text, nullable=True)
+    status_code = Column(Integer, nullable=False)
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(64), nullable=True)
+    title = Column(Text, nullable=True)
+    description = Column(Text, nullable=True)
+    snippet = Column(Text, nullable=True)
+    fetched_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
@@ -0,0 +1,38 @@
+"""
+SQLAlchemy model for the pipeline_jobs table.
+Durable queue of pipeline stages (topic/research/summary/content). Workers
+lease jobs with a visibility timeout, so a crashed worker's job is picked up
+again once its lease expires.
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, text
+from datetime import datetime
+from app.database import Base
+
+class PipelineJob(Base):
+    __tablename__ = "pipeline_jobs"
+    __table_args__ = (
+        Index("ix_pipeline_jobs_claim", "status", "stage", "run_after"),
+        # At most one queued/running job per request, enforced by the database
+        Index(
+            "uq_pipeline_jobs_active_request",
+            "request_id",
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+            sqlite_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    request_id = Column(Integer, ForeignKey("requests.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    stage = Column(String(20), nullable=False)  # topic/research/summary/content
+    status = Column(String(20), default="queued", nullable=False)  # queued/running/succeeded/dead
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    run_after = Column(DateTime, default=datetime.utcnow, nullable=False)  # Backoff: not claimable before this
+    locked_by = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
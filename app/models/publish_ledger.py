@@ -0,0 +1,20 @@
+# app/models/publish_ledger.py
+"""
+SQLAlchemy model for the publish_ledger table.
+Records the platform response for every successful post, keyed by its
+idempotency key, so a retried, recovered or concurrent dispatch of the same
+content returns the recorded result instead of posting again.
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from datetime import datetime
+from app.database import Base
+
+class PublishLedger(Base):
+    __tablename__ = "publish_ledger"
+
+    id = Column(Integer, primary_key=True)
+    idempotency_key = Column(String(100), unique=True, nullable=False)  # e.g. content-42 or content-42-3
+    platform = Column(String(20), nullable=False)
+    response = Column(Text, nullable=False)  # JSON body returned by the platform
+    created_at = Column(DateTime, default=datetime.utcnow)
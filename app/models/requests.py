@@ -2,11 +2,15 @@
 # Tracks all user-initiated content requests
 
 import datetime
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index
 from app.database import Base
 
 class Request(Base):
     __tablename__ = "requests"
+    __table_args__ = (
+        # Request listing: newest first per user, with id as tie-breaker
+        Index("ix_requests_user_created", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
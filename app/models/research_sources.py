@@ -1,13 +1,17 @@
 # research_sources.py
 # SQLAlchemy model for storing research source info
 
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean, DECIMAL
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean, DECIMAL, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
 class ResearchSource(Base):
     __tablename__ = "research_sources"
+    __table_args__ = (
+        # Request detail, summary and content stages: sources of a request by status
+        Index("ix_research_sources_request_user_status", "request_id", "user_id", "verification_status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     request_id = Column(Integer, ForeignKey("requests.id", ondelete="CASCADE"), nullable=False)
@@ -3,11 +3,14 @@ SQLAlchemy model for storing summarised research content
 linked to a user's content generation request.
 """
 
-from sqlalchemy import Column, Integer, Text, Boolean, ForeignKey, ARRAY, TIMESTAMP, func
+from sqlalchemy import Column, Integer, Text, Boolean, ForeignKey, ARRAY, TIMESTAMP, Index, func
 from app.database import Base
 
 class Summary(Base):
     __tablename__ = "summaries"
+    __table_args__ = (
+        Index("ix_summaries_request_user", "request_id", "user_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     request_id = Column(Integer, ForeignKey("requests.id", ondelete="CASCADE"), nullable=False)
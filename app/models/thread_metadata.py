@@ -13,7 +13,7 @@ class ThreadMetadata(Base):
     __tablename__ = "thread_metadata"
 
     id = Column(Integer, primary_key=True, index=True)
-    content_queue_id = Column(Integer, ForeignKey("content_queue.id", ondelete="CASCADE"), nullable=False)
+    content_queue_id = Column(Integer, ForeignKey("content_queue.id", ondelete="CASCADE"), nullable=False, index=True)
 
     requested_tweet_count = Column(Integer, nullable=False)
     actual_tweet_count = Column(Integer, nullable=False)
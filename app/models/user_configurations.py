@@ -17,5 +17,6 @@ class UserConfiguration(Base):
     default_source_count = Column(Integer, default=5)
     research_preference = Column(String(50), default="balanced")
     platform_preference = Column(String(20), default="typefully")
+    x_access_token = Column(Text, nullable=True)  # OAuth user token for native X posting
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
@@ -66,3 +66,34 @@ Key Points:
 - ...
 - ...
 """
+
+
+def build_batch_source_summary_prompt(source_texts: list[str], max_words: int = 120) -> str:
+    """
+    Builds a prompt to summarise several research sources in one request,
+    answered as JSON keyed by each source's position.
+
+    Args:
+        source_texts (list): Texts to summarise, one per source.
+        max_words (int): Target length for each summary.
+
+    Returns:
+        str: Prompt formatted for LLM to summarise all sources.
+    """
+    sources = "\n\n".join(
+        f"[Source {i}]\n{text}" for i, text in enumerate(source_texts, start=1)
+    )
+    return f"""
+You are a concise summariser for research content.
+
+For each source below, summarise its text into a clear short paragraph
+and extract 3 to 5 key points that reflect its core ideas.
+Treat every source on its own; do not mix information between them.
+
+Keep each summary under {max_words} words.
+
+{sources}
+
+Respond with JSON only, in this exact shape, with one entry per source:
+{{"sources": [{{"id": 1, "summary": "...", "key_points": ["...", "..."]}}]}}
+"""
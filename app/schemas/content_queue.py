@@ -0,0 +1,29 @@
+# app/schemas/content_queue.py
+"""
+Pydantic schemas for bulk content queue actions.
+Items are chosen by explicit content_ids, a filter, or both.
+"""
+
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class BulkContentSelection(BaseModel):
+    content_ids: Optional[list[int]] = Field(None, example=[12, 13, 14])
+    status: Optional[str] = Field(None, example="draft")
+    request_ids: Optional[list[int]] = None
+    limit: int = Field(500, ge=1, le=500)
+
+
+class BulkApproveRequest(BulkContentSelection):
+    pass
+
+
+class BulkScheduleRequest(BulkContentSelection):
+    scheduled_for: datetime
+    interval_minutes: int = Field(0, ge=0, description="Space each item this many minutes after the previous")
+
+
+class BulkPostRequest(BulkContentSelection):
+    dry_run: bool = False
@@ -2,6 +2,7 @@
 
 from pydantic import BaseModel
 from typing import Optional
+from datetime import datetime
 
 class UpdateUserConfig(BaseModel):
     persona: Optional[str] = None
@@ -10,3 +11,39 @@ class UpdateUserConfig(BaseModel):
     language: Optional[str] = None
     platform_preference: Optional[str] = None
     research_preference: Optional[str] = None
+
+
+class UserConfigOut(BaseModel):
+    """
+    A user's configuration as returned by the API. The X access token is never
+    serialised; x_account_connected says whether one is stored.
+    """
+    id: int
+    user_id: int
+    persona: Optional[str] = None
+    tone: Optional[str] = None
+    style: Optional[str] = None
+    language: Optional[str] = None
+    default_source_count: Optional[int] = None
+    research_preference: Optional[str] = None
+    platform_preference: Optional[str] = None
+    x_account_connected: bool = False
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @classmethod
+    def from_config(cls, config) -> "UserConfigOut":
+        return cls(
+            id=config.id,
+            user_id=config.user_id,
+            persona=config.persona,
+            tone=config.tone,
+            style=config.style,
+            language=config.language,
+            default_source_count=config.default_source_count,
+            research_preference=config.research_preference,
+            platform_preference=config.platform_preference,
+            x_account_connected=bool(config.x_access_token),
+            created_at=config.created_at,
+            updated_at=config.updated_at,
+        )
@@ -0,0 +1,145 @@
+"""
+Batch Source Summariser
+-----------------------
+Summarises many research sources with as few LLM calls as possible: sources
+are packed into requests under Settings.summary_batch_token_budget, each
+request asks for JSON with a summary and key points per source, and the
+answers are mapped back by source id.
+
+Sources the model leaves out, or a batch whose JSON can't be parsed, come
+back as None from summarise_sources(); the caller retries those with
+summarise_fallback(), one build_source_summary_prompt() call each, on its own
+worker pool. A source whose fallback also fails stays None, so one bad
+source (or an LLM outage) never aborts the research stage.
+"""
+
+import json
+import re
+import threading
+from app.agents.summary_agent import parse_llm_output
+from app.config import settings
+from app.llm.engine import DEFAULT_MAX_TOKENS, generate_completion
+from app.prompts.summary_prompt import build_batch_source_summary_prompt, build_source_summary_prompt
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except ImportError:
+    _encoding = None
+
+BATCH_SUMMARY_WORDS = 120
+# Expected completion tokens per source: summary plus key points and JSON overhead
+OUTPUT_TOKENS_PER_SOURCE = 260
+PROMPT_OVERHEAD_TOKENS = 150
+# Without tiktoken: English prose averages ~4 characters per token, but URLs,
+# numbers and non-English text run denser, so estimate high to stay under budget
+CHARS_PER_TOKEN_ESTIMATE = 3
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Token count with tiktoken when installed, else a deliberately high
+    estimate from the character count.
+    """
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return len(text) // CHARS_PER_TOKEN_ESTIMATE + 1
+
+
+def plan_batches(texts: list[str], token_budget: int = None) -> list[list[int]]:
+    """
+    Groups source indexes into batches, in order. A batch closes when its
+    prompt would exceed token_budget or its expected answer would exceed the
+    completion limit. A single oversized source still gets a batch of its own.
+
+    Returns:
+        list[list[int]]: Source indexes per request
+    """
+    token_budget = token_budget or settings.summary_batch_token_budget
+    max_sources = max(1, DEFAULT_MAX_TOKENS // OUTPUT_TOKENS_PER_SOURCE)
+
+    batches, current, used = [], [], PROMPT_OVERHEAD_TOKENS
+    for idx, text in enumerate(texts):
+        cost = estimate_tokens(text) + 10
+        if current and (used + cost > token_budget or len(current) >= max_sources):
+            batches.append(current)
+            current, used = [], PROMPT_OVERHEAD_TOKENS
+        current.append(idx)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+_JSON_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def parse_batch_response(response_text: str, count: int) -> dict:
+    """
+    Parses a batch answer into {position: (summary, key_points)} for
+    positions 1..count. Malformed or missing entries are left out.
+    """
+    match = _JSON_RE.search(response_text or "")
+    if not match:
+        return {}
+    try:
+        data = json.loads(match.group(0))
+    except ValueError:
+        return {}
+
+    parsed = {}
+    for entry in data.get("sources", []) if isinstance(data, dict) else []:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            position = int(entry.get("id"))
+        except (TypeError, ValueError):
+            continue
+        summary = str(entry.get("summary") or "").strip()
+        key_points = entry.get("key_points") or []
+        if 1 <= position <= count and summary and isinstance(key_points, list):
+            parsed[position] = (summary, [str(p).strip() for p in key_points if str(p).strip()])
+    return parsed
+
+
+def summarise_fallback(text: str, cancel_event: threading.Event = None) -> tuple[str, list[str]] | None:
+    """
+    Summarises one source on its own, for sources a batch missed.
+    Takes a cancel_event so it can run on research_agent's worker pool.
+
+    Returns:
+        tuple | None: (summary, key_points), or None if the call failed or was cancelled
+    """
+    if cancel_event is not None and cancel_event.is_set():
+        return None
+    try:
+        response = generate_completion(build_source_summary_prompt(text), agent="source_summariser")
+        return parse_llm_output(response)
+    except Exception as e:
+        print(f"⚠️ Source summary failed: {e}")
+        return None
+
+
+def summarise_sources(texts: list[str], token_budget: int = None) -> list[tuple[str, list[str]] | None]:
+    """
+    Summarises every text in batched requests under the token budget.
+
+    Returns:
+        list: (summary, key_points) per text in input order, or None where
+        the batch left it out; run summarise_fallback() for those
+    """
+    results = [None] * len(texts)
+    for batch in plan_batches(texts, token_budget):
+        batch_texts = [texts[i] for i in batch]
+        try:
+            response = generate_completion(
+                build_batch_source_summary_prompt(batch_texts, BATCH_SUMMARY_WORDS), agent="source_summariser"
+            )
+            parsed = parse_batch_response(response, len(batch))
+        except Exception as e:
+            print(f"⚠️ Batch summary failed for {len(batch)} sources: {e}")
+            parsed = {}
+
+        for position, idx in enumerate(batch, start=1):
+            results[idx] = parsed.get(position)
+    return results
@@ -6,7 +6,8 @@ Handles the business logic for content queue management:
 - Simulated posting (to be replaced by real Typefully/X integration)
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
@@ -14,12 +15,16 @@ from app.models.content_queue import ContentQueue
 from app.services.content_validation import validate_article_length, validate_thread_structure
 from app.utils.offensive_filter import check_offensive_content
 
-from app.services.platform_publisher import post_to_typefully, post_to_x
+from app.services.platform_publisher import post_to_typefully, post_to_x, content_idempotency_key
+from app.services.thread_publisher import publish_x_thread, ThreadDeferred, ThreadPartiallyPosted
 from app.models.thread_metadata import ThreadMetadata
 from app.config import settings
 from sqlalchemy.exc import SQLAlchemyError
 import logging
 
+# Statuses post_content() and bulk posting will send
+POSTABLE_STATUSES = ["approved", "scheduled", "partially_posted"]
+
 
 # --- Approve content after validation ---
 def approve_content(content_id: int, db: Session):
@@ -34,6 +39,20 @@ def approve_content(content_id: int, db: Session):
 
     print("DEBUG: content.status =", content.status)
 
+    validate_for_approval(content)
+
+    # Step 3: Approve
+    content.status = "approved"
+    db.commit()
+
+    return {"success": True, "message": "Content approved"}
+
+
+def validate_for_approval(content: ContentQueue):
+    """
+    Checks a draft can be approved. Raises HTTPException (or ValueError from
+    the length validators) if not.
+    """
     if content.status != "draft":
         raise HTTPException(status_code=400, detail="Only draft content can be approved")
 
@@ -59,25 +78,40 @@ def approve_content(content_id: int, db: Session):
     # if check_offensive_content(content.generated_content):
     #     raise HTTPException(status_code=400, detail="Content flagged as offensive")
 
-    # Step 3: Approve
-    content.status = "approved"
-    db.commit()
-
-    return {"success": True, "message": "Content approved"}
-
 
 # --- Schedule content for future posting ---
 def schedule_content(content_id: int, scheduled_for: datetime, db: Session):
     """
     Schedules approved content for future posting.
     Validates datetime and sets status = 'scheduled'.
+    The row is locked so a concurrent dispatcher claim is seen, not overwritten.
     """
-    content = db.query(ContentQueue).filter(ContentQueue.id == content_id).first()
+    content = db.query(ContentQueue).filter(ContentQueue.id == content_id).with_for_update().first()
 
     if not content:
         raise HTTPException(status_code=404, detail="Content not found")
 
-    if content.status in ["posted", "scheduled_deleted", "failed"]:
+    scheduled_for = validate_for_schedule(content, scheduled_for)
+
+    # Optional: Validate platform compatibility here
+    content.scheduled_for = scheduled_for
+    content.status = "scheduled"
+    content.deleted_at = None  # clear deletion if re-scheduling
+
+    db.commit()
+    return {"success": True, "message": "Content scheduled"}
+
+
+def validate_for_schedule(content: ContentQueue, scheduled_for: datetime) -> datetime:
+    """
+    Checks content can be scheduled for the given time and returns it as an aware UTC datetime.
+    Raises HTTPException if not.
+
+    Rows being sent ("posting") are rejected: rescheduling them could post
+    twice. A "partially_posted" thread may be rescheduled; when it falls due
+    it resumes from its first unposted tweet, as a deferred thread does.
+    """
+    if content.status in ["posting", "posted", "scheduled_deleted", "failed"]:
         raise HTTPException(status_code=400, detail=f"Content in status '{content.status}' cannot be scheduled")
     
     from datetime import timezone
@@ -87,16 +121,7 @@ def schedule_content(content_id: int, scheduled_for: datetime, db: Session):
 
     if scheduled_for < datetime.now(timezone.utc):
         raise HTTPException(status_code=400, detail="Scheduled time must be in the future")
-    # if scheduled_for < datetime.now(timezone.utc):
-    #     raise HTTPException(status_code=400, detail="Scheduled time must be in the future")
-
-    # Optional: Validate platform compatibility here
-    content.scheduled_for = scheduled_for
-    content.status = "scheduled"
-    content.deleted_at = None  # clear deletion if re-scheduling
-
-    db.commit()
-    return {"success": True, "message": "Content scheduled"}
+    return scheduled_for
 
 
 # --- Post content immediately (simulated) ---
@@ -110,9 +135,27 @@ def post_content(content_id: int, db: Session, dry_run: bool = False) -> dict:
     if not content:
         raise ValueError(f"Content with ID {content_id} not found")
 
-    if content.status not in ["approved", "scheduled"]:
+    if content.status not in POSTABLE_STATUSES:
         raise ValueError("Content must be approved or scheduled before posting")
 
+    return publish_content(content, db, dry_run=dry_run)
+
+
+def publish_content(content: ContentQueue, db: Session, dry_run: bool = False) -> dict:
+    """
+    Sends content to its platform and records the outcome on the row.
+    Callers are responsible for checking the content is ready to post.
+    A row that already has a platform_posted_id is never sent again.
+
+    X threads resume from their first unposted tweet. If X rate-limits the
+    user, the row goes back to "scheduled" for when the window resets.
+    """
+    if content.platform_posted_id and content.platform_posted_id != "dry_run_id" and not dry_run:
+        content.status = "posted"
+        content.posted_at = content.posted_at or datetime.utcnow()
+        db.commit()
+        return {"success": True, "message": "Already posted", "platform_posted_id": content.platform_posted_id}
+
     try:
         response = {}
         if dry_run:
@@ -123,11 +166,18 @@ def post_content(content_id: int, db: Session, dry_run: bool = False) -> dict:
             }
 
         elif content.platform == "typefully":
-            response = post_to_typefully(content.generated_content, scheduled_for=content.scheduled_for)
+            # Due posts are published now; only future times are handed to Typefully
+            scheduled_for = content.scheduled_for
+            if scheduled_for and scheduled_for.replace(tzinfo=None) <= datetime.utcnow():
+                scheduled_for = None
+            response = post_to_typefully(
+                content.generated_content,
+                scheduled_for=scheduled_for,
+                idempotency_key=content_idempotency_key(content.id)
+            )
 
         elif content.platform == "x":
-            # 🔧 TODO: Lookup user's access_token (requires user onboarding flow)
-            raise NotImplementedError("Twitter posting not yet implemented. OAuth flow required.")
+            response = publish_x_thread(content, db)
 
         else:
             raise ValueError(f"Unsupported platform: {content.platform}")
@@ -141,14 +191,29 @@ def post_content(content_id: int, db: Session, dry_run: bool = False) -> dict:
 
         return {"success": True, "message": "Posted successfully", "platform_posted_id": content.platform_posted_id}
 
+    except ThreadDeferred as e:
+        retry_at = datetime.utcnow() + timedelta(seconds=e.retry_after)
+        logging.warning(f"Content ID {content.id} rate-limited on X; rescheduled for {retry_at}")
+        content.status = "scheduled"
+        content.scheduled_for = retry_at
+        content.error_message = str(e)
+        db.commit()
+        return {"success": False, "deferred": True, "message": "Rate limited; rescheduled", "retry_at": retry_at.isoformat()}
+
+    except ThreadPartiallyPosted as e:
+        logging.error(f"Error posting content ID {content.id}: {e}")
+        content.status = "partially_posted"
+        content.error_message = str(e)
+        db.commit()
+        return {"success": False, "message": "Thread partially posted; post again to resume", "error": str(e)}
+
     except Exception as e:
-        logging.error(f"Error posting content ID {content_id}: {e}")
+        logging.error(f"Error posting content ID {content.id}: {e}")
         content.status = "failed"
         content.error_message = str(e)
         db.commit()
         return {"success": False, "message": "Posting failed", "error": str(e)}
-    
-    
+
 
 def delete_scheduled_content(content_id: int, db: Session):
     """
@@ -170,3 +235,193 @@ def delete_scheduled_content(content_id: int, db: Session):
 
     return {"success": True, "message": "Scheduled content deleted"}
 
+
+
+# --- Bulk operations ---
+
+BULK_MAX_ITEMS = 500
+
+
+def select_bulk_content(
+    db: Session,
+    user_id: int,
+    content_ids: list[int] = None,
+    status: str = None,
+    request_ids: list[int] = None,
+    limit: int = BULK_MAX_ITEMS,
+    for_update: bool = False,
+):
+    """
+    Loads the user's content rows for a bulk action in one query, by explicit
+    ids and/or a filter. With for_update the rows stay locked until commit.
+
+    Returns:
+        tuple: (rows in requested order, ids that were not found or not owned)
+    """
+    if not content_ids and not status and not request_ids:
+        raise HTTPException(status_code=400, detail="Provide content_ids or a filter")
+    if content_ids and len(content_ids) > limit:
+        raise HTTPException(status_code=400, detail=f"At most {limit} items per bulk request")
+
+    query = db.query(ContentQueue).filter(ContentQueue.user_id == user_id)
+    if content_ids:
+        query = query.filter(ContentQueue.id.in_(content_ids))
+    if status:
+        query = query.filter(ContentQueue.status == status)
+    if request_ids:
+        query = query.filter(ContentQueue.request_id.in_(request_ids))
+    if for_update:
+        query = query.with_for_update()
+
+    if content_ids:
+        by_id = {row.id: row for row in query.all()}
+        ordered_ids = list(dict.fromkeys(content_ids))
+        return [by_id[i] for i in ordered_ids if i in by_id], [i for i in ordered_ids if i not in by_id]
+    return query.order_by(ContentQueue.id).limit(limit).all(), []
+
+
+def _error_detail(e: Exception) -> str:
+    return getattr(e, "detail", None) or str(e)
+
+
+def _bulk_response(results: list[dict]) -> dict:
+    succeeded = sum(1 for r in results if r["success"])
+    return {
+        "success": succeeded == len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": results,
+    }
+
+
+def bulk_approve_content(db: Session, user_id: int, **selection) -> dict:
+    """
+    Approves many drafts with the same checks as approve_content(), in one transaction.
+    Items that fail validation are reported and left unchanged.
+    """
+    rows, missing = select_bulk_content(db, user_id, **selection)
+    results = [{"id": i, "success": False, "error": "Content not found"} for i in missing]
+
+    for content in rows:
+        try:
+            validate_for_approval(content)
+        except (HTTPException, ValueError) as e:
+            results.append({"id": content.id, "success": False, "error": _error_detail(e)})
+            continue
+        content.status = "approved"
+        results.append({"id": content.id, "success": True, "status": "approved"})
+
+    db.commit()
+    return _bulk_response(results)
+
+
+def bulk_schedule_content(
+    db: Session,
+    user_id: int,
+    scheduled_for: datetime,
+    interval_minutes: int = 0,
+    **selection
+) -> dict:
+    """
+    Schedules many items with the same checks as schedule_content(), in one
+    transaction. With interval_minutes, each valid item is spaced that far
+    after the previous one.
+    """
+    rows, missing = select_bulk_content(db, user_id, for_update=True, **selection)
+    results = [{"id": i, "success": False, "error": "Content not found"} for i in missing]
+
+    slot = 0
+    for content in rows:
+        when = scheduled_for + timedelta(minutes=interval_minutes * slot)
+        try:
+            when = validate_for_schedule(content, when)
+        except HTTPException as e:
+            results.append({"id": content.id, "success": False, "error": _error_detail(e)})
+            continue
+        content.scheduled_for = when
+        content.status = "scheduled"
+        content.deleted_at = None
+        slot += 1
+        results.append({"id": content.id, "success": True, "status": "scheduled", "scheduled_for": when.isoformat()})
+
+    db.commit()
+    return _bulk_response(results)
+
+
+def claim_bulk_content(db: Session, user_id: int, content_ids: list[int], values: dict) -> set[int]:
+    """
+    Moves rows that are still postable to new values with a guarded UPDATE and
+    returns the ids it changed. A row the post dispatcher has already claimed
+    (or is claiming) no longer matches, so it is never sent twice.
+    """
+    if not content_ids:
+        return set()
+    claimed = db.execute(
+        update(ContentQueue)
+        .where(
+            ContentQueue.id.in_(content_ids),
+            ContentQueue.user_id == user_id,
+            ContentQueue.status.in_(POSTABLE_STATUSES),
+        )
+        .values(**values)
+        .returning(ContentQueue.id),
+        execution_options={"synchronize_session": False},
+    ).scalars().all()
+    db.commit()
+    return set(claimed)
+
+
+def bulk_post_content(db: Session, user_id: int, dry_run: bool = False, **selection) -> dict:
+    """
+    Queues many items to post now. Eligible rows are made due immediately
+    ("scheduled" for now) and reported as "queued"; nothing is sent until the
+    post dispatcher daemon (scripts/run_post_dispatcher.py) picks them up on
+    its next poll, so it must be running. Returns without waiting for the
+    platforms; each row's status shows the outcome.
+
+    Dry runs make no requests, so they are claimed ("posting") and simulated
+    in-process instead.
+
+    Returns:
+        dict: Bulk summary plus "queued_ids", the rows handed to the dispatcher
+    """
+    rows, missing = select_bulk_content(db, user_id, **selection)
+    results = {i: {"id": i, "success": False, "error": "Content not found"} for i in missing}
+
+    eligible = []
+    for content in rows:
+        if content.status in POSTABLE_STATUSES:
+            eligible.append(content.id)
+        else:
+            results[content.id] = {
+                "id": content.id, "success": False,
+                "error": "Content must be approved or scheduled before posting"
+            }
+
+    now = datetime.utcnow()
+    if dry_run:
+        from app.services.post_dispatcher import dispatch_claimed_posts  # post_dispatcher imports this module
+
+        claimed = claim_bulk_content(db, user_id, eligible, {"status": "posting", "dispatch_started_at": now})
+        to_send = [i for i in eligible if i in claimed]
+        for content_id, outcome in zip(to_send, dispatch_claimed_posts(to_send, dry_run=True)):
+            results[content_id] = {"id": content_id, **outcome}
+    else:
+        claimed = claim_bulk_content(
+            db, user_id, eligible, {"status": "scheduled", "scheduled_for": now, "deleted_at": None}
+        )
+        for content_id in claimed:
+            results[content_id] = {
+                "id": content_id, "success": True, "status": "queued",
+                "message": "Queued; the post dispatcher will send it on its next poll"
+            }
+
+    for content_id in eligible:
+        if content_id not in claimed:
+            results[content_id] = {"id": content_id, "success": False, "error": "Content is already being posted"}
+
+    db.expire_all()
+    order = list(missing) + [row.id for row in rows]
+    response = _bulk_response([results[i] for i in order])
+    response["queued_ids"] = [] if dry_run else [i for i in eligible if i in claimed]
+    return response
@@ -1,13 +1,29 @@
 """
 Embedding Similarity
 --------------------
-Uses OpenAI's embedding API to score similarity between content topic and source text.
+Scores similarity between content topic and source text using a pluggable
+embedding backend, selected by Settings.embedding_backend:
+- "openai":  OpenAI's embedding API (default)
+- "hashing": local feature-hashing of word and character n-grams (no network)
+
+Texts are embedded in batches (one request for many inputs) and remote
+vectors are cached in-process (LRU) and in the embedding_cache table, keyed by
+(model, sha256 of text). Scoring uses a vectorised cosine-similarity matrix.
 """
 
+import hashlib
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
 import openai
 import numpy as np
 from typing import List
+from sqlalchemy.exc import SQLAlchemyError
 from app.config import settings
+from app.database import SessionLocal
+from app.models.embedding_cache import EmbeddingCache
+from app.utils.hash import hash_string
 from openai import OpenAI
 
 openai.api_key = settings.openai_api_key
@@ -15,19 +31,256 @@ openai.api_key = settings.openai_api_key
 client = OpenAI(api_key=settings.openai_api_key)
 
 
-def get_embedding(text: str, model: str = "text-embedding-ada-002") -> List[float]:
+class VectorLRU:
+    """
+    Thread-safe LRU of embedding vectors keyed by (model, text_hash).
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            vec = self._data.get(key)
+            if vec is not None:
+                self._data.move_to_end(key)
+            return vec
+
+    def put(self, key, vec):
+        with self._lock:
+            self._data[key] = vec
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+vector_cache = VectorLRU(settings.embedding_cache_size)
+
+
+class EmbeddingBackend:
+    """
+    Base class for embedding backends.
+
+    Attributes:
+        name (str): Key used in Settings.embedding_backend
+        model (str): Identifier used in cache keys
+        relevance_threshold (float): Similarity a source needs to count as relevant
+        cacheable (bool): Whether vectors are worth caching (remote backends only)
+    """
+    name = ""
+    model = ""
+    relevance_threshold = 0.7
+    cacheable = False
+
+    def embed(self, texts: list[str]) -> list[List[float]]:
+        raise NotImplementedError
+
+
+class OpenAIEmbeddingBackend(EmbeddingBackend):
+    name = "openai"
+    relevance_threshold = 0.7
+    cacheable = True
+
+    def __init__(self, model: str = None):
+        self.model = model or settings.embedding_model
+
+    def embed(self, texts: list[str]) -> list[List[float]]:
+        """
+        Embeds texts with as few API requests as embedding_batch_size allows.
+        """
+        vectors = []
+        batch_size = max(1, settings.embedding_batch_size)
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            response = client.embeddings.create(input=batch, model=self.model)
+            ordered = sorted(response.data, key=lambda d: d.index)
+            vectors.extend(item.embedding for item in ordered)
+        return vectors
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+
+class HashingEmbeddingBackend(EmbeddingBackend):
     """
-    Gets an embedding vector using the OpenAI client (>=1.0.0).
+    Local CPU backend: signed feature hashing of word unigrams, bigrams and
+    character 4-grams with sublinear term frequency, L2-normalised. Needs no model download
+    and no network, so it also serves offline tests.
     """
+    name = "hashing"
+
+    def __init__(self, n_features: int = None):
+        self.n_features = n_features or settings.local_embedding_dim
+        self.model = f"hashing-{self.n_features}"
+        self.relevance_threshold = settings.local_embedding_relevance_threshold
+
+    def _features(self, text: str) -> Counter:
+        tokens = [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOP_WORDS]
+        grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        # Character 4-grams let inflections match ("diagnosis" / "diagnostics")
+        for token in tokens:
+            padded = f"<{token}>"
+            grams.extend(padded[i:i + 4] for i in range(len(padded) - 3))
+        return Counter(grams)
+
+    def embed(self, texts: list[str]) -> list[List[float]]:
+        matrix = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for gram, count in self._features(text).items():
+                digest = int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "little")
+                sign = 1.0 if digest & 1 else -1.0
+                matrix[row, (digest >> 1) % self.n_features] += sign * (1.0 + math.log(count))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+        return matrix.tolist()
+
+
+EMBEDDING_BACKENDS = {
+    OpenAIEmbeddingBackend.name: OpenAIEmbeddingBackend,
+    HashingEmbeddingBackend.name: HashingEmbeddingBackend,
+}
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_embedding_backend(name: str = None) -> EmbeddingBackend:
+    """
+    Returns the shared backend instance for a name (defaults to settings.embedding_backend).
+    """
+    name = name or settings.embedding_backend
+    if name not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unsupported embedding backend: {name}")
+    with _backends_lock:
+        if name not in _backends:
+            _backends[name] = EMBEDDING_BACKENDS[name]()
+        return _backends[name]
+
+
+def relevance_threshold(backend: str = None) -> float:
+    """
+    Minimum similarity for a source to count as relevant under the given backend.
+    """
+    return get_embedding_backend(backend).relevance_threshold
+
+
+def _load_stored_vectors(model: str, text_hashes: list[str]) -> dict:
+    """
+    Fetches persisted vectors for many hashes in one IN query.
+    """
+    if not settings.enable_embedding_store or not text_hashes:
+        return {}
+    db = SessionLocal()
     try:
-        response = client.embeddings.create(
-            input=[text],
-            model=model
-        )
-        return response.data[0].embedding
-    except Exception as e:
-        print(f"❌ Failed to get embedding: {e}")
-        return []
+        rows = db.query(EmbeddingCache.text_hash, EmbeddingCache.vector).filter(
+            EmbeddingCache.model == model,
+            EmbeddingCache.text_hash.in_(text_hashes)
+        ).all()
+        return {row.text_hash: np.frombuffer(row.vector, dtype=np.float32).tolist() for row in rows}
+    except SQLAlchemyError as e:
+        print(f"❌ DB error reading embedding cache: {e}")
+        return {}
+    finally:
+        db.close()
+
+
+def _save_stored_vectors(model: str, vectors: dict):
+    """
+    Persists newly fetched vectors. Rows another worker saved first are skipped.
+    """
+    if not settings.enable_embedding_store or not vectors:
+        return
+    db = SessionLocal()
+    try:
+        existing = {
+            row.text_hash for row in db.query(EmbeddingCache.text_hash).filter(
+                EmbeddingCache.model == model,
+                EmbeddingCache.text_hash.in_(list(vectors))
+            )
+        }
+        for text_hash, vec in vectors.items():
+            if text_hash in existing:
+                continue
+            db.add(EmbeddingCache(
+                model=model,
+                text_hash=text_hash,
+                vector=np.asarray(vec, dtype=np.float32).tobytes()
+            ))
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        print(f"❌ DB error saving embedding cache: {e}")
+    finally:
+        db.close()
+
+
+def get_embeddings(texts: list[str], model: str = None, backend: str = None) -> list[List[float]]:
+    """
+    Gets embedding vectors for many texts, in input order.
+    For remote backends cached vectors are reused and the rest are fetched in
+    a single batched request; local backends just compute them.
+    Texts that could not be embedded map to an empty list.
+    """
+    engine = get_embedding_backend(backend)
+    if model and model != engine.model:
+        engine = OpenAIEmbeddingBackend(model) if engine.name == "openai" else engine
+
+    if not engine.cacheable:
+        try:
+            return engine.embed(list(texts)) if texts else []
+        except Exception as e:
+            print(f"❌ Failed to get embeddings: {e}")
+            return [[] for _ in texts]
+
+    model = engine.model
+    hashes = [hash_string(text) for text in texts]
+
+    found = {}
+    for text_hash in dict.fromkeys(hashes):
+        vec = vector_cache.get((model, text_hash))
+        if vec is not None:
+            found[text_hash] = vec
+
+    missing = [h for h in dict.fromkeys(hashes) if h not in found]
+    if missing:
+        stored = _load_stored_vectors(model, missing)
+        for text_hash, vec in stored.items():
+            vector_cache.put((model, text_hash), vec)
+        found.update(stored)
+
+    to_embed = {}
+    for text, text_hash in zip(texts, hashes):
+        if text_hash not in found and text_hash not in to_embed:
+            to_embed[text_hash] = text
+
+    if to_embed:
+        try:
+            fetched = dict(zip(to_embed, engine.embed(list(to_embed.values()))))
+        except Exception as e:
+            print(f"❌ Failed to get embeddings: {e}")
+            fetched = {}
+        for text_hash, vec in fetched.items():
+            vector_cache.put((model, text_hash), vec)
+        found.update(fetched)
+        _save_stored_vectors(model, fetched)
+
+    return [found.get(text_hash, []) for text_hash in hashes]
+
+
+def get_embedding(text: str, model: str = None, backend: str = None) -> List[float]:
+    """
+    Gets an embedding vector from the configured backend.
+    """
+    return get_embeddings([text], model=model, backend=backend)[0]
 
 def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
     """
@@ -42,15 +295,50 @@ def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
         print(f"❌ Cosine similarity failed: {e}")
         return 0.0
 
-def calculate_embedding_similarity(text1: str, text2: str) -> float:
+def cosine_similarity_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity between every row of a (m x d) and every row of b (n x d).
+    Zero vectors score 0.0.
+
+    Returns:
+        np.ndarray: m x n matrix of similarities
+    """
+    a = np.atleast_2d(np.asarray(a, dtype=np.float32))
+    b = np.atleast_2d(np.asarray(b, dtype=np.float32))
+    a_norm = np.linalg.norm(a, axis=1, keepdims=True)
+    b_norm = np.linalg.norm(b, axis=1, keepdims=True)
+    a_unit = np.divide(a, a_norm, out=np.zeros_like(a), where=a_norm > 0)
+    b_unit = np.divide(b, b_norm, out=np.zeros_like(b), where=b_norm > 0)
+    return a_unit @ b_unit.T
+
+def score_texts_against(query: str, texts: list[str], backend: str = None) -> list[float]:
+    """
+    Scores many texts against one query with a single batched embedding call.
+
+    Returns:
+        list[float]: Similarity per text, 0.0 where embedding failed
+    """
+    if not texts:
+        return []
+
+    vectors = get_embeddings([query] + list(texts), backend=backend)
+    query_vec, text_vecs = vectors[0], vectors[1:]
+    scores = [0.0] * len(texts)
+    if not query_vec:
+        return scores
+
+    usable = [i for i, vec in enumerate(text_vecs) if vec]
+    if usable:
+        matrix = cosine_similarity_matrix([query_vec], [text_vecs[i] for i in usable])
+        for i, score in zip(usable, matrix[0]):
+            scores[i] = float(score)
+    return scores
+
+def calculate_embedding_similarity(text1: str, text2: str, backend: str = None) -> float:
     """
     Computes embedding-based similarity between two pieces of text.
     """
-    vec1 = get_embedding(text1)
-    vec2 = get_embedding(text2)
-    if not vec1 or not vec2:
-        return 0.0
-    return cosine_similarity(vec1, vec2)
+    return score_texts_against(text1, [text2], backend=backend)[0]
 
 
 if __name__ == "__main__":
@@ -7,18 +7,55 @@ Used by the Research Agent to gather real-world sources related to a content top
 """
 
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict
 from googleapiclient.discovery import build
 from dotenv import load_dotenv
+from app.config import settings
 
 load_dotenv()  # Loads from .env file
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 GOOGLE_CSE_ID = os.getenv("GOOGLE_CSE_ID")
 
+PAGE_SIZE = 10  # Custom Search returns at most 10 results per request
+MAX_RESULTS = 50
+
+# Pages are fetched on a long-lived pool so each thread's client is reused
+_page_pool = ThreadPoolExecutor(max_workers=settings.google_search_page_workers, thread_name_prefix="google-search")
+_clients = threading.local()
+
+
+def get_search_service():
+    """
+    Returns this thread's Custom Search client, built on first use.
+    Clients are per thread because the httplib2 transport is not thread-safe.
+    """
+    service = getattr(_clients, "service", None)
+    if service is None:
+        service = build("customsearch", "v1", developerKey=GOOGLE_API_KEY, cache_discovery=False)
+        _clients.service = service
+    return service
+
+
+def _fetch_page(query: str, start: int, num: int) -> List[Dict]:
+    """
+    Fetches one page of results with the calling thread's client.
+    """
+    response = get_search_service().cse().list(
+        q=query,
+        cx=GOOGLE_CSE_ID,
+        num=num,
+        start=start,
+    ).execute()
+    return response.get("items", [])
+
+
 def get_google_search_results(query: str, limit: int = 10) -> List[Dict]:
     """
     Searches Google using the Custom Search API and returns cleaned results.
+    All result pages (10 per request) are fetched concurrently.
 
     Args:
         query (str): The refined topic or search query.
@@ -31,41 +68,37 @@ def get_google_search_results(query: str, limit: int = 10) -> List[Dict]:
         print("⚠️ Missing Google API key or search engine ID")
         return []
 
-    service = build("customsearch", "v1", developerKey=GOOGLE_API_KEY)
-    all_results = []
-    seen_urls = set()
-    start_index = 1
+    limit = max(0, min(limit, MAX_RESULTS))
+    pages = [(start, min(PAGE_SIZE, limit - start + 1)) for start in range(1, limit + 1, PAGE_SIZE)]
+    if not pages:
+        return []
 
-    while len(all_results) < limit:
-        num = min(10, limit - len(all_results))
+    page_items = {}
+    futures = {_page_pool.submit(_fetch_page, query, start, num): start for start, num in pages}
+    for future in as_completed(futures):
         try:
-            response = service.cse().list(
-                q=query,
-                cx=GOOGLE_CSE_ID,
-                num=num,
-                start=start_index,
-            ).execute()
-
-            items = response.get("items", [])
-            if not items:
-                break
-
-            for item in items:
-                url = item.get("link")
-                if url and url not in seen_urls:
-                    seen_urls.add(url)
-                    all_results.append({
-                        "title": item.get("title", ""),
-                        "url": url,
-                        "snippet": item.get("snippet", "")
-                    })
-
-            start_index += num
-
+            page_items[futures[future]] = future.result()
         except Exception as e:
-            print(f"❌ Google Search API error: {e}")
+            print(f"❌ Google Search API error (start={futures[future]}): {e}")
+
+    # Merge in page order; stop at the first missing or empty page as the sequential loop did
+    all_results = []
+    seen_urls = set()
+    for start, _ in pages:
+        items = page_items.get(start)
+        if not items:
             break
+        for item in items:
+            url = item.get("link")
+            if url and url not in seen_urls:
+                seen_urls.add(url)
+                all_results.append({
+                    "title": item.get("title", ""),
+                    "url": url,
+                    "snippet": item.get("snippet", "")
+                })
 
+    all_results = all_results[:limit]
     print(f"✅ Google search returned {len(all_results)} unique results")
     return all_results
 
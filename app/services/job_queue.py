@@ -0,0 +1,388 @@
+# app/services/job_queue.py
+
+"""
+Durable job queue for pipeline stages, backed by the pipeline_jobs table.
+
+- enqueue_job() adds one stage for a request; completing a stage enqueues the next
+- claim_job() leases the oldest runnable job with SELECT ... FOR UPDATE SKIP LOCKED,
+  so any number of workers can poll the same table without double-claiming
+- a lease (visibility timeout) is renewed by heartbeats while a stage runs;
+  if a worker dies, the job becomes claimable again once its lease expires
+- failed stages are retried with jittered exponential backoff up to
+  job_max_attempts, then marked dead and the request marked failed
+- PipelineWorker caps in-flight jobs per stage in each worker process
+
+Run workers with scripts/run_pipeline_worker.py; set pipeline_backend="queue"
+so POST /pipeline/{id}/run enqueues here instead of the in-process pool.
+"""
+
+import datetime
+import os
+import random
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from app.config import settings
+from app.database import SessionLocal
+from app.models.pipeline_jobs import PipelineJob
+from app.models.requests import Request
+from app.services.pipeline_runner import (
+    PIPELINE_STAGES,
+    STAGE_RUNNERS,
+    STAGE_STATUS,
+    QUEUED_STATUS,
+    COMPLETED_STATUS,
+    FAILED_STATUS,
+    PipelineStageError,
+    set_request_status,
+)
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+def parse_stage_limits(spec: str = None) -> dict:
+    """
+    Parses "topic:8,research:4" into {"topic": 8, "research": 4, ...}.
+    Stages not listed get a limit of 1.
+    """
+    spec = settings.job_stage_concurrency if spec is None else spec
+    limits = {stage: 1 for stage in PIPELINE_STAGES}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        stage, _, value = item.partition(":")
+        stage = stage.strip()
+        if stage not in limits:
+            raise ValueError(f"Unknown pipeline stage in job_stage_concurrency: {stage}")
+        limits[stage] = max(0, int(value))
+    return limits
+
+
+def retry_delay(attempts: int) -> float:
+    """
+    Seconds to wait before the next attempt: doubling from job_retry_base_seconds,
+    capped at job_retry_max_seconds, scaled by 50–100% jitter.
+    """
+    delay = min(settings.job_retry_max_seconds, settings.job_retry_base_seconds * 2 ** max(0, attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _utcnow():
+    return datetime.datetime.utcnow()
+
+
+def _mark_request(db, request_id: int, status: str, error_message: str = None):
+    request = db.query(Request).filter_by(id=request_id).first()
+    if request:
+        request.status = status
+        request.error_message = error_message
+        request.updated_at = _utcnow()
+
+
+# --- Producer side ---
+
+def has_active_job(db, request_id: int) -> bool:
+    return db.query(PipelineJob.id).filter(
+        PipelineJob.request_id == request_id,
+        PipelineJob.status.in_(ACTIVE_STATUSES)
+    ).first() is not None
+
+
+def enqueue_job(request_id: int, user_id: int, stage: str = "topic", delay_seconds: float = 0):
+    """
+    Queues a stage for a request.
+
+    Returns:
+        int | None: The job id, or None if the request already has a queued or running job
+
+    has_active_job() is only a fast path; two concurrent callers can both pass it,
+    so the partial unique index uq_pipeline_jobs_active_request decides the race.
+    """
+    if stage not in PIPELINE_STAGES:
+        raise ValueError(f"Unknown pipeline stage: {stage}")
+
+    db = SessionLocal()
+    try:
+        if has_active_job(db, request_id):
+            return None
+        job = PipelineJob(
+            request_id=request_id,
+            user_id=user_id,
+            stage=stage,
+            status="queued",
+            attempts=0,
+            max_attempts=settings.job_max_attempts,
+            run_after=_utcnow() + datetime.timedelta(seconds=delay_seconds),
+        )
+        db.add(job)
+        _mark_request(db, request_id, QUEUED_STATUS)
+        db.commit()
+        return job.id
+    except IntegrityError:
+        db.rollback()
+        return None
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+# --- Worker side ---
+
+def claim_job(worker_id: str, stages) -> dict | None:
+    """
+    Leases the next runnable job for any of the given stages.
+    Runnable means queued and past its backoff, or running with an expired lease.
+    Jobs whose lease expired on their final attempt are marked dead instead.
+
+    Returns:
+        dict | None: id, request_id, user_id, stage and attempts of the claimed job
+    """
+    stages = list(stages)
+    if not stages:
+        return None
+
+    db = SessionLocal()
+    try:
+        while True:
+            now = _utcnow()
+            job = db.query(PipelineJob).filter(
+                PipelineJob.stage.in_(stages),
+                or_(
+                    and_(PipelineJob.status == "queued", PipelineJob.run_after <= now),
+                    and_(PipelineJob.status == "running", PipelineJob.lease_expires_at < now),
+                )
+            ).order_by(PipelineJob.run_after, PipelineJob.id).with_for_update(skip_locked=True).first()
+
+            if job is None:
+                db.rollback()
+                return None
+
+            if job.status == "running" and job.attempts >= job.max_attempts:
+                job.status = "dead"
+                job.locked_by = None
+                job.last_error = job.last_error or "Lease expired"
+                _mark_request(db, job.request_id, FAILED_STATUS, f"{job.stage}: lease expired")
+                db.commit()
+                continue
+
+            job.status = "running"
+            job.locked_by = worker_id
+            job.lease_expires_at = now + datetime.timedelta(seconds=settings.job_lease_seconds)
+            job.attempts += 1
+            claimed = {
+                "id": job.id,
+                "request_id": job.request_id,
+                "user_id": job.user_id,
+                "stage": job.stage,
+                "attempts": job.attempts,
+            }
+            db.commit()
+            return claimed
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _owned_job(db, job_id: int, worker_id: str):
+    """
+    Locks and returns the job if this worker still holds its lease.
+    """
+    return db.query(PipelineJob).filter_by(
+        id=job_id, locked_by=worker_id, status="running"
+    ).with_for_update().first()
+
+
+def heartbeat(job_id: int, worker_id: str) -> bool:
+    """
+    Extends the lease. Returns False if the lease was lost to another worker.
+    """
+    db = SessionLocal()
+    try:
+        job = _owned_job(db, job_id, worker_id)
+        if not job:
+            db.rollback()
+            return False
+        job.lease_expires_at = _utcnow() + datetime.timedelta(seconds=settings.job_lease_seconds)
+        db.commit()
+        return True
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def keep_lease(job_id: int, worker_id: str, stop: threading.Event, interval: float):
+    """
+    Heartbeats every interval until stop is set or the lease is lost.
+    A failed heartbeat (e.g. a dropped connection) is logged and retried on
+    the next tick; the lease is several intervals long, so one miss is harmless.
+    """
+    while not stop.wait(interval):
+        try:
+            alive = heartbeat(job_id, worker_id)
+        except Exception as e:
+            print(f"⚠️ Heartbeat for job {job_id} failed, retrying: {e}")
+            continue
+        if not alive:
+            print(f"⚠️ Lost lease on job {job_id}")
+            return
+
+
+def complete_job(job_id: int, worker_id: str) -> bool:
+    """
+    Marks the job succeeded and, in the same transaction, queues the next stage
+    (or marks the request completed after the last stage).
+    """
+    db = SessionLocal()
+    try:
+        job = _owned_job(db, job_id, worker_id)
+        if not job:
+            db.rollback()
+            return False
+        job.status = "succeeded"
+        job.locked_by = None
+        job.lease_expires_at = None
+
+        position = PIPELINE_STAGES.index(job.stage)
+        if position + 1 < len(PIPELINE_STAGES):
+            db.add(PipelineJob(
+                request_id=job.request_id,
+                user_id=job.user_id,
+                stage=PIPELINE_STAGES[position + 1],
+                status="queued",
+                attempts=0,
+                max_attempts=job.max_attempts,
+                run_after=_utcnow(),
+            ))
+        else:
+            _mark_request(db, job.request_id, COMPLETED_STATUS)
+        db.commit()
+        return True
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def fail_job(job_id: int, worker_id: str, error: str, retryable: bool = True) -> str | None:
+    """
+    Records a failed attempt. Retries after a backoff while attempts remain,
+    otherwise marks the job dead and the request failed.
+
+    Returns:
+        str | None: The job's new status, or None if the lease was lost
+    """
+    db = SessionLocal()
+    try:
+        job = _owned_job(db, job_id, worker_id)
+        if not job:
+            db.rollback()
+            return None
+        job.last_error = error[:2000]
+        job.locked_by = None
+        job.lease_expires_at = None
+
+        if retryable and job.attempts < job.max_attempts:
+            job.status = "queued"
+            job.run_after = _utcnow() + datetime.timedelta(seconds=retry_delay(job.attempts))
+        else:
+            job.status = "dead"
+            _mark_request(db, job.request_id, FAILED_STATUS, f"{job.stage}: {error}"[:1000])
+        db.commit()
+        return job.status
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def execute_job(job: dict, worker_id: str) -> str:
+    """
+    Runs one claimed stage, renewing its lease until it finishes.
+
+    Returns:
+        str: "succeeded", "queued" (will retry), "dead" or "lost"
+    """
+    stop = threading.Event()
+    interval = max(1.0, settings.job_lease_seconds / 3)
+    beat = threading.Thread(target=keep_lease, args=(job["id"], worker_id, stop, interval), daemon=True)
+    beat.start()
+    set_request_status(job["request_id"], STAGE_STATUS[job["stage"]])
+    try:
+        STAGE_RUNNERS[job["stage"]](job["request_id"], job["user_id"])
+        outcome = "succeeded" if complete_job(job["id"], worker_id) else None
+    except PipelineStageError as e:
+        outcome = fail_job(job["id"], worker_id, str(e), retryable=False)
+    except Exception as e:
+        detail = getattr(e, "detail", None) or str(e) or e.__class__.__name__
+        print(f"❌ Job {job['id']} ({job['stage']}) attempt {job['attempts']} failed: {detail}")
+        outcome = fail_job(job["id"], worker_id, str(detail))
+    finally:
+        stop.set()
+    return outcome or "lost"
+
+
+class PipelineWorker:
+    """
+    Polls the queue and runs claimed stages on a thread pool, never holding
+    more than its per-stage limit of jobs at once.
+    """
+
+    def __init__(self, worker_id: str = None, stage_limits: dict = None):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.stage_limits = parse_stage_limits() if stage_limits is None else stage_limits
+        self.in_flight = {stage: 0 for stage in self.stage_limits}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, sum(self.stage_limits.values())),
+            thread_name_prefix="pipeline-job"
+        )
+
+    def free_stages(self) -> list[str]:
+        with self._lock:
+            return [s for s, limit in self.stage_limits.items() if self.in_flight[s] < limit]
+
+    def _run(self, job: dict):
+        try:
+            outcome = execute_job(job, self.worker_id)
+            print(f"🧾 Job {job['id']} ({job['stage']}, request {job['request_id']}): {outcome}")
+        finally:
+            with self._lock:
+                self.in_flight[job["stage"]] -= 1
+
+    def run_once(self) -> bool:
+        """
+        Claims and starts at most one job. Returns True if one was claimed.
+        """
+        stages = self.free_stages()
+        if not stages:
+            return False
+        job = claim_job(self.worker_id, stages)
+        if not job:
+            return False
+        with self._lock:
+            self.in_flight[job["stage"]] += 1
+        self._executor.submit(self._run, job)
+        return True
+
+    def run_forever(self, stop_event: threading.Event):
+        print(f"👷 Pipeline worker {self.worker_id} started with limits {self.stage_limits}")
+        while not stop_event.is_set():
+            try:
+                claimed = self.run_once()
+            except Exception as e:
+                print(f"❌ Failed to claim job: {e}")
+                claimed = False
+            if not claimed:
+                stop_event.wait(settings.job_poll_interval_seconds)
+        self._executor.shutdown(wait=True)
+        print(f"👋 Pipeline worker {self.worker_id} stopped")
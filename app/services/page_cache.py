@@ -0,0 +1,198 @@
+"""
+Page Cache
+----------
+Persists extracted page metadata (title, description, snippet) keyed by
+normalised URL, so popular sources are not re-downloaded and re-parsed on
+every research run. Fresh entries are served directly; stale entries are
+revalidated with If-None-Match / If-Modified-Since before being reused.
+"""
+
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy.exc import SQLAlchemyError
+from app.config import settings
+from app.database import SessionLocal
+from app.models.page_cache import PageCache
+from app.utils.hash import hash_string
+from app.utils.url import normalize_url
+
+# How often expired rows are purged (at most), in seconds
+PURGE_INTERVAL_SECONDS = 600
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "revalidated": 0, "stores": 0}
+_last_purge = datetime.min
+
+
+def _record(counter: str):
+    with _stats_lock:
+        _stats[counter] += 1
+
+
+def page_cache_stats() -> dict:
+    """
+    Returns a snapshot of the process-wide cache counters.
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_page_cache_stats():
+    with _stats_lock:
+        for key in _stats:
+            _stats[key] = 0
+
+
+def page_cache_key(url: str) -> str:
+    return hash_string(normalize_url(url))
+
+
+def _to_page(entry: PageCache) -> dict:
+    """
+    Rebuilds a fetch_page()-shaped result from a cache row.
+    """
+    headers = {}
+    if entry.etag:
+        headers["ETag"] = entry.etag
+    if entry.last_modified:
+        headers["Last-Modified"] = entry.last_modified
+    return {
+        "accessible": entry.status_code < 400,
+        "status": "OK" if entry.status_code < 400 else f"HTTP {entry.status_code}",
+        "status_code": entry.status_code,
+        "final_url": entry.final_url or entry.url,
+        "headers": headers,
+        "metadata": {
+            "title": entry.title or "",
+            "description": entry.description or "",
+            "snippet": entry.snippet or "",
+        },
+        "from_cache": True,
+    }
+
+
+def get_cached_page(url: str) -> tuple[dict | None, bool]:
+    """
+    Looks up a URL in the cache.
+
+    Returns:
+        tuple: (page, is_fresh). page is None on a miss; a stale page is
+        returned with is_fresh=False so the caller can revalidate it.
+    """
+    db = SessionLocal()
+    try:
+        entry = db.query(PageCache).filter_by(url_hash=page_cache_key(url)).first()
+        if entry is None:
+            _record("misses")
+            return None, False
+
+        fresh = entry.expires_at > datetime.utcnow()
+        _record("hits" if fresh else "misses")
+        return _to_page(entry), fresh
+    except SQLAlchemyError as e:
+        print(f"❌ DB error reading page cache: {e}")
+        return None, False
+    finally:
+        db.close()
+
+
+def conditional_headers(page: dict) -> dict:
+    """
+    Builds revalidation headers from a cached page's validators.
+    """
+    headers = {}
+    if page["headers"].get("ETag"):
+        headers["If-None-Match"] = page["headers"]["ETag"]
+    if page["headers"].get("Last-Modified"):
+        headers["If-Modified-Since"] = page["headers"]["Last-Modified"]
+    return headers
+
+
+def store_page(url: str, page: dict):
+    """
+    Inserts or refreshes the cache entry for a fetched page.
+    Only accessible pages with metadata are cached.
+    """
+    if not page.get("accessible") or not page.get("metadata"):
+        return
+
+    now = datetime.utcnow()
+    headers = {k.lower(): v for k, v in (page.get("headers") or {}).items()}
+    meta = page["metadata"]
+    db = SessionLocal()
+    try:
+        url_hash = page_cache_key(url)
+        entry = db.query(PageCache).filter_by(url_hash=url_hash).first()
+        if entry is None:
+            entry = PageCache(url_hash=url_hash, url=normalize_url(url))
+            db.add(entry)
+
+        entry.final_url = page.get("final_url")
+        entry.status_code = page.get("status_code") or 200
+        entry.etag = headers.get("etag")
+        entry.last_modified = headers.get("last-modified")
+        entry.title = meta.get("title")
+        entry.description = meta.get("description")
+        entry.snippet = meta.get("snippet")
+        entry.fetched_at = now
+        entry.expires_at = now + timedelta(seconds=settings.page_cache_ttl_seconds)
+        db.commit()
+        _record("stores")
+    except SQLAlchemyError as e:
+        db.rollback()
+        print(f"❌ DB error saving page cache: {e}")
+    finally:
+        db.close()
+
+    _maybe_purge()
+
+
+def mark_revalidated(url: str):
+    """
+    Extends a stale entry's freshness after the origin answered 304 Not Modified.
+    """
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        entry = db.query(PageCache).filter_by(url_hash=page_cache_key(url)).first()
+        if entry:
+            entry.fetched_at = now
+            entry.expires_at = now + timedelta(seconds=settings.page_cache_ttl_seconds)
+            db.commit()
+        _record("revalidated")
+    except SQLAlchemyError as e:
+        db.rollback()
+        print(f"❌ DB error revalidating page cache: {e}")
+    finally:
+        db.close()
+
+
+def purge_expired_pages() -> int:
+    """
+    Deletes entries not refreshed within page_cache_max_age_seconds.
+
+    Returns:
+        int: Number of rows removed
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.page_cache_max_age_seconds)
+    db = SessionLocal()
+    try:
+        removed = db.query(PageCache).filter(PageCache.fetched_at < cutoff).delete(synchronize_session=False)
+        db.commit()
+        return removed
+    except SQLAlchemyError as e:
+        db.rollback()
+        print(f"❌ DB error purging page cache: {e}")
+        return 0
+    finally:
+        db.close()
+
+
+def _maybe_purge():
+    global _last_purge
+    now = datetime.utcnow()
+    with _stats_lock:
+        if (now - _last_purge).total_seconds() < PURGE_INTERVAL_SECONDS:
+            return
+        _last_purge = now
+    purge_expired_pages()
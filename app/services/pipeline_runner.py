@@ -0,0 +1,268 @@
+# app/services/pipeline_runner.py
+
+"""
+Runs the full agent chain (Topic → Research → Summary → Content) for a request
+in the background.
+
+Each stage opens its own DB session and calls the same agents as the
+step-by-step routes in app/api/agent_pipeline.py. Request.status is advanced
+as stages start, ending in "completed" or "failed" (with error_message set),
+so clients can poll instead of holding a connection open.
+
+With Settings.pipeline_backend="queue", runs are enqueued in the durable
+pipeline_jobs table (app/services/job_queue.py) instead of the in-process pool.
+"""
+
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from app.config import settings
+from app.database import SessionLocal
+from app.agents.topic_agent import generate_content_topic
+from app.agents.research_agent import generate_research_sources
+from app.agents.summary_agent import generate_and_store_summary
+from app.agents.content_agent import create_content
+from app.models.content_queue import ContentQueue
+from app.models.requests import Request
+from app.models.research_sources import ResearchSource
+from app.models.summaries import Summary
+from app.models.user_configurations import UserConfiguration
+
+PIPELINE_STAGES = ("topic", "research", "summary", "content")
+
+# Request.status while each stage runs
+STAGE_STATUS = {
+    "topic": "generating_topic",
+    "research": "researching",
+    "summary": "summarising",
+    "content": "generating_content",
+}
+QUEUED_STATUS = "queued"
+COMPLETED_STATUS = "completed"
+FAILED_STATUS = "failed"
+
+
+class PipelineStageError(Exception):
+    """
+    A stage finished without producing what the next stage needs.
+    """
+
+
+def _load_request_and_config(db, request_id: int, user_id: int):
+    request = db.query(Request).filter_by(id=request_id, user_id=user_id).first()
+    if not request:
+        raise PipelineStageError(f"Request {request_id} not found")
+    config = db.query(UserConfiguration).filter_by(user_id=user_id).first()
+    if not config:
+        raise PipelineStageError(f"No configuration for user {user_id}")
+    return request, config
+
+
+def _config_dict(config) -> dict:
+    return {
+        "persona": config.persona,
+        "tone": config.tone,
+        "style": config.style,
+        "language": config.language,
+    }
+
+
+# --- Stages ---
+
+def run_topic_stage(request_id: int, user_id: int):
+    db = SessionLocal()
+    try:
+        request, config = _load_request_and_config(db, request_id, user_id)
+        original_topic, content_type = request.original_topic, request.content_type
+        config_dict = _config_dict(config)
+    finally:
+        db.close()
+
+    generate_content_topic(request_id, original_topic, config_dict, content_type, user_id)
+
+
+def run_research_stage(request_id: int, user_id: int):
+    db = SessionLocal()
+    try:
+        request, config = _load_request_and_config(db, request_id, user_id)
+        content_topic = request.content_topic
+        limit, preference = config.default_source_count, config.research_preference
+    finally:
+        db.close()
+
+    if not content_topic:
+        raise PipelineStageError("Request has no content topic")
+    if not generate_research_sources(request_id, content_topic, user_id, limit=limit, preference=preference):
+        raise PipelineStageError("No verified sources found")
+
+
+def run_summary_stage(request_id: int, user_id: int):
+    db = SessionLocal()
+    try:
+        request, _ = _load_request_and_config(db, request_id, user_id)
+        content_type = request.content_type
+        verified_sources = db.query(ResearchSource).filter_by(
+            request_id=request_id,
+            verification_status="verified"
+        ).filter(ResearchSource.summary.isnot(None)).all()
+        source_data = [
+            {
+                "summary": src.summary,
+                "key_points": src.key_points if isinstance(src.key_points, list) else []
+            } for src in verified_sources
+        ]
+    finally:
+        db.close()
+
+    summary = generate_and_store_summary(
+        request_id=request_id,
+        verified_sources=source_data,
+        target_length=500,
+        content_type=content_type,
+        user_id=user_id
+    )
+    if summary is None:
+        raise PipelineStageError("No valid sources found to generate summary")
+
+
+def run_content_stage(request_id: int, user_id: int):
+    db = SessionLocal()
+    try:
+        request, config = _load_request_and_config(db, request_id, user_id)
+        summary = db.query(Summary).filter_by(request_id=request_id).first()
+        if not summary:
+            raise PipelineStageError("No summary found for this request")
+        sources = db.query(ResearchSource).filter_by(
+            request_id=request_id,
+            verification_status="verified"
+        ).all()
+        create_content(db, request, summary, sources, _config_dict(config))
+    finally:
+        db.close()
+
+
+STAGE_RUNNERS = {
+    "topic": run_topic_stage,
+    "research": run_research_stage,
+    "summary": run_summary_stage,
+    "content": run_content_stage,
+}
+
+
+def set_request_status(request_id: int, status: str, error_message: str = None):
+    """
+    Records pipeline progress on the request row.
+    """
+    db = SessionLocal()
+    try:
+        request = db.query(Request).filter_by(id=request_id).first()
+        if request:
+            request.status = status
+            request.error_message = error_message
+            request.updated_at = datetime.datetime.utcnow()
+            db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Could not update status for request {request_id}: {e}")
+    finally:
+        db.close()
+
+
+def _error_detail(e: Exception) -> str:
+    return getattr(e, "detail", None) or str(e) or e.__class__.__name__
+
+
+def run_pipeline(request_id: int, user_id: int, start_stage: str = "topic") -> bool:
+    """
+    Runs every stage from start_stage onwards, stopping at the first failure.
+
+    Returns:
+        bool: True if the content stage completed
+    """
+    stages = PIPELINE_STAGES[PIPELINE_STAGES.index(start_stage):]
+    for stage in stages:
+        set_request_status(request_id, STAGE_STATUS[stage])
+        try:
+            STAGE_RUNNERS[stage](request_id, user_id)
+        except Exception as e:
+            print(f"❌ Pipeline stage '{stage}' failed for request {request_id}: {e}")
+            set_request_status(request_id, FAILED_STATUS, f"{stage}: {_error_detail(e)}"[:1000])
+            return False
+
+    set_request_status(request_id, COMPLETED_STATUS)
+    print(f"✅ Pipeline completed for request {request_id}")
+    return True
+
+
+# --- Background pool ---
+
+_executor = ThreadPoolExecutor(max_workers=settings.pipeline_workers, thread_name_prefix="pipeline")
+_active = set()
+_active_lock = threading.Lock()
+
+
+def is_pipeline_running(request_id: int) -> bool:
+    with _active_lock:
+        return request_id in _active
+
+
+def _run_and_release(request_id: int, user_id: int, start_stage: str):
+    try:
+        run_pipeline(request_id, user_id, start_stage)
+    finally:
+        with _active_lock:
+            _active.discard(request_id)
+
+
+def submit_pipeline(request_id: int, user_id: int, start_stage: str = "topic") -> bool:
+    """
+    Queues a pipeline run on the worker pool (or the job queue) and returns immediately.
+
+    Returns:
+        bool: False if this request is already queued or running
+    """
+    if start_stage not in PIPELINE_STAGES:
+        raise ValueError(f"Unknown pipeline stage: {start_stage}")
+    if settings.pipeline_backend == "queue":
+        from app.services.job_queue import enqueue_job  # job_queue imports this module
+        return enqueue_job(request_id, user_id, start_stage) is not None
+
+    with _active_lock:
+        if request_id in _active:
+            return False
+        _active.add(request_id)
+
+    set_request_status(request_id, QUEUED_STATUS)
+    _executor.submit(_run_and_release, request_id, user_id, start_stage)
+    return True
+
+
+def _is_in_progress(db, request_id: int) -> bool:
+    if settings.pipeline_backend == "queue":
+        from app.services.job_queue import has_active_job
+        return has_active_job(db, request_id)
+    return is_pipeline_running(request_id)
+
+
+def get_pipeline_status(db, request_id: int, user_id: int):
+    """
+    Returns a small status payload for polling, or None if the request is not the user's.
+    """
+    request = db.query(
+        Request.id, Request.status, Request.error_message, Request.updated_at
+    ).filter_by(id=request_id, user_id=user_id).first()
+    if not request:
+        return None
+
+    content_id = db.query(ContentQueue.id).filter_by(request_id=request_id).order_by(
+        ContentQueue.id.desc()
+    ).limit(1).scalar()
+
+    return {
+        "request_id": request.id,
+        "status": request.status,
+        "error_message": request.error_message,
+        "updated_at": request.updated_at.isoformat() if request.updated_at else None,
+        "in_progress": _is_in_progress(db, request_id),
+        "content_id": content_id,
+    }
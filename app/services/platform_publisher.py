@@ -3,18 +3,223 @@
 """
 Handles publishing content to external platforms (Typefully, X).
 Used by post_content in content_queue.py service.
+
+All calls go through one pooled keep-alive session with explicit
+(connect, read) timeouts. Rate-limited (429) responses and connection
+failures are retried with jittered exponential backoff, honouring Retry-After.
+
+Server errors (5xx) and read timeouts are never retried: the platform may
+have accepted the post, and neither Typefully nor X dedupes on the
+Idempotency-Key header. Posts still carry a key (derived from ContentQueue.id
+by callers) and each successful result is recorded per key in the
+publish_ledger table, so a repeated call from any process (after a restart or
+stale-post recovery) returns it instead of posting again.
 """
 
-import requests
 import json
-from datetime import datetime
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import requests
+from requests.adapters import HTTPAdapter
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from app.config import settings
+from app.database import SessionLocal
+from app.models.publish_ledger import PublishLedger
+
+class PublishError(Exception):
+    """
+    A platform rejected a post or could not be reached.
+    """
+
+    def __init__(self, message: str, status_code: int = None, retry_after: float = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def _build_http_session() -> requests.Session:
+    """
+    Builds the keep-alive session shared by every publisher thread.
+    """
+    session = requests.Session()
+    pool_size = max(10, settings.dispatch_workers * 2)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+http_session = _build_http_session()
+
+
+def _timeout() -> tuple[float, float]:
+    return (settings.publish_connect_timeout_seconds, settings.publish_read_timeout_seconds)
+
+
+# --------------------------
+# Idempotency ledger
+# --------------------------
+
+def _remembered(key: str):
+    """
+    Returns the recorded response for a key, or None if it was never posted.
+
+    Raises:
+        PublishError: if the ledger cannot be read; posting blind could duplicate
+    """
+    if not key:
+        return None
+    db = SessionLocal()
+    try:
+        entry = db.query(PublishLedger).filter_by(idempotency_key=key).first()
+        return json.loads(entry.response) if entry else None
+    except SQLAlchemyError as e:
+        raise PublishError(f"Publish ledger unavailable for {key}; not posting: {e}")
+    finally:
+        db.close()
+
+
+def _remember(key: str, platform: str, result: dict):
+    """
+    Records a successful post. A failure here is logged, not raised: the
+    post itself went through and must be reported as such.
+    """
+    if not key:
+        return
+    db = SessionLocal()
+    try:
+        db.add(PublishLedger(idempotency_key=key, platform=platform, response=json.dumps(result)))
+        db.commit()
+    except IntegrityError:
+        db.rollback()  # Already recorded by a concurrent dispatch
+    except SQLAlchemyError as e:
+        db.rollback()
+        print(f"❌ Could not record {platform} post {key} in the publish ledger: {e}")
+    finally:
+        db.close()
+
+
+def content_idempotency_key(content_id: int, part: int = None) -> str:
+    """
+    Key for a ContentQueue row (and optionally one tweet of its thread).
+    """
+    return f"content-{content_id}" if part is None else f"content-{content_id}-{part}"
+
+
+# --------------------------
+# Retry policy
+# --------------------------
+
+def parse_retry_after(value: str):
+    """
+    Parses a Retry-After header (delta-seconds or HTTP-date) into seconds.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, retry_after: float = None) -> float:
+    """
+    Seconds before retry number `attempt` (1-based): Retry-After when the
+    platform sent one, else full-jitter exponential backoff. Capped either way.
+    """
+    cap = settings.publish_retry_max_seconds
+    if retry_after is not None:
+        return min(cap, retry_after)
+    return random.uniform(0, min(cap, settings.publish_retry_base_seconds * 2 ** (attempt - 1)))
+
+
+def _rate_limit_wait(headers) -> float:
+    """
+    Seconds until a rate limit lifts: Retry-After, else X's x-rate-limit-reset (epoch seconds).
+    """
+    retry_after = parse_retry_after(headers.get("Retry-After"))
+    if retry_after is None and headers.get("x-rate-limit-reset"):
+        try:
+            retry_after = max(0.0, float(headers.get("x-rate-limit-reset")) - time.time())
+        except (TypeError, ValueError):
+            pass
+    return retry_after
+
+
+def post_json(
+    url: str,
+    headers: dict,
+    payload: dict,
+    platform: str,
+    idempotency_key: str = None,
+    retry_rate_limits: bool = True,
+) -> dict:
+    """
+    POSTs JSON with the shared retry policy and returns the decoded response.
+    With retry_rate_limits=False a 429 is raised straight away (with retry_after
+    set) so the caller can defer the post instead of holding a thread.
+
+    Raises:
+        PublishError: on a non-retryable error, or once retries are exhausted
+    """
+    cached = _remembered(idempotency_key)
+    if cached is not None:
+        print(f"♻️ {platform} post already made for {idempotency_key}; not sending again")
+        return cached
+
+    if idempotency_key:
+        headers = {**headers, "Idempotency-Key": idempotency_key}
+
+    attempts = settings.publish_max_retries + 1
+    for attempt in range(1, attempts + 1):
+        try:
+            response = http_session.post(url, headers=headers, json=payload, timeout=_timeout())
+        except requests.ConnectionError as e:
+            # Includes connect timeouts: the request never reached the platform
+            if attempt == attempts:
+                raise PublishError(f"{platform} API unreachable: {e}")
+            delay = backoff_delay(attempt)
+            print(f"🔁 {platform} connection failed ({e}); retrying in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+        except requests.Timeout as e:
+            raise PublishError(f"{platform} API timed out after sending; not retried: {e}")
+
+        if response.status_code < 400:
+            result = response.json()
+            _remember(idempotency_key, platform, result)
+            return result
+
+        retry_after = _rate_limit_wait(response.headers)
+        error = PublishError(
+            f"{platform} API error {response.status_code}: {response.text}",
+            status_code=response.status_code,
+            retry_after=retry_after
+        )
+        # A 5xx may mean the post was accepted, and the platforms do not dedupe; only 429 is safe
+        retryable = response.status_code == 429 and retry_rate_limits
+        if not retryable or attempt == attempts:
+            raise error
+
+        delay = backoff_delay(attempt, retry_after)
+        print(f"🔁 {platform} returned {response.status_code}; retry {attempt}/{attempts - 1} in {delay:.1f}s")
+        time.sleep(delay)
+
 
 # --------------------------
 # Typefully Integration
 # --------------------------
 
-def post_to_typefully(content: str, scheduled_for: datetime = None):
+def post_to_typefully(content: str, scheduled_for: datetime = None, idempotency_key: str = None):
     """
     Posts content to Typefully via draft endpoint.
     """
@@ -33,17 +238,7 @@ def post_to_typefully(content: str, scheduled_for: datetime = None):
     if scheduled_for:
         payload["schedule-date"] = scheduled_for.isoformat()
 
-    print("🔍 Posting to Typefully:")
-    print("🔸 Headers:", headers)
-    print("🔸 Payload:", payload)
-
-
-    response = requests.post(url, headers=headers, json=payload)
-
-    if response.status_code >= 400:
-        raise Exception(f"Typefully API error {response.status_code}: {response.text}")
-
-    result = response.json()
+    result = post_json(url, headers, payload, "Typefully", idempotency_key)
     return {
         "platform_posted_id": result.get("id", None),
         "post_response": json.dumps(result)
@@ -55,7 +250,13 @@ def post_to_typefully(content: str, scheduled_for: datetime = None):
 # Twitter (X) Integration
 # --------------------------
 
-def post_to_x(text: str, access_token: str, in_reply_to_id: str = None):
+def post_to_x(
+    text: str,
+    access_token: str,
+    in_reply_to_id: str = None,
+    idempotency_key: str = None,
+    retry_rate_limits: bool = True,
+):
     """
     Posts a single tweet (or part of a thread) to X (Twitter).
     """
@@ -69,12 +270,7 @@ def post_to_x(text: str, access_token: str, in_reply_to_id: str = None):
     if in_reply_to_id:
         payload["reply"] = {"in_reply_to_tweet_id": in_reply_to_id}
 
-    response = requests.post(url, headers=headers, json=payload)
-
-    if response.status_code >= 400:
-        raise Exception(f"Twitter API error {response.status_code}: {response.text}")
-
-    result = response.json()
+    result = post_json(url, headers, payload, "Twitter", idempotency_key, retry_rate_limits)
     return {
         "platform_posted_id": result.get("data", {}).get("id", None),
         "post_response": json.dumps(result)
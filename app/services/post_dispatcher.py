@@ -0,0 +1,362 @@
+# app/services/post_dispatcher.py
+
+"""
+Dispatches scheduled content once it falls due.
+
+Each poll claims a batch of due rows with SELECT ... FOR UPDATE SKIP LOCKED and
+flips them from "scheduled" to "posting" in the same transaction, so several
+dispatcher replicas can run side by side without posting a row twice. Claimed
+posts are then sent concurrently. A post over its platform's rate limit is
+handed back to "scheduled" with scheduled_for pushed to when the limit frees
+up, so a busy platform never holds dispatch workers.
+
+Rows left in "posting" by a dispatcher that died mid-send are marked failed
+rather than retried, since the platform may already have accepted them. The
+stale clock (dispatch_started_at) is restarted when the send itself begins.
+
+Lag and throughput are computed from content_queue itself (dispatch_history(),
+scheduled_backlog()), so the API can report them even though the dispatcher runs
+as a separate process; dispatcher_stats() only covers the current process.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from app.config import settings
+from app.database import SessionLocal
+from app.models.content_queue import ContentQueue
+from app.services.content_queue import publish_content
+
+
+class RateLimiter:
+    """
+    Non-blocking token bucket: `per_minute` tokens per minute, bursting up to `burst`.
+    """
+
+    def __init__(self, per_minute: float, burst: float = 1.0):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """
+        Takes a token if one is available.
+
+        Returns:
+            float: 0.0 if a token was taken, else seconds until the next one
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return 0.0
+            return (1.0 - self.tokens) / self.rate
+
+
+def parse_rate_limits(spec: str = None) -> dict:
+    """
+    Parses "typefully:30,x:50" into {"typefully": 30.0, "x": 50.0}.
+    """
+    spec = settings.dispatch_rate_limits if spec is None else spec
+    limits = {}
+    for item in spec.split(","):
+        if item.strip():
+            platform, _, value = item.partition(":")
+            limits[platform.strip()] = float(value)
+    return limits
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(platform: str):
+    """
+    Returns the shared limiter for a platform, or None if it is unlimited.
+    """
+    with _limiters_lock:
+        if platform not in _limiters:
+            per_minute = parse_rate_limits().get(platform)
+            _limiters[platform] = RateLimiter(per_minute) if per_minute else None
+        return _limiters[platform]
+
+
+# --- Metrics ---
+
+_stats_lock = threading.Lock()
+_stats = {"claimed": 0, "posted": 0, "failed": 0, "deferred": 0, "stale": 0}
+_recent_lags = deque(maxlen=500)
+
+
+def _record(outcome: str, lag_seconds: float = None):
+    with _stats_lock:
+        _stats[outcome] += 1
+        if lag_seconds is not None:
+            _recent_lags.append(lag_seconds)
+
+
+def dispatcher_stats() -> dict:
+    """
+    This process's counters since start-up plus lag (posted_at - scheduled_for)
+    over its last 500 posts. See dispatch_history() for figures across processes.
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+        lags = list(_recent_lags)
+    stats["lag_seconds"] = _lag_summary(lags)
+    return stats
+
+
+def reset_dispatcher_stats():
+    with _stats_lock:
+        for key in _stats:
+            _stats[key] = 0
+        _recent_lags.clear()
+
+
+def _lag_summary(lags: list[float]) -> dict | None:
+    if not lags:
+        return None
+    lags = sorted(lags)
+    return {
+        "avg": round(sum(lags) / len(lags), 3),
+        "p95": round(lags[min(len(lags) - 1, int(len(lags) * 0.95))], 3),
+        "max": round(lags[-1], 3),
+    }
+
+
+def scheduled_backlog(db, user_id: int = None, now: datetime = None) -> dict:
+    """
+    Due-but-unposted rows and how overdue the oldest one is, for one user
+    or (user_id=None) everyone.
+    """
+    now = now or datetime.utcnow()
+    query = db.query(func.count(ContentQueue.id), func.min(ContentQueue.scheduled_for)).filter(
+        ContentQueue.status == "scheduled",
+        ContentQueue.scheduled_for <= now,
+        ContentQueue.deleted_at.is_(None)
+    )
+    if user_id is not None:
+        query = query.filter(ContentQueue.user_id == user_id)
+    count, oldest = query.one()
+    return {
+        "due": count,
+        "oldest_overdue_seconds": (now - oldest.replace(tzinfo=None)).total_seconds() if oldest else 0.0,
+    }
+
+
+def dispatch_history(db, user_id: int = None, window_minutes: int = 60, now: datetime = None) -> dict:
+    """
+    Throughput and lag (posted_at - scheduled_for) over the last window_minutes,
+    read from content_queue so it reflects every dispatcher process, plus rows
+    currently being sent. Scoped to one user unless user_id is None.
+    """
+    now = now or datetime.utcnow()
+    since = now - timedelta(minutes=window_minutes)
+
+    posted = db.query(ContentQueue.scheduled_for, ContentQueue.posted_at).filter(
+        ContentQueue.status == "posted",
+        ContentQueue.posted_at >= since,
+    )
+    in_flight = db.query(func.count(ContentQueue.id), func.min(ContentQueue.dispatch_started_at)).filter(
+        ContentQueue.status == "posting"
+    )
+    if user_id is not None:
+        posted = posted.filter(ContentQueue.user_id == user_id)
+        in_flight = in_flight.filter(ContentQueue.user_id == user_id)
+
+    rows = posted.order_by(ContentQueue.posted_at.desc()).limit(500).all()
+    lags = [
+        (posted_at - scheduled_for.replace(tzinfo=None)).total_seconds()
+        for scheduled_for, posted_at in rows if scheduled_for
+    ]
+    posting, oldest_start = in_flight.one()
+    return {
+        "window_minutes": window_minutes,
+        "posted": len(rows),
+        "posted_per_minute": round(len(rows) / window_minutes, 3),
+        "lag_seconds": _lag_summary(lags),
+        "posting": posting,
+        "oldest_posting_seconds": (now - oldest_start).total_seconds() if oldest_start else 0.0,
+    }
+
+
+# --- Dispatching ---
+
+def claim_due_posts(batch_size: int = None, now: datetime = None) -> list[int]:
+    """
+    Moves up to batch_size due rows to "posting" and returns their ids.
+    Rows locked by another dispatcher are skipped, not waited on.
+    """
+    now = now or datetime.utcnow()
+    db = SessionLocal()
+    try:
+        rows = db.query(ContentQueue).filter(
+            ContentQueue.status == "scheduled",
+            ContentQueue.scheduled_for <= now,
+            ContentQueue.deleted_at.is_(None)
+        ).order_by(ContentQueue.scheduled_for).limit(
+            batch_size or settings.dispatch_batch_size
+        ).with_for_update(skip_locked=True).all()
+
+        for row in rows:
+            row.status = "posting"
+            row.dispatch_started_at = now
+        db.commit()
+        return [row.id for row in rows]
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def defer_post(content_id: int, delay_seconds: float) -> dict:
+    """
+    Hands a claimed row back to "scheduled", due again after delay_seconds.
+    """
+    retry_at = datetime.utcnow() + timedelta(seconds=delay_seconds)
+    db = SessionLocal()
+    try:
+        db.query(ContentQueue).filter_by(id=content_id, status="posting").update({
+            "status": "scheduled",
+            "scheduled_for": retry_at,
+            "dispatch_started_at": None,
+        })
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    _record("deferred")
+    return {"success": False, "deferred": True, "message": "Rate limited; rescheduled", "retry_at": retry_at.isoformat()}
+
+
+def dispatch_post(content_id: int, dry_run: bool = False) -> dict:
+    """
+    Publishes one claimed row. If its platform is over the rate limit the row
+    is deferred instead of waited on (dry runs make no request, so they skip
+    the limit).
+    """
+    if not dry_run:
+        with SessionLocal() as db:
+            platform = db.query(ContentQueue.platform).filter_by(id=content_id, status="posting").scalar()
+        limiter = get_rate_limiter(platform) if platform else None
+        wait = limiter.try_acquire() if limiter else 0.0
+        if wait:
+            return defer_post(content_id, wait)
+
+    db = SessionLocal()
+    try:
+        content = db.query(ContentQueue).filter_by(id=content_id, status="posting").first()
+        if not content:
+            return {"success": False, "message": "Not claimed by this dispatcher"}
+
+        # Stale recovery measures from here, not from the claim
+        content.dispatch_started_at = datetime.utcnow()
+        db.commit()
+
+        result = publish_content(content, db, dry_run=dry_run)
+        if result["success"]:
+            lag = None
+            if content.scheduled_for:
+                lag = (content.posted_at - content.scheduled_for.replace(tzinfo=None)).total_seconds()
+            _record("posted", lag)
+        elif result.get("deferred"):
+            _record("deferred")
+        else:
+            _record("failed")
+        return result
+    finally:
+        db.close()
+
+
+def recover_stale_posts(now: datetime = None) -> int:
+    """
+    Fails rows stuck in "posting" longer than dispatch_stale_after_seconds.
+    They are not re-sent automatically: the platform may have accepted them.
+    """
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(seconds=settings.dispatch_stale_after_seconds)
+    db = SessionLocal()
+    try:
+        rows = db.query(ContentQueue).filter(
+            ContentQueue.status == "posting",
+            ContentQueue.dispatch_started_at < cutoff
+        ).with_for_update(skip_locked=True).all()
+        for row in rows:
+            row.status = "failed"
+            row.error_message = "Dispatch interrupted; check the platform before rescheduling"
+        db.commit()
+        for _ in rows:
+            _record("stale")
+        return len(rows)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def dispatch_due_posts(executor: ThreadPoolExecutor, batch_size: int = None, dry_run: bool = False) -> dict:
+    """
+    Claims one batch of due posts and sends them concurrently.
+    """
+    ids = claim_due_posts(batch_size)
+    with _stats_lock:
+        _stats["claimed"] += len(ids)
+    results = list(executor.map(lambda cid: dispatch_post(cid, dry_run), ids))
+    posted = sum(1 for r in results if r["success"])
+    deferred = sum(1 for r in results if r.get("deferred"))
+    return {"claimed": len(ids), "posted": posted, "deferred": deferred, "failed": len(ids) - posted - deferred}
+
+
+_bulk_executor = None
+_bulk_executor_lock = threading.Lock()
+
+
+def dispatch_claimed_posts(content_ids: list[int], dry_run: bool = False) -> list[dict]:
+    """
+    Sends rows the caller has already moved to "posting" (e.g. bulk post from
+    the API) on a shared pool, returning one result per id in order.
+    """
+    global _bulk_executor
+    with _bulk_executor_lock:
+        if _bulk_executor is None:
+            _bulk_executor = ThreadPoolExecutor(max_workers=settings.dispatch_workers, thread_name_prefix="bulk-post")
+    with _stats_lock:
+        _stats["claimed"] += len(content_ids)
+    return list(_bulk_executor.map(lambda cid: dispatch_post(cid, dry_run), content_ids))
+
+
+def run_dispatcher(stop_event: threading.Event, dry_run: bool = False):
+    """
+    Polls for due posts until stop_event is set. A full batch triggers an
+    immediate re-poll so a backlog drains without waiting for the interval.
+    """
+    batch_size = settings.dispatch_batch_size
+    print(f"📮 Post dispatcher started (batch {batch_size}, workers {settings.dispatch_workers})")
+    with ThreadPoolExecutor(max_workers=settings.dispatch_workers, thread_name_prefix="dispatch") as executor:
+        while not stop_event.is_set():
+            try:
+                recover_stale_posts()
+                result = dispatch_due_posts(executor, batch_size, dry_run)
+            except Exception as e:
+                print(f"❌ Dispatch poll failed: {e}")
+                result = {"claimed": 0}
+            if result["claimed"]:
+                print(
+                    f"📮 Dispatched {result['claimed']} posts: {result['posted']} posted, "
+                    f"{result['deferred']} deferred, {result['failed']} failed"
+                )
+            if result["claimed"] < batch_size:
+                stop_event.wait(settings.dispatch_poll_interval_seconds)
+    print("📮 Post dispatcher stopped")
@@ -0,0 +1,124 @@
+"""
+Relevance Cascade
+-----------------
+Cheap-to-expensive filters that decide which research candidates are worth
+an LLM call:
+1. lexical:   BM25 of the snippet against the topic, scored over the run's
+              candidates and normalised to 0..1
+2. embedding: cosine similarity from embedding_similarity.py
+3. llm:       check_relevance_with_ai() verdict; "Not relevant" rejects
+
+Thresholds come from Settings (cascade_*). Each stage counts what it
+evaluated and rejected; cascade_stats() reports the totals for this process.
+"""
+
+import math
+import re
+import threading
+from collections import Counter
+from app.config import settings
+
+CASCADE_STAGES = ("lexical", "embedding", "llm")
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOP_WORDS = frozenset(
+    "a about an and are as at be by for from has have how in is it its of on or that the this "
+    "to was were what when why will with".split()
+)
+STEM_LENGTH = 6  # Prefix stemming: "diagnosis" and "diagnostics" share "diagno"
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def lexical_terms(text: str) -> list[str]:
+    return [t[:STEM_LENGTH] for t in _TOKEN_RE.findall(text.lower()) if t not in _STOP_WORDS]
+
+
+def bm25_scores(query: str, documents: list[str]) -> list[float]:
+    """
+    Scores each document against the query with BM25, using the documents
+    themselves as the corpus for IDF. Each score is divided by the maximum
+    attainable over the query terms that occur somewhere in the corpus, so
+    0.0 means no query term occurs and values approach 1.0 as every
+    matchable term occurs often. A term no candidate contains doesn't drag
+    every score down. A long document matching only a common (low-IDF) term
+    scores just above 0.0, so only a threshold of 0.0 keeps every document
+    that shares a topic term.
+
+    Returns:
+        list[float]: Normalised score per document
+    """
+    query_terms = set(lexical_terms(query))
+    if not documents or not query_terms:
+        return [0.0] * len(documents)
+
+    docs = [Counter(lexical_terms(doc)) for doc in documents]
+    lengths = [sum(doc.values()) for doc in docs]
+    avg_length = (sum(lengths) / len(docs)) or 1.0
+    n_docs = len(docs)
+
+    # BM25+ style IDF stays positive when a term is in every document
+    idf = {
+        term: math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+        for term in query_terms
+        for df in [sum(1 for doc in docs if term in doc)]
+    }
+    matchable = [term for term in query_terms if any(term in doc for doc in docs)]
+    best = sum(idf[term] * (BM25_K1 + 1) for term in matchable)
+
+    scores = []
+    for doc, length in zip(docs, lengths):
+        score = 0.0
+        for term in matchable:
+            tf = doc.get(term, 0)
+            if tf:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                score += idf[term] * tf * (BM25_K1 + 1) / (tf + norm)
+        scores.append(score / best if best else 0.0)
+    return scores
+
+
+def is_relevant_verdict(verdict: str) -> bool:
+    """
+    Reads check_relevance_with_ai() output, which must open with the label
+    "Relevant" or "Not relevant". Only a leading "Relevant" passes; anything
+    else ("Irrelevant", "Unknown" after a failed call, an unlabelled answer)
+    rejects the candidate.
+    """
+    label = (verdict or "").strip().lower().split(":", 1)[0].split(".", 1)[0].strip()
+    return label == "relevant"
+
+
+# --- Metrics ---
+
+_stats_lock = threading.Lock()
+_stats = {stage: {"evaluated": 0, "rejected": 0} for stage in CASCADE_STAGES}
+
+
+def record_stage(stage: str, evaluated: int, rejected: int):
+    with _stats_lock:
+        _stats[stage]["evaluated"] += evaluated
+        _stats[stage]["rejected"] += rejected
+
+
+def cascade_stats() -> dict:
+    """
+    Returns evaluated/rejected counters per stage, plus the thresholds in use.
+    """
+    with _stats_lock:
+        stages = {stage: dict(counters) for stage, counters in _stats.items()}
+    return {
+        "stages": stages,
+        "thresholds": {
+            "lexical": settings.cascade_lexical_threshold,
+            "embedding": settings.cascade_embedding_threshold,
+            "llm": "verdict" if settings.cascade_llm_verdict else "off",
+        },
+    }
+
+
+def reset_cascade_stats():
+    with _stats_lock:
+        for counters in _stats.values():
+            counters["evaluated"] = counters["rejected"] = 0
@@ -0,0 +1,195 @@
+# app/services/request_detail.py
+
+"""
+Read model for the request detail page (GET /content/requests/{id}).
+
+load_request_detail() fetches the request, its verified sources, summary and
+content in one round trip: summary and content are picked by correlated
+subqueries and joined alongside the sources.
+
+Payloads are cached per (user, request) for request_detail_cache_ttl_seconds
+with a weak ETag. A poll whose If-None-Match matches a fresh cache entry is
+answered with 304 without touching the database; otherwise the query runs
+and the ETag is compared against the new payload. Commits in this process
+that touch a request, its sources, summary or content drop the cached entry,
+so only writes from other processes wait out the TTL.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import and_, event, func, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.content_queue import ContentQueue
+from app.models.requests import Request
+from app.models.research_sources import ResearchSource
+from app.models.summaries import Summary
+
+_CACHE_SIZE = 1024
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def load_request_detail(db, request_id: int, user_id: int):
+    """
+    Builds the detail payload with a single query, or returns None if the
+    request does not exist for this user.
+    """
+    first_summary = select(func.min(Summary.id)).where(
+        Summary.request_id == Request.id, Summary.user_id == Request.user_id
+    ).correlate(Request).scalar_subquery()
+    first_content = select(func.min(ContentQueue.id)).where(
+        ContentQueue.request_id == Request.id, ContentQueue.user_id == Request.user_id
+    ).correlate(Request).scalar_subquery()
+
+    rows = db.query(
+        Request.id, Request.original_topic, Request.content_topic, Request.content_type,
+        Request.status, Request.platform, Request.created_at,
+        Summary.combined_summary, Summary.combined_key_points,
+        ContentQueue.id.label("content_id"), ContentQueue.generated_content,
+        ContentQueue.status.label("content_status"), ContentQueue.deleted_at,
+        ResearchSource.id.label("source_id"), ResearchSource.title, ResearchSource.url,
+        ResearchSource.source_type, ResearchSource.relevance_score,
+        ResearchSource.summary.label("source_summary"), ResearchSource.key_points,
+    ).outerjoin(
+        Summary, Summary.id == first_summary
+    ).outerjoin(
+        ContentQueue, ContentQueue.id == first_content
+    ).outerjoin(
+        ResearchSource, and_(
+            ResearchSource.request_id == Request.id,
+            ResearchSource.user_id == Request.user_id,
+            ResearchSource.verification_status == "verified",
+        )
+    ).filter(
+        Request.id == request_id, Request.user_id == user_id
+    ).order_by(ResearchSource.id).all()
+
+    if not rows:
+        return None
+
+    head = rows[0]
+    return {
+        "success": True,
+        "data": {
+            "request": {
+                "id": head.id,
+                "original_topic": head.original_topic,
+                "content_topic": head.content_topic,
+                "content_type": head.content_type,
+                "status": head.status,
+                "platform": head.platform,
+                "created_at": head.created_at,
+            },
+            "sources": [{
+                "title": r.title,
+                "url": r.url,
+                "source_type": r.source_type,
+                "relevance_score": r.relevance_score,
+                "summary": r.source_summary,
+                "key_points": r.key_points,
+            } for r in rows if r.source_id is not None],
+            "summary": {
+                "combined_summary": head.combined_summary,
+                "key_points": head.combined_key_points or [],
+            },
+            "content": {
+                "id": head.content_id,
+                "generated_content": head.generated_content or "",
+                "status": head.content_status or "missing",
+                "deleted_at": head.deleted_at,
+            }
+        }
+    }
+
+
+def compute_etag(payload) -> str:
+    body = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":"))
+    return f'W/"{hashlib.sha1(body.encode("utf-8")).hexdigest()}"'
+
+
+def cached_detail_etag(request_id: int, user_id: int):
+    """
+    Returns the ETag of a fresh cache entry, or None.
+    """
+    with _cache_lock:
+        entry = _cache.get((user_id, request_id))
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+    return None
+
+
+def get_request_detail(db, request_id: int, user_id: int):
+    """
+    Returns (payload, etag) from the cache or the database; (None, None) if not found.
+    """
+    key = (user_id, request_id)
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            _cache.move_to_end(key)
+            return entry[2], entry[1]
+
+    payload = load_request_detail(db, request_id, user_id)
+    if payload is None:
+        return None, None
+    payload = jsonable_encoder(payload)
+    etag = compute_etag(payload)
+
+    with _cache_lock:
+        _cache[key] = (time.monotonic() + settings.request_detail_cache_ttl_seconds, etag, payload)
+        _cache.move_to_end(key)
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return payload, etag
+
+
+def invalidate_request_detail(request_id: int):
+    """
+    Drops cached detail for a request (for every user key, though only the owner has one).
+    """
+    with _cache_lock:
+        for key in [k for k in _cache if k[1] == request_id]:
+            del _cache[key]
+
+
+def clear_request_detail_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+_TRACKED_MODELS = (Request, ResearchSource, Summary, ContentQueue)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_requests(session, flush_context):
+    changed = session.info.setdefault("request_detail_changed", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Request):
+            changed.add(obj.id)
+        elif isinstance(obj, _TRACKED_MODELS):
+            changed.add(obj.request_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_requests(session):
+    for request_id in session.info.pop("request_detail_changed", ()):
+        invalidate_request_detail(request_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_requests(session):
+    session.info.pop("request_detail_changed", None)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
@@ -0,0 +1,304 @@
+"""
+Source Discovery
+----------------
+Registry of discovery providers, selected by Settings.discovery_providers
+(comma-separated, in merge order):
+- "ai":     LLM-suggested sources (ai_source_discovery.py)
+- "google": Google Custom Search (google_search.py)
+- "arxiv":  arXiv's Atom query API
+- "local":  JSON fixture file (Settings.discovery_fixture_path, default
+            app/fixtures/discovery_sources.json), no network; bundled page
+            bodies are served through the page cache so verification stays offline
+
+Each provider is a shared instance holding its own client. Results are
+cached per (provider, query, limit, preference) for
+Settings.discovery_cache_ttl_seconds, so popular topics don't hit the
+search APIs again inside that window.
+
+discover_sources() runs the providers concurrently. Each one has its own
+timeout: a provider that overruns contributes no sources instead of
+stalling the research stage, and its thread is left to finish in the
+background.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, List
+import requests
+from app.config import settings
+from app.llm.cache import MemoryResponseStore
+from app.services.ai_source_discovery import discover_sources_with_ai
+from app.services.google_search import get_google_search_results
+from app.services.page_cache import store_page
+from app.services.source_verification import parse_page_metadata
+
+
+class DiscoveryProvider:
+    """
+    Base class for discovery providers.
+
+    Attributes:
+        name (str): Key used in Settings.discovery_providers
+        cacheable (bool): Whether results go through the result cache
+    """
+    name = ""
+    cacheable = True
+
+    @property
+    def timeout(self) -> float:
+        raise NotImplementedError
+
+    def search(self, content_topic: str, limit: int, preference: str) -> List[Dict]:
+        raise NotImplementedError
+
+
+class AIDiscoveryProvider(DiscoveryProvider):
+    name = "ai"
+
+    @property
+    def timeout(self) -> float:
+        return settings.discovery_ai_timeout_seconds
+
+    def search(self, content_topic: str, limit: int, preference: str) -> List[Dict]:
+        return discover_sources_with_ai(content_topic, limit, preference)
+
+
+class GoogleDiscoveryProvider(DiscoveryProvider):
+    name = "google"
+
+    @property
+    def timeout(self) -> float:
+        return settings.discovery_google_timeout_seconds
+
+    def search(self, content_topic: str, limit: int, preference: str) -> List[Dict]:
+        results = get_google_search_results(content_topic, limit)
+        return [{"source": "google", **r} for r in results]
+
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+class ArxivDiscoveryProvider(DiscoveryProvider):
+    """
+    Queries export.arxiv.org over a keep-alive session and returns abstract pages.
+    """
+    name = "arxiv"
+    api_url = "https://export.arxiv.org/api/query"
+
+    def __init__(self):
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": "xPostingAgent/1.0 (source discovery)"})
+
+    @property
+    def timeout(self) -> float:
+        return settings.discovery_arxiv_timeout_seconds
+
+    def search(self, content_topic: str, limit: int, preference: str) -> List[Dict]:
+        response = self.session.get(self.api_url, params={
+            "search_query": f"all:{content_topic}",
+            "start": 0,
+            "max_results": limit,
+            "sortBy": "relevance",
+        }, timeout=(5, self.timeout))
+        response.raise_for_status()
+        return parse_arxiv_feed(response.text)
+
+
+def parse_arxiv_feed(xml_text: str) -> List[Dict]:
+    """
+    Converts an arXiv Atom feed into discovery results.
+    """
+    sources = []
+    for entry in ET.fromstring(xml_text).iter(f"{ATOM}entry"):
+        url = (entry.findtext(f"{ATOM}id") or "").strip()
+        if not url:
+            continue
+        sources.append({
+            "source": "arxiv",
+            "title": " ".join((entry.findtext(f"{ATOM}title") or "").split()),
+            "authors": ", ".join(
+                (a.findtext(f"{ATOM}name") or "").strip() for a in entry.findall(f"{ATOM}author")
+            ),
+            "url": url,
+            "date": (entry.findtext(f"{ATOM}published") or "")[:10],
+            "snippet": " ".join((entry.findtext(f"{ATOM}summary") or "").split()),
+        })
+    return sources
+
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+BUNDLED_FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "discovery_sources.json")
+
+
+class LocalFixtureProvider(DiscoveryProvider):
+    """
+    Offline stand-in: ranks entries of a JSON list ({title, url, snippet, ...})
+    by word overlap with the topic. The file is read once and kept in memory.
+
+    An entry's optional "page" is an HTML file (relative to the JSON file)
+    standing in for the live page. Returned entries are written to the page
+    cache from it, so fetch_page() serves them without a request; this needs
+    enable_page_cache.
+    """
+    name = "local"
+    cacheable = False
+
+    def __init__(self, path: str = None):
+        self.path = path or settings.discovery_fixture_path or BUNDLED_FIXTURE
+        self._entries = None
+        self._pages = {}  # url -> fetch_page()-shaped result
+        self._lock = threading.Lock()
+
+    @property
+    def timeout(self) -> float:
+        return 5.0
+
+    def entries(self) -> List[Dict]:
+        with self._lock:
+            if self._entries is None:
+                try:
+                    with open(self.path, encoding="utf-8") as f:
+                        self._entries = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ Discovery fixture unavailable ({self.path}): {e}")
+                    self._entries = []
+                for entry in self._entries:
+                    if entry.get("page"):
+                        self._load_page(entry)
+            return self._entries
+
+    def _load_page(self, entry: Dict):
+        page_path = os.path.join(os.path.dirname(self.path), entry["page"])
+        try:
+            with open(page_path, "rb") as f:
+                metadata = parse_page_metadata(f.read())
+        except OSError as e:
+            print(f"⚠️ Fixture page unavailable ({page_path}): {e}")
+            return
+        self._pages[entry["url"]] = {
+            "accessible": True,
+            "status": "OK",
+            "status_code": 200,
+            "final_url": entry["url"],
+            "headers": {},
+            "metadata": metadata,
+        }
+
+    def search(self, content_topic: str, limit: int, preference: str) -> List[Dict]:
+        topic_words = set(_WORD_RE.findall(content_topic.lower()))
+
+        def overlap(entry):
+            text = f"{entry.get('title', '')} {entry.get('snippet', '')}".lower()
+            return len(topic_words & set(_WORD_RE.findall(text)))
+
+        ranked = sorted(self.entries(), key=overlap, reverse=True)
+        found = [entry for entry in ranked[:limit] if overlap(entry) > 0]
+        # Refreshed on every search so the cached copies never go stale and get re-fetched
+        for entry in found:
+            if entry["url"] in self._pages:
+                store_page(entry["url"], self._pages[entry["url"]])
+        return [
+            {"source": "local", **{k: v for k, v in entry.items() if k != "page"}}
+            for entry in found
+        ]
+
+
+DISCOVERY_PROVIDERS = {
+    AIDiscoveryProvider.name: AIDiscoveryProvider,
+    GoogleDiscoveryProvider.name: GoogleDiscoveryProvider,
+    ArxivDiscoveryProvider.name: ArxivDiscoveryProvider,
+    LocalFixtureProvider.name: LocalFixtureProvider,
+}
+
+_providers = {}
+_providers_lock = threading.Lock()
+
+result_cache = MemoryResponseStore(settings.discovery_cache_size)
+
+
+def get_discovery_provider(name: str) -> DiscoveryProvider:
+    """
+    Returns the shared provider instance for a name.
+    """
+    if name not in DISCOVERY_PROVIDERS:
+        raise ValueError(f"Unsupported discovery provider: {name}")
+    with _providers_lock:
+        if name not in _providers:
+            _providers[name] = DISCOVERY_PROVIDERS[name]()
+        return _providers[name]
+
+
+def enabled_providers(names: str = None) -> List[DiscoveryProvider]:
+    names = names if names is not None else settings.discovery_providers
+    return [get_discovery_provider(n.strip()) for n in names.split(",") if n.strip()]
+
+
+def _cache_key(provider: DiscoveryProvider, content_topic: str, limit: int, preference: str) -> str:
+    query = " ".join(content_topic.lower().split())
+    return f"discovery:{provider.name}:{limit}:{preference}:{query}"
+
+
+def _search(provider: DiscoveryProvider, content_topic: str, limit: int, preference: str, cache_key: str):
+    found = provider.search(content_topic, limit, preference) or []
+    if cache_key and found:
+        result_cache.set(cache_key, json.dumps(found), settings.discovery_cache_ttl_seconds)
+    return found
+
+
+def discover_sources(content_topic: str, limit: int, preference: str = "balanced", providers: str = None) -> List[Dict]:
+    """
+    Queries every enabled provider in parallel (cache hits skip the call) and
+    concatenates their results in provider order, so deduplication stays stable.
+
+    Args:
+        content_topic (str): Refined topic to research
+        limit (int): Sources to ask each provider for
+        preference (str): Source style passed to providers that use it
+        providers (str, optional): Comma-separated provider names (defaults to settings)
+
+    Returns:
+        List[Dict]: Raw candidates; providers that failed or timed out add nothing
+    """
+    active = enabled_providers(providers)
+    results = {}
+    pending = []
+    for provider in active:
+        cache_key = _cache_key(provider, content_topic, limit, preference) if provider.cacheable else None
+        cached = result_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            results[provider.name] = json.loads(cached)
+            print(f"♻️ {provider.name}: {len(results[provider.name])} cached sources")
+        else:
+            pending.append((provider, cache_key))
+
+    if pending:
+        executor = ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="source-discovery")
+        try:
+            started = time.monotonic()
+            futures = [
+                (provider, executor.submit(_search, provider, content_topic, limit, preference, cache_key))
+                for provider, cache_key in pending
+            ]
+            for provider, future in futures:
+                remaining = max(0.0, started + provider.timeout - time.monotonic())
+                try:
+                    results[provider.name] = future.result(timeout=remaining)
+                except FutureTimeoutError:
+                    print(f"⏱️ Discovery provider '{provider.name}' timed out after {provider.timeout:.0f}s")
+                    continue
+                except Exception as e:
+                    print(f"❌ Discovery provider '{provider.name}' failed: {e}")
+                    continue
+                print(f"🔎 {provider.name}: {len(results[provider.name])} sources in {time.monotonic() - started:.1f}s")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    sources = []
+    for provider in active:
+        sources.extend(results.get(provider.name, []))
+    return sources
@@ -2,19 +2,309 @@
 Source Reuse Tracking
 ---------------------
 Tracks how often a source (URL) is used for a given content topic,
-to avoid repetition and promote freshness.
+to avoid repetition and promote freshness. URLs are keyed by their
+canonical form (utils/url.py canonicalize_url). Rows written before that
+were keyed by the raw URL; lookups add those legacy counts in, and only the
+canonical key is written, so old usage still counts without a re-keying
+migration (the table stores hashes, so it can't be re-keyed in SQL).
+
+A research run works inside its own session: fetch_usage_counts() loads the
+counts for every candidate in one IN query, and record_source_usage() adds
+the run's increments as a single INSERT ... ON CONFLICT DO UPDATE that
+commits with the rest of the run. is_source_overused() and
+increment_source_usage() remain for one-off checks outside a run.
+
+With Settings.source_reuse_write_behind on (off by default), runs use the
+per-process layer instead. It trades accuracy for fewer writes:
+- get_usage_counts() remembers keys already at the threshold in an LRU.
+  Counts only grow, so an "overused" verdict never goes stale and those keys
+  skip the DB. Keys below the threshold are always re-read (one IN query),
+  because another worker may have used them since.
+- Increments go to usage_buffer, which merges them and flushes one upsert
+  per batch (by size or every source_reuse_flush_interval_seconds, and at
+  exit). Unflushed increments from this process are added to DB counts, so
+  decisions here match what the DB would say. Other workers see them after
+  the next flush, so until then they can pick a source this process has
+  already pushed over the limit.
+- Increments still in the buffer when the process is killed (anything short
+  of a clean exit) are lost, so those uses never count.
 """
 
+import atexit
+import threading
+import time
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import and_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from collections import Counter, OrderedDict
+from app.config import settings
 from app.database import SessionLocal
 from app.models.topic_source_usage import TopicSourceUsage
 from app.utils.hash import hash_string
+from app.utils.url import canonicalize_url
 from datetime import datetime
 
 # Default threshold — can pull from DB later if needed
 SOURCE_REUSE_THRESHOLD = 3
 
+_UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def source_url_key(url: str) -> str:
+    """
+    Hash stored in source_url_hash: variants of one URL (http/https, www,
+    AMP, tracking parameters) share a count.
+    """
+    return hash_string(canonicalize_url(url))
+
+
+def legacy_url_key(url: str) -> str:
+    """
+    Hash of the raw URL, as stored before keys were canonicalised.
+    """
+    return hash_string(url)
+
+
+def is_overused_count(usage_count: int) -> bool:
+    return usage_count >= SOURCE_REUSE_THRESHOLD
+
+
+def fetch_usage_counts(db: Session, user_id: int, content_topic: str, source_urls: list[str]) -> dict:
+    """
+    Loads usage counts for many URLs under one topic in a single query.
+    A URL's count is its canonical row plus any legacy raw-URL row.
+
+    Returns:
+        dict: URL -> usage count (0 for URLs never used)
+    """
+    topic_hash = hash_string(content_topic)
+    url_hashes = {url: {source_url_key(url), legacy_url_key(url)} for url in source_urls}
+    if not url_hashes:
+        return {}
+
+    rows = db.query(TopicSourceUsage.source_url_hash, TopicSourceUsage.usage_count).filter(
+        TopicSourceUsage.user_id == user_id,
+        TopicSourceUsage.content_topic_hash == topic_hash,
+        TopicSourceUsage.source_url_hash.in_(set().union(*url_hashes.values()))
+    ).all()
+    counts = {row.source_url_hash: row.usage_count or 0 for row in rows}
+    return {url: sum(counts.get(h, 0) for h in hashes) for url, hashes in url_hashes.items()}
+
+
+def record_source_usage(db: Session, user_id: int, content_topic: str, source_urls: list[str]):
+    """
+    Adds one use per URL (repeats count separately) with a single upsert.
+    Runs in the caller's transaction; the caller commits.
+    """
+    topic_hash = hash_string(content_topic)
+    increments = Counter((user_id, topic_hash, source_url_key(url)) for url in source_urls)
+    upsert_usage(db, increments, datetime.utcnow())
+
+
+def upsert_usage(db: Session, increments: Counter, used_at: datetime):
+    """
+    Applies (user_id, topic_hash, url_hash) -> count increments in one statement.
+    """
+    if not increments:
+        return
+
+    insert = _UPSERT_DIALECTS.get(db.get_bind().dialect.name)
+    if insert is None:
+        _upsert_usage_orm(db, increments, used_at)
+        return
+
+    rows = [{
+        "user_id": user_id,
+        "content_topic_hash": topic_hash,
+        "source_url_hash": url_hash,
+        "usage_count": count,
+        "last_used_at": used_at,
+        "created_at": used_at,
+    } for (user_id, topic_hash, url_hash), count in increments.items()]
+    stmt = insert(TopicSourceUsage).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "content_topic_hash", "source_url_hash"],
+        set_={
+            "usage_count": TopicSourceUsage.usage_count + stmt.excluded.usage_count,
+            "last_used_at": stmt.excluded.last_used_at,
+        }
+    )
+    db.execute(stmt)
+
+
+def _upsert_usage_orm(db: Session, increments: Counter, used_at: datetime):
+    """
+    Fallback for dialects without ON CONFLICT: read each key, then update or insert.
+    """
+    for (user_id, topic_hash, url_hash), count in increments.items():
+        entry = db.query(TopicSourceUsage).filter_by(
+            user_id=user_id,
+            content_topic_hash=topic_hash,
+            source_url_hash=url_hash
+        ).first()
+        if entry:
+            entry.usage_count += count
+            entry.last_used_at = used_at
+        else:
+            db.add(TopicSourceUsage(
+                user_id=user_id,
+                content_topic_hash=topic_hash,
+                source_url_hash=url_hash,
+                usage_count=count,
+                last_used_at=used_at
+            ))
+
+
+# --------------------------
+# Per-process cache and write-behind buffer
+# --------------------------
+
+class OverusedKeys:
+    """
+    Thread-safe LRU set of (user_id, topic_hash, url_hash) keys known to be
+    at or over the threshold.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            if key not in self._data:
+                return False
+            self._data.move_to_end(key)
+            return True
+
+    def add(self, key):
+        with self._lock:
+            self._data[key] = True
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class UsageBuffer:
+    """
+    Collects usage increments and writes them in batches with upsert_usage().
+    Flushes when flush_batch_size keys are pending, every flush_interval
+    seconds from a daemon thread, and at interpreter exit.
+    """
+
+    def __init__(self, session_factory, flush_interval: float, flush_batch_size: int):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.flush_batch_size = flush_batch_size
+        self._pending = Counter()
+        self._lock = threading.Lock()
+        self.flush_lock = threading.Lock()  # Held while a batch moves from memory to the DB
+        self._wake = threading.Event()
+        self._thread = None
+
+    def add(self, increments: Counter):
+        with self._lock:
+            self._pending.update(increments)
+            full = len(self._pending) >= self.flush_batch_size
+        self._ensure_thread()
+        if full:
+            self._wake.set()
+
+    def pending(self, key) -> int:
+        with self._lock:
+            return self._pending.get(key, 0)
+
+    def flush(self) -> int:
+        """
+        Writes everything pending in one transaction. On failure the
+        increments are put back for the next attempt.
+
+        Returns:
+            int: Number of keys written
+        """
+        with self.flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, Counter()
+            if not batch:
+                return 0
+
+            db = self.session_factory()
+            try:
+                upsert_usage(db, batch, datetime.utcnow())
+                db.commit()
+                return len(batch)
+            except SQLAlchemyError as e:
+                db.rollback()
+                print(f"❌ DB error flushing reuse buffer ({len(batch)} keys): {e}")
+                with self._lock:
+                    self._pending.update(batch)
+                return 0
+            finally:
+                db.close()
+
+    def _ensure_thread(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="source-reuse-flush", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+
+overused_keys = OverusedKeys(settings.source_reuse_cache_size)
+usage_buffer = UsageBuffer(
+    SessionLocal,
+    settings.source_reuse_flush_interval_seconds,
+    settings.source_reuse_flush_batch_size,
+)
+atexit.register(usage_buffer.flush)
+
+
+def get_usage_counts(db: Session, user_id: int, content_topic: str, source_urls: list[str]) -> dict:
+    """
+    Cached fetch_usage_counts(): keys already known to be overused skip the
+    query, and this process's unflushed increments are included.
+
+    Returns:
+        dict: URL -> usage count (at least the threshold for cached overused keys)
+    """
+    topic_hash = hash_string(content_topic)
+    keys = {url: (user_id, topic_hash, source_url_key(url)) for url in source_urls}
+    counts = {url: SOURCE_REUSE_THRESHOLD for url, key in keys.items() if key in overused_keys}
+
+    to_read = [url for url in keys if url not in counts]
+    if to_read:
+        # No flush may land between the DB read and the pending read, or an
+        # increment would be counted twice or not at all
+        with usage_buffer.flush_lock:
+            stored = fetch_usage_counts(db, user_id, content_topic, to_read)
+            pending = {url: usage_buffer.pending(keys[url]) for url in to_read}
+        for url, count in stored.items():
+            counts[url] = count + pending[url]
+            if is_overused_count(counts[url]):
+                overused_keys.add(keys[url])
+    return counts
+
+
+def buffer_source_usage(user_id: int, content_topic: str, source_urls: list[str]):
+    """
+    Queues one use per URL for the next batched flush.
+    """
+    topic_hash = hash_string(content_topic)
+    increments = Counter((user_id, topic_hash, source_url_key(url)) for url in source_urls)
+    usage_buffer.add(increments)
+
+
 def is_source_overused(user_id: int, content_topic: str, source_url: str) -> bool:
     """
     Returns True if the source has been used too often for this topic.
@@ -26,16 +316,10 @@ def is_source_overused(user_id: int, content_topic: str, source_url: str) -> boo
     Returns:
         bool: True if overused, else False
     """
-    topic_hash = hash_string(content_topic)
-    url_hash = hash_string(source_url)
     db = SessionLocal()
     try:
-        entry = db.query(TopicSourceUsage).filter_by(
-            user_id=user_id,
-            content_topic_hash=topic_hash,
-            source_url_hash=url_hash
-        ).first()
-        return entry is not None and entry.usage_count >= SOURCE_REUSE_THRESHOLD
+        counts = fetch_usage_counts(db, user_id, content_topic, [source_url])
+        return is_overused_count(counts[source_url])
     except SQLAlchemyError as e:
         print(f"❌ DB error checking reuse: {e}")
         return False
@@ -44,29 +328,9 @@ def is_source_overused(user_id: int, content_topic: str, source_url: str) -> boo
 
 
 def increment_source_usage(user_id: int, content_topic: str, source_url: str):
-    topic_hash = hash_string(content_topic)
-    url_hash = hash_string(source_url)
     db = SessionLocal()
     try:
-        entry = db.query(TopicSourceUsage).filter_by(
-            user_id=user_id,
-            content_topic_hash=topic_hash,
-            source_url_hash=url_hash
-        ).first()
-
-        if entry:
-            entry.usage_count += 1
-            entry.last_used_at = datetime.utcnow()
-        else:
-            entry = TopicSourceUsage(
-                user_id=user_id,
-                content_topic_hash=topic_hash,
-                source_url_hash=url_hash,
-                usage_count=1,
-                last_used_at=datetime.utcnow()
-            )
-            db.add(entry)
-
+        record_source_usage(db, user_id, content_topic, [source_url])
         db.commit()
     except SQLAlchemyError as e:
         db.rollback()
@@ -2,17 +2,185 @@
 Source Verification
 -------------------
 Checks if a URL is accessible and relevant to the content topic.
-Extracts metadata like title, description, and body.
+Fetches each page once over a pooled session and extracts metadata
+like title, description, and body from the same response.
 Optionally sends page snippet to LLM to check topic relevance.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+from app.config import settings
 from app.llm.engine import generate_completion
+from app.services.page_cache import (
+    get_cached_page,
+    conditional_headers,
+    store_page,
+    mark_revalidated,
+)
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (5, 10)
+
+
+def _build_http_session() -> requests.Session:
+    """
+    Builds a keep-alive session shared by all verification workers.
+    The pool is sized so every research worker can hold a connection.
+    """
+    session = requests.Session()
+    pool_size = max(10, settings.research_verification_workers * 2)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+http_session = _build_http_session()
+
+
+def parse_page_metadata(html, max_chars: int = 2000) -> dict:
+    """
+    Parses HTML (str or bytes) for title, meta description and a text snippet.
+
+    Returns:
+        dict: {
+            "title": str,
+            "description": str,
+            "snippet": str
+        }
+    """
+    soup = BeautifulSoup(html, "lxml")
+
+    title = soup.title.string.strip() if soup.title and soup.title.string else ""
+    meta_desc = soup.find("meta", attrs={"name": "description"})
+    description = meta_desc["content"].strip() if meta_desc and "content" in meta_desc.attrs else ""
+    paragraphs = " ".join([p.get_text(strip=True) for p in soup.find_all("p")])
+    snippet = f"{title}. {description}. {paragraphs}".strip()[:max_chars]
+
+    return {
+        "title": title,
+        "description": description,
+        "snippet": snippet
+    }
+
+
+def _read_capped(response: requests.Response, max_bytes: int) -> bytes:
+    """
+    Reads at most max_bytes of a streamed response body.
+    """
+    body = bytearray()
+    for chunk in response.iter_content(chunk_size=16 * 1024):
+        body.extend(chunk)
+        if len(body) >= max_bytes:
+            break
+    return bytes(body[:max_bytes])
+
+
+def _fetch_from_network(url: str, timeout, max_bytes: int, max_chars: int, extra_headers: dict = None) -> dict:
+    """
+    Streams a page over the shared session and parses the capped body.
+    A 304 reply (to a conditional request) is returned as accessible with no metadata.
+    """
+    result = {
+        "accessible": False,
+        "status": "",
+        "status_code": None,
+        "final_url": url,
+        "headers": {},
+        "metadata": {},
+    }
+    try:
+        with http_session.get(url, headers=extra_headers, timeout=timeout, allow_redirects=True, stream=True) as response:
+            result["status_code"] = response.status_code
+            result["final_url"] = response.url
+            result["headers"] = dict(response.headers)
+
+            if response.status_code >= 400:
+                result["status"] = f"HTTP {response.status_code}"
+                return result
+
+            result["accessible"] = True
+            result["status"] = "OK"
+            if response.status_code == 304:
+                return result
+            body = _read_capped(response, max_bytes)
+
+        result["metadata"] = parse_page_metadata(body, max_chars=max_chars)
+        return result
+
+    except requests.exceptions.RequestException as e:
+        result["status"] = f"Request error: {str(e)}"
+        return result
+    except Exception as e:
+        if result["accessible"]:
+            # Reachable but unparseable: keep it accessible with no metadata
+            print(f"❌ Error extracting metadata from {url}: {e}")
+            return result
+        result["status"] = f"Unhandled: {str(e)}"
+        return result
+
+
+def fetch_page(
+    url: str,
+    timeout=DEFAULT_TIMEOUT,
+    max_bytes: int = None,
+    max_chars: int = 2000,
+    use_cache: bool = None,
+) -> dict:
+    """
+    Fetches a page once over the shared session and parses it in the same pass.
+    Only the first max_bytes of the body are downloaded.
+
+    When the page cache is enabled, a fresh entry is returned without any
+    network call or parse; a stale entry is revalidated with its ETag /
+    Last-Modified and reused on 304 Not Modified.
+
+    Args:
+        url (str): The URL to fetch
+        timeout: Seconds, or a (connect, read) tuple
+        max_bytes (int, optional): Body cap (defaults to settings.page_fetch_max_kb)
+        max_chars (int): Snippet length cap
+        use_cache (bool, optional): Override settings.enable_page_cache
+
+    Returns:
+        dict: {
+            "accessible": bool,
+            "status": str,          # "OK", "HTTP 404", "Request error: ..."
+            "status_code": int | None,
+            "final_url": str,
+            "headers": dict,
+            "metadata": dict,       # parse_page_metadata() output, {} if not accessible
+            "from_cache": bool
+        }
+    """
+    max_bytes = max_bytes or settings.page_fetch_max_kb * 1024
+    use_cache = settings.enable_page_cache if use_cache is None else use_cache
+
+    cached, fresh = get_cached_page(url) if use_cache else (None, False)
+    if cached and fresh:
+        return cached
+
+    extra_headers = conditional_headers(cached) if cached else None
+    page = _fetch_from_network(url, timeout, max_bytes, max_chars, extra_headers)
+
+    if cached and page["status_code"] == 304:
+        mark_revalidated(url)
+        return cached
+
+    page["from_cache"] = False
+    if use_cache:
+        store_page(url, page)
+    return page
+
 
 def is_url_accessible(url: str, timeout: int = 5) -> tuple[bool, str]:
     """
     Checks if a URL is accessible (status code < 400).
+    Prefer fetch_page() when the metadata is needed too.
 
     Args:
         url (str): The URL to test
@@ -20,21 +188,13 @@ def is_url_accessible(url: str, timeout: int = 5) -> tuple[bool, str]:
     Returns:
         bool: True if accessible, False otherwise
     """
-    headers = {"User-Agent": "Mozilla/5.0"}
-    try:
-        response = requests.get(url, headers=headers, timeout=timeout, allow_redirects=True)
-        if response.status_code < 400:
-            return True, "OK"
-        else:
-            return False, f"HTTP {response.status_code}"
-    except requests.exceptions.RequestException as e:
-        return False, f"Request error: {str(e)}"
-    except Exception as e:
-        return False, f"Unhandled: {str(e)}"
+    page = fetch_page(url, timeout=timeout)
+    return page["accessible"], page["status"]
 
 def extract_page_metadata(url: str, max_chars: int = 2000) -> dict:
     """
     Downloads and parses the page for metadata and content snippet.
+    Prefer fetch_page() when the access status is needed too.
 
     Returns:
         dict: {
@@ -43,36 +203,15 @@ def extract_page_metadata(url: str, max_chars: int = 2000) -> dict:
             "snippet": str
         }
     """
-    headers = {"User-Agent": "Mozilla/5.0"}
-    try:
-        response = requests.get(url, headers=headers, timeout=10)
-        if response.status_code >= 400:
-            return {}
-
-        soup = BeautifulSoup(response.text, "lxml")
-
-        title = soup.title.string.strip() if soup.title else ""
-        meta_desc = soup.find("meta", attrs={"name": "description"})
-        description = meta_desc["content"].strip() if meta_desc and "content" in meta_desc.attrs else ""
-        paragraphs = " ".join([p.get_text(strip=True) for p in soup.find_all("p")])
-        snippet = f"{title}. {description}. {paragraphs}".strip()[:max_chars]
-
-        return {
-            "title": title,
-            "description": description,
-            "snippet": snippet
-        }
-
-    except Exception as e:
-        print(f"❌ Error extracting metadata from {url}: {e}")
-        return {}
+    return fetch_page(url, max_chars=max_chars)["metadata"]
 
 def check_relevance_with_ai(page_snippet: str, content_topic: str) -> str:
     """
     Asks the LLM whether the page snippet is relevant to the topic.
 
     Returns:
-        str: Relevance summary from LLM
+        str: Relevance summary from LLM, labelled "Relevant:" or "Not relevant:"
+             ("Unknown" if the call fails)
     """
     prompt = f"""Evaluate the relevance of the following web content to this topic: "{content_topic}".
 
@@ -81,7 +220,7 @@ Content:
 {page_snippet}
 \"\"\"
 
-Respond with a 1-2 sentence summary of relevance, or say "Not relevant" if unrelated.
+Start your answer with exactly "Relevant:" or "Not relevant:", followed by a 1-2 sentence summary of relevance.
 """
     try:
         result = generate_completion(prompt, agent="research_agent")
@@ -96,9 +235,10 @@ if __name__ == "__main__":
     test_url = "https://www.sciencedaily.com/releases/2025/06/250619090853.htm"
     topic = "Impact of AI on education systems"
 
-    if is_url_accessible(test_url):
+    page = fetch_page(test_url)
+    if page["accessible"]:
         print("✅ URL is accessible.")
-        meta = extract_page_metadata(test_url)
+        meta = page["metadata"]
         if meta and "snippet" in meta:
             print("🔎 Metadata:", meta)
             summary = check_relevance_with_ai(meta['snippet'], topic)
@@ -106,5 +246,4 @@ if __name__ == "__main__":
         else:
             print("⚠️ No usable metadata or snippet found.")
     else:
-        print("❌ URL not accessible.")
-
+        print(f"❌ URL not accessible: {page['status']}")
@@ -0,0 +1,145 @@
+# app/services/thread_publisher.py
+
+"""
+Publishes threads natively on X as a reply chain.
+
+Each entry of ThreadMetadata.thread_structure is posted as a reply to the one
+before it. The returned tweet id is written back into that entry
+({"tweet": ..., "tweet_id": ..., "posted_at": ...}) and committed right away,
+so a retry after a partial failure resumes from the first unposted tweet.
+
+Replies depend on the previous tweet's id, so tweets in one thread go out one
+after another; separate threads are published concurrently by the dispatcher.
+When X rate-limits a user, the thread is deferred until the window resets
+(ThreadDeferred) rather than holding a worker, and that user's other posts are
+deferred too until then.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime
+from sqlalchemy.orm import Session
+from app.models.content_queue import ContentQueue
+from app.models.thread_metadata import ThreadMetadata
+from app.models.user_configurations import UserConfiguration
+from app.services.platform_publisher import PublishError, content_idempotency_key, post_to_x
+
+DEFAULT_RATE_LIMIT_WAIT = 900  # X windows are 15 minutes
+
+
+class ThreadDeferred(Exception):
+    """
+    X is rate-limiting this user; try again after retry_after seconds.
+    """
+
+    def __init__(self, retry_after: float, posted: int, total: int):
+        super().__init__(f"Rate limited after {posted}/{total} tweets; retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+        self.posted = posted
+        self.total = total
+
+
+class ThreadPartiallyPosted(Exception):
+    """
+    Some tweets are live and a later one failed; publishing again resumes.
+    """
+
+    def __init__(self, cause: Exception, posted: int, total: int):
+        super().__init__(f"Posted {posted}/{total} tweets before failing: {cause}")
+        self.posted = posted
+        self.total = total
+
+
+# Per-user rate-limit windows, so one limited user does not tie up dispatch workers
+_blocked_until = {}
+_blocked_lock = threading.Lock()
+
+
+def _blocked_for(user_id: int) -> float:
+    with _blocked_lock:
+        return max(0.0, _blocked_until.get(user_id, 0.0) - time.time())
+
+
+def _block(user_id: int, seconds: float):
+    with _blocked_lock:
+        _blocked_until[user_id] = max(_blocked_until.get(user_id, 0.0), time.time() + seconds)
+
+
+def get_x_access_token(db: Session, user_id: int) -> str:
+    """
+    Returns the user's own X access token. There is deliberately no app-wide
+    fallback: it would publish on the operator's account.
+    """
+    token = db.query(UserConfiguration.x_access_token).filter_by(user_id=user_id).scalar()
+    if not token:
+        raise ValueError("No X access token for this user. Connect an X account first.")
+    return token
+
+
+def _thread_entries(content: ContentQueue, db: Session):
+    """
+    Returns (metadata row or None, list of entries). Articles and threads
+    without metadata are published as a single tweet.
+    """
+    meta = db.query(ThreadMetadata).filter_by(content_queue_id=content.id).first()
+    if meta and meta.thread_structure:
+        entries = [dict(e) if isinstance(e, dict) else {"tweet": str(e)} for e in meta.thread_structure]
+        return meta, entries
+    return None, [{"tweet": content.generated_content}]
+
+
+def publish_x_thread(content: ContentQueue, db: Session) -> dict:
+    """
+    Posts (or resumes posting) a thread as a reply chain on X.
+
+    Returns:
+        dict: platform_posted_id (first tweet) and post_response (JSON list of tweet ids)
+
+    Raises:
+        ThreadDeferred: X rate-limited this user; nothing is lost, retry later
+        ThreadPartiallyPosted: a tweet failed after earlier ones went live
+    """
+    meta, entries = _thread_entries(content, db)
+    total = len(entries)
+    posted = sum(1 for e in entries if e.get("tweet_id"))
+
+    wait = _blocked_for(content.user_id)
+    if wait:
+        raise ThreadDeferred(wait, posted, total)
+
+    access_token = get_x_access_token(db, content.user_id)
+
+    for i, entry in enumerate(entries):
+        if entry.get("tweet_id"):
+            continue
+        previous_id = entries[i - 1]["tweet_id"] if i > 0 else None
+        try:
+            result = post_to_x(
+                entry["tweet"],
+                access_token,
+                in_reply_to_id=previous_id,
+                idempotency_key=content_idempotency_key(content.id, i),
+                retry_rate_limits=False,
+            )
+        except PublishError as e:
+            if e.status_code == 429:
+                retry_after = e.retry_after if e.retry_after is not None else DEFAULT_RATE_LIMIT_WAIT
+                _block(content.user_id, retry_after)
+                raise ThreadDeferred(retry_after, posted, total)
+            if posted:
+                raise ThreadPartiallyPosted(e, posted, total)
+            raise
+
+        entry["tweet_id"] = result["platform_posted_id"]
+        entry["posted_at"] = datetime.utcnow().isoformat()
+        posted += 1
+        if meta is not None:
+            meta.thread_structure = [dict(e) for e in entries]  # reassign so the JSON change is saved
+            db.commit()
+
+    tweet_ids = [e["tweet_id"] for e in entries]
+    return {
+        "platform_posted_id": tweet_ids[0],
+        "post_response": json.dumps({"tweet_ids": tweet_ids})
+    }
@@ -0,0 +1,90 @@
+# app/tests/test_batch_summariser.py
+
+"""
+Unit tests for batch_summariser.py
+Covers: batch planning under a token budget, JSON parsing, per-source fallback.
+"""
+
+import json
+from unittest.mock import patch
+
+from app.services import batch_summariser
+from app.services.batch_summariser import parse_batch_response, plan_batches, summarise_fallback, summarise_sources
+
+
+def _answer(ids):
+    return json.dumps({"sources": [
+        {"id": i, "summary": f"summary {i}", "key_points": [f"point {i}a", f"point {i}b"]} for i in ids
+    ]})
+
+
+@patch("app.services.batch_summariser._encoding", None)
+def test_plan_batches_respects_token_budget():
+    texts = ["x" * 400] * 6  # ~134 tokens each by the character estimate
+
+    batches = plan_batches(texts, token_budget=450)
+
+    assert [i for batch in batches for i in batch] == list(range(6))
+    assert all(len(batch) == 2 for batch in batches)
+
+
+def test_plan_batches_caps_sources_by_completion_limit():
+    max_sources = batch_summariser.DEFAULT_MAX_TOKENS // batch_summariser.OUTPUT_TOKENS_PER_SOURCE
+    batches = plan_batches(["short"] * (max_sources + 1), token_budget=100000)
+
+    assert [len(b) for b in batches] == [max_sources, 1]
+
+
+def test_oversized_source_gets_its_own_batch():
+    batches = plan_batches(["a", "x" * 100000, "b"], token_budget=1000)
+    assert batches == [[0], [1], [2]]
+
+
+def test_parse_batch_response_handles_fences_and_bad_entries():
+    text = "```json\n" + json.dumps({"sources": [
+        {"id": 1, "summary": "one", "key_points": ["p"]},
+        {"id": "2", "summary": "two", "key_points": []},
+        {"id": 3, "summary": "", "key_points": ["empty summary"]},
+        {"id": 9, "summary": "out of range", "key_points": []},
+        "junk",
+    ]}) + "\n```"
+
+    assert parse_batch_response(text, 3) == {1: ("one", ["p"]), 2: ("two", [])}
+    assert parse_batch_response("Summary: not json", 2) == {}
+
+
+@patch("app.services.batch_summariser.generate_completion")
+def test_summarise_sources_one_call_per_batch(mock_completion):
+    mock_completion.side_effect = lambda prompt, agent: _answer(range(1, prompt.count("[Source ") + 1))
+
+    results = summarise_sources(["first text", "second text", "third text"], token_budget=100000)
+
+    assert mock_completion.call_count == 1
+    assert results[2] == ("summary 3", ["point 3a", "point 3b"])
+
+
+@patch("app.services.batch_summariser._encoding", None)
+def test_character_estimate_leaves_a_margin():
+    # ~4 characters per token is typical for English; the estimate assumes fewer
+    assert batch_summariser.estimate_tokens("x" * 400) > 100
+
+
+@patch("app.services.batch_summariser.generate_completion", return_value=_answer([1]))
+def test_missing_sources_are_left_for_the_fallback(mock_completion):
+    results = summarise_sources(["first text", "second text"], token_budget=100000)
+
+    assert results == [("summary 1", ["point 1a", "point 1b"]), None]
+    assert mock_completion.call_count == 1
+
+
+@patch("app.services.batch_summariser.generate_completion",
+       return_value="Summary:\nFallback summary\n\nKey Points:\n- fb")
+def test_fallback_summarises_one_source(mock_completion):
+    summary, key_points = summarise_fallback("second text")
+    assert "Fallback summary" in summary and key_points == ["fb"]
+
+
+@patch("app.services.batch_summariser.generate_completion", side_effect=RuntimeError("LLM down"))
+def test_llm_outage_yields_none_instead_of_raising(mock_completion):
+    assert summarise_sources(["first text", "second text"], token_budget=100000) == [None, None]
+    assert summarise_fallback("first text") is None
@@ -1,14 +1,19 @@
 """
 Tests for content_agent.py including prompt building, validation, citation selection,
-and offensive content filtering (configurable).
+offensive content filtering (configurable) and streamed thread splitting.
 """
 
+import asyncio
 import pytest
 from types import SimpleNamespace
+from unittest.mock import patch
 
 from app.agents.content_agent import (
+    TweetStreamSplitter,
+    astream_content,
     build_content_prompt,
     select_top_citations,
+    split_into_tweets,
 )
 from app.services.content_validation import (
     validate_article_length,
@@ -91,3 +96,51 @@ def test_offensive_filter_detects_bad_word():
 def test_offensive_filter_skips_clean_text():
     text = "This is a wholesome sentence."
     assert check_offensive_content(text) is False
+
+
+# ------------------------
+# Test 6: Streaming
+# ------------------------
+
+def test_stream_splitter_matches_split_into_tweets():
+    text = "First tweet #AI\n====\nSecond tweet\n\n====\nThird tweet"
+    splitter = TweetStreamSplitter(max_parts=10)
+    streamed = []
+    for i in range(0, len(text), 3):  # separators arrive split across chunks
+        streamed.extend(splitter.feed(text[i:i + 3]))
+    streamed.extend(splitter.finish())
+
+    expected = [t.split("\n", 1)[1] for t in split_into_tweets(text)]
+    assert [tweet for _, tweet in streamed] == expected
+    assert [index for index, _ in streamed] == [1, 2, 3]
+
+
+def test_stream_splitter_emits_on_separator_and_caps_parts():
+    splitter = TweetStreamSplitter(max_parts=2)
+    assert splitter.feed("One ==") == []
+    assert splitter.feed("== Two ====") == [(1, "One"), (2, "Two")]
+    assert splitter.feed("Three") == []
+    assert splitter.finish() == []
+
+
+def test_astream_content_emits_tweets_then_persists():
+    async def fake_stream(prompt, agent):
+        for delta in ["Hook tweet ==", "==\nSecond", " tweet"]:
+            yield delta
+
+    request = SimpleNamespace(id=7, content_type="thread", thread_tweet_count=5)
+    summary = SimpleNamespace(id=3)
+
+    async def collect():
+        return [item async for item in astream_content(request, summary, [], {})]
+
+    with patch("app.agents.content_agent.build_prompt_for_request", return_value="prompt"), \
+         patch("app.agents.content_agent.astream_completion", fake_stream), \
+         patch("app.agents.content_agent.persist_generated_content",
+               return_value={"content_id": 11, "status": "draft", "tweets": []}) as persist:
+        events = asyncio.run(collect())
+
+    tweets = [data["text"] for event, data in events if event == "tweet"]
+    assert tweets == ["Hook tweet", "Second tweet"]
+    assert events[-1] == ("done", {"content_id": 11, "status": "draft", "tweets": []})
+    persist.assert_called_once_with(7, 3, "Hook tweet ====\nSecond tweet")
@@ -8,12 +8,16 @@ Tests for content queue service functions:
 These are unit tests using a mock/test DB session.
 """
 
+import json
 import pytest
+from unittest.mock import patch
 from datetime import datetime, timedelta
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.models.content_queue import ContentQueue
+from app.models.thread_metadata import ThreadMetadata
+from app.models.user_configurations import UserConfiguration
 from app.services.content_queue import (
     approve_content,
     schedule_content,
@@ -29,16 +33,20 @@ engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": Fal
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+TABLES = [ContentQueue.__table__, ThreadMetadata.__table__, UserConfiguration.__table__]
+
+
 @pytest.fixture(scope="function")
 def db():
-    from app.models.content_queue import ContentQueue
-    ContentQueue.__table__.create(bind=engine)
+    for table in TABLES:
+        table.create(bind=engine)
     session = TestingSessionLocal()
     try:
         yield session
     finally:
         session.close()
-        ContentQueue.__table__.drop(bind=engine)
+        for table in reversed(TABLES):
+            table.drop(bind=engine)
 
 
 # ---------- FIXTURE: Sample draft content ----------
@@ -84,12 +92,135 @@ def test_schedule_content_success(db, draft_content):
 def test_post_content_success(db, draft_content):
     approve_content(draft_content.id, db)
     draft_content.status = "scheduled"
+    db.add(UserConfiguration(user_id=1, x_access_token="user-token"))
     db.commit()
 
-    response = post_content(draft_content.id, db)
+    with patch("app.services.thread_publisher.post_to_x",
+               return_value={"platform_posted_id": "tweet-1", "post_response": "{}"}) as mock_post:
+        response = post_content(draft_content.id, db)
     updated = db.query(ContentQueue).get(draft_content.id)
 
+    # An article without thread metadata goes out as one tweet, with the user's own token
+    mock_post.assert_called_once()
+    assert mock_post.call_args.args == (draft_content.generated_content, "user-token")
     assert response["success"] is True
     assert updated.status == "posted"
     assert updated.posted_at is not None
-    assert "post_id" in updated.post_response
+    assert updated.platform_posted_id == "tweet-1"
+    assert json.loads(updated.post_response) == {"tweet_ids": ["tweet-1"]}
+
+
+# ---------- TEST: Bulk actions ----------
+from unittest.mock import patch
+from app.services import content_queue as content_queue_service
+from app.services.content_queue import (
+    bulk_approve_content,
+    bulk_schedule_content,
+    bulk_post_content,
+)
+
+
+def _add_content(db, status="draft", user_id=1, text="A short article body."):
+    content = ContentQueue(
+        request_id=1, user_id=user_id, content_type="article",
+        generated_content=text, status=status, platform="typefully"
+    )
+    db.add(content)
+    db.commit()
+    return content.id
+
+
+def test_bulk_approve_reports_per_item(db):
+    ok = _add_content(db)
+    posted = _add_content(db, status="posted")
+    other_user = _add_content(db, user_id=2)
+
+    result = bulk_approve_content(db, user_id=1, content_ids=[ok, posted, other_user, 999])
+
+    by_id = {r["id"]: r for r in result["results"]}
+    assert result["succeeded"] == 1 and result["failed"] == 3
+    assert by_id[ok]["success"] is True
+    assert by_id[posted]["error"] == "Only draft content can be approved"
+    assert by_id[other_user]["error"] == "Content not found"
+    assert db.query(ContentQueue).get(ok).status == "approved"
+
+
+def test_bulk_approve_by_filter(db):
+    ids = [_add_content(db) for _ in range(3)]
+    result = bulk_approve_content(db, user_id=1, status="draft")
+    assert [r["id"] for r in result["results"]] == ids
+    assert result["success"] is True
+
+
+def test_bulk_schedule_spaces_items(db):
+    first = _add_content(db, status="approved")
+    second = _add_content(db, status="approved")
+    start = datetime.utcnow() + timedelta(hours=1)
+
+    result = bulk_schedule_content(db, 1, start, interval_minutes=30, content_ids=[first, second])
+
+    assert result["success"] is True
+    gap = db.query(ContentQueue).get(second).scheduled_for - db.query(ContentQueue).get(first).scheduled_for
+    assert gap == timedelta(minutes=30)
+
+
+def test_bulk_schedule_rejects_rows_being_posted(db):
+    posting = _add_content(db, status="posting")
+    partial = _add_content(db, status="partially_posted")
+    start = datetime.utcnow() + timedelta(hours=1)
+
+    result = bulk_schedule_content(db, 1, start, content_ids=[posting, partial])
+
+    by_id = {r["id"]: r for r in result["results"]}
+    assert "cannot be scheduled" in by_id[posting]["error"]
+    assert db.query(ContentQueue).get(posting).status == "posting"
+    # A partially posted thread resumes from its first unposted tweet when due
+    assert by_id[partial]["success"] is True
+
+
+def test_bulk_post_hands_eligible_rows_to_dispatcher(db):
+    ready = _add_content(db, status="approved")
+    draft = _add_content(db)
+
+    with patch("app.services.post_dispatcher.dispatch_claimed_posts") as dispatch:
+        result = bulk_post_content(db, 1, content_ids=[ready, draft])
+
+    dispatch.assert_not_called()
+    row = db.query(ContentQueue).get(ready)
+    assert row.status == "scheduled" and row.scheduled_for <= datetime.utcnow()
+    assert [r["success"] for r in result["results"]] == [True, False]
+    assert result["results"][0]["status"] == "queued"
+    assert result["queued_ids"] == [ready]
+
+
+def test_bulk_post_skips_rows_claimed_elsewhere(db):
+    ready = _add_content(db, status="approved")
+    taken = _add_content(db, status="approved")
+
+    real_claim = content_queue_service.claim_bulk_content
+
+    def dispatcher_wins(db, user_id, content_ids, values):
+        # The dispatcher claims one row between the read and the guarded update
+        db.query(ContentQueue).filter_by(id=taken).update({"status": "posting"})
+        return real_claim(db, user_id, content_ids, values)
+
+    with patch("app.services.content_queue.claim_bulk_content", side_effect=dispatcher_wins):
+        result = bulk_post_content(db, 1, content_ids=[ready, taken])
+
+    by_id = {r["id"]: r for r in result["results"]}
+    assert by_id[ready]["success"] is True
+    assert by_id[taken]["error"] == "Content is already being posted"
+    assert db.query(ContentQueue).get(taken).status == "posting"
+
+
+def test_bulk_post_dry_run_sends_only_claimed_rows(db):
+    ready = _add_content(db, status="approved")
+    draft = _add_content(db)
+
+    with patch("app.services.post_dispatcher.dispatch_claimed_posts",
+               return_value=[{"success": True, "message": "Posted successfully"}]) as dispatch:
+        result = bulk_post_content(db, 1, dry_run=True, content_ids=[ready, draft])
+
+    dispatch.assert_called_once_with([ready], dry_run=True)
+    assert db.query(ContentQueue).get(ready).status == "posting"
+    assert [r["success"] for r in result["results"]] == [True, False]
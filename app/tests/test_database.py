@@ -0,0 +1,63 @@
+# app/tests/test_database.py
+
+"""
+Unit tests for database.py
+Covers: engine options from settings, PgBouncer mode, pool metrics.
+"""
+
+from unittest.mock import patch
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from app import database
+from app.database import MeteredQueuePool, engine_options
+
+PG_URL = "postgresql://u:p@localhost/x"
+
+
+def test_pooled_options_follow_settings():
+    with patch.multiple("app.database.settings", db_pgbouncer=False, db_pool_size=7,
+                        db_max_overflow=3, db_statement_timeout_ms=5000):
+        options = engine_options(PG_URL)
+
+    assert options["poolclass"] is MeteredQueuePool
+    assert options["pool_size"] == 7 and options["max_overflow"] == 3
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+
+def test_statement_timeout_can_be_disabled():
+    with patch.multiple("app.database.settings", db_pgbouncer=False, db_statement_timeout_ms=0):
+        assert "connect_args" not in engine_options(PG_URL)
+
+
+def test_pgbouncer_mode_uses_null_pool():
+    with patch("app.database.settings.db_pgbouncer", True):
+        options = engine_options(PG_URL)
+
+    assert options["poolclass"] is NullPool
+    assert "connect_args" not in options
+
+
+def test_sqlite_gets_driver_defaults():
+    assert engine_options("sqlite:///:memory:") == {}
+
+
+def test_metered_pool_records_checkouts(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=MeteredQueuePool, pool_size=2)
+    database.reset_pool_stats()
+    for _ in range(3):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    stats = database._stats
+    assert stats["checkouts"] == 3
+    assert stats["wait_ms_max"] >= 0.0
+    engine.dispose()
+    database.reset_pool_stats()
+
+
+def test_pool_stats_shape():
+    stats = database.pool_stats()
+    assert stats["mode"] in ("pooled", "pgbouncer")
+    assert {"checkouts", "wait_ms_avg", "wait_ms_max", "timeouts", "connects"} <= set(stats)
@@ -0,0 +1,127 @@
+# app/tests/test_embedding_similarity.py
+
+"""
+Unit tests for embedding_similarity.py
+Covers: batched embedding requests, vector cache reuse, vectorised scoring.
+"""
+
+import numpy as np
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.services import embedding_similarity
+from app.services.embedding_similarity import (
+    cosine_similarity_matrix,
+    get_embeddings,
+    score_texts_against,
+)
+
+VECTORS = {
+    "topic": [1.0, 0.0, 0.0],
+    "close": [0.9, 0.1, 0.0],
+    "far": [0.0, 0.0, 1.0],
+}
+
+
+def _fake_create(input, model):
+    return SimpleNamespace(data=[
+        SimpleNamespace(index=i, embedding=VECTORS[text]) for i, text in enumerate(input)
+    ])
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache():
+    embedding_similarity.vector_cache.clear()
+    with patch("app.services.embedding_similarity.settings.enable_embedding_store", False):
+        yield
+    embedding_similarity.vector_cache.clear()
+
+
+# --- Many texts go out in one request, duplicates embedded once ---
+@patch("app.services.embedding_similarity.client")
+def test_get_embeddings_batches_and_dedupes(mock_client):
+    mock_client.embeddings.create.side_effect = _fake_create
+
+    vectors = get_embeddings(["topic", "close", "topic", "far"])
+
+    assert mock_client.embeddings.create.call_count == 1
+    assert mock_client.embeddings.create.call_args.kwargs["input"] == ["topic", "close", "far"]
+    assert vectors[0] == vectors[2] == VECTORS["topic"]
+
+
+# --- Cached vectors are not requested again ---
+@patch("app.services.embedding_similarity.client")
+def test_get_embeddings_uses_lru(mock_client):
+    mock_client.embeddings.create.side_effect = _fake_create
+
+    get_embeddings(["topic", "close"])
+    get_embeddings(["topic", "far"])
+
+    assert mock_client.embeddings.create.call_args.kwargs["input"] == ["far"]
+
+
+# --- The topic is embedded once for the whole set of snippets ---
+@patch("app.services.embedding_similarity.client")
+def test_score_texts_against_single_call(mock_client):
+    mock_client.embeddings.create.side_effect = _fake_create
+
+    scores = score_texts_against("topic", ["close", "far"])
+
+    assert mock_client.embeddings.create.call_count == 1
+    assert scores[0] > 0.9
+    assert scores[1] == pytest.approx(0.0)
+
+
+# --- API failures score 0.0 instead of raising ---
+@patch("app.services.embedding_similarity.client")
+def test_score_texts_against_failure(mock_client):
+    mock_client.embeddings.create.side_effect = RuntimeError("boom")
+
+    assert score_texts_against("topic", ["close"]) == [0.0]
+
+
+def test_cosine_similarity_matrix_handles_zero_vectors():
+    matrix = cosine_similarity_matrix([[1.0, 0.0]], [[1.0, 0.0], [0.0, 0.0]])
+    assert matrix.shape == (1, 2)
+    assert matrix[0, 0] == pytest.approx(1.0)
+    assert matrix[0, 1] == 0.0
+
+
+# --- Local hashing backend works with no network and ranks related text higher ---
+@patch("app.services.embedding_similarity.client")
+def test_hashing_backend_scores_offline(mock_client):
+    topic = "Renewable energy adoption in Europe"
+    related = "Germany expanded offshore wind capacity while grid operators invested in renewable energy storage."
+    unrelated = "The football club confirmed the transfer of its striker after a medical on Tuesday."
+
+    scores = score_texts_against(topic, [related, unrelated], backend="hashing")
+
+    assert not mock_client.embeddings.create.called
+    assert scores[0] > scores[1]
+    assert scores[0] >= embedding_similarity.relevance_threshold("hashing")
+
+
+def test_hashing_threshold_keeps_weakly_worded_relevant_sources():
+    # Lowest-scoring relevant pair in scripts/benchmark_embeddings.py
+    topic = "AI in medical diagnostics"
+    relevant = "Deep learning models detect diabetic retinopathy in retinal scans with accuracy comparable to specialists."
+    unrelated = "The city council approved a new bike lane network along the river embankment."
+
+    scores = score_texts_against(topic, [relevant, unrelated], backend="hashing")
+    threshold = embedding_similarity.relevance_threshold("hashing")
+
+    assert scores[0] >= threshold
+    assert scores[1] < threshold
+
+
+def test_hashing_backend_is_deterministic():
+    backend = embedding_similarity.get_embedding_backend("hashing")
+    first, second = backend.embed(["same text", "same text"])
+    assert first == second
+    assert np.linalg.norm(first) == pytest.approx(1.0, abs=1e-5)
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        embedding_similarity.get_embedding_backend("nope")
@@ -0,0 +1,164 @@
+# app/tests/test_job_queue.py
+
+"""
+Unit tests for services/job_queue.py
+Covers: claiming and chaining stages, retries with backoff, dead jobs,
+expired leases, per-stage worker limits.
+"""
+
+import datetime
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.pipeline_jobs import PipelineJob
+from app.models.requests import Request
+from app.services import job_queue
+from app.services.job_queue import claim_job, complete_job, enqueue_job, execute_job, fail_job
+from app.services.pipeline_runner import PipelineStageError
+
+TEST_DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def queue_db():
+    Request.__table__.create(bind=engine)
+    PipelineJob.__table__.create(bind=engine)
+    with TestingSessionLocal() as db:
+        db.add(Request(id=1, user_id=1, original_topic="AI", content_type="thread"))
+        db.commit()
+    with patch("app.services.job_queue.SessionLocal", TestingSessionLocal), \
+         patch("app.services.job_queue.set_request_status"):
+        yield
+    PipelineJob.__table__.drop(bind=engine)
+    Request.__table__.drop(bind=engine)
+
+
+def _job(job_id):
+    with TestingSessionLocal() as db:
+        return db.get(PipelineJob, job_id)
+
+
+def _request_status():
+    with TestingSessionLocal() as db:
+        return db.get(Request, 1).status
+
+
+def test_enqueue_rejects_duplicate_active_job():
+    assert enqueue_job(1, 1) is not None
+    assert enqueue_job(1, 1) is None
+    assert _request_status() == "queued"
+
+
+def test_enqueue_race_is_settled_by_the_unique_index():
+    assert enqueue_job(1, 1) is not None
+    # Simulate a concurrent caller that passed the check before the first insert committed
+    with patch("app.services.job_queue.has_active_job", return_value=False):
+        assert enqueue_job(1, 1) is None
+    with TestingSessionLocal() as db:
+        assert db.query(PipelineJob).count() == 1
+
+
+def test_completing_a_stage_queues_the_next():
+    enqueue_job(1, 1, "summary")
+    job = claim_job("w1", ["summary"])
+    assert job["stage"] == "summary" and job["attempts"] == 1
+    assert claim_job("w2", ["summary"]) is None  # leased
+
+    assert complete_job(job["id"], "w1") is True
+    nxt = claim_job("w1", ["content"])
+    assert nxt["stage"] == "content"
+
+    complete_job(nxt["id"], "w1")
+    assert _request_status() == "completed"
+
+
+def test_failed_job_backs_off_then_dies():
+    job_id = enqueue_job(1, 1, "research")
+    with TestingSessionLocal() as db:
+        db.get(PipelineJob, job_id).max_attempts = 2
+        db.commit()
+
+    job = claim_job("w1", ["research"])
+    assert fail_job(job["id"], "w1", "timeout") == "queued"
+    assert _job(job_id).run_after > datetime.datetime.utcnow()
+    assert claim_job("w1", ["research"]) is None  # still backing off
+
+    with TestingSessionLocal() as db:
+        db.get(PipelineJob, job_id).run_after = datetime.datetime.utcnow() - datetime.timedelta(seconds=1)
+        db.commit()
+    job = claim_job("w1", ["research"])
+    assert job["attempts"] == 2
+    assert fail_job(job["id"], "w1", "timeout") == "dead"
+    assert _request_status() == "failed"
+
+
+def test_expired_lease_is_reclaimed_by_another_worker():
+    job_id = enqueue_job(1, 1, "topic")
+    claim_job("w1", ["topic"])
+    with TestingSessionLocal() as db:
+        db.get(PipelineJob, job_id).lease_expires_at = datetime.datetime.utcnow() - datetime.timedelta(seconds=1)
+        db.commit()
+
+    job = claim_job("w2", ["topic"])
+    assert job["id"] == job_id
+    assert complete_job(job_id, "w1") is False  # w1 lost its lease
+    assert complete_job(job_id, "w2") is True
+
+
+def test_stage_errors_are_not_retried():
+    enqueue_job(1, 1, "research")
+    job = claim_job("w1", ["research"])
+
+    def no_sources(request_id, user_id):
+        raise PipelineStageError("No verified sources found")
+
+    with patch.dict(job_queue.STAGE_RUNNERS, {"research": no_sources}):
+        assert execute_job(job, "w1") == "dead"
+    assert _request_status() == "failed"
+
+
+def test_heartbeat_errors_do_not_stop_the_lease_thread():
+    stop = job_queue.threading.Event()
+    calls = []
+
+    def flaky(job_id, worker_id):
+        calls.append(job_id)
+        if len(calls) == 1:
+            raise RuntimeError("connection reset")
+        if len(calls) == 3:
+            stop.set()
+        return True
+
+    with patch("app.services.job_queue.heartbeat", side_effect=flaky):
+        job_queue.keep_lease(7, "w1", stop, interval=0.01)
+
+    assert len(calls) == 3
+
+
+def test_lost_lease_ends_the_heartbeats():
+    stop = job_queue.threading.Event()
+    with patch("app.services.job_queue.heartbeat", return_value=False) as beat:
+        job_queue.keep_lease(7, "w1", stop, interval=0.01)
+    assert beat.call_count == 1
+
+
+def test_retry_delay_grows_and_caps():
+    with patch("app.services.job_queue.settings.job_retry_base_seconds", 10.0), \
+         patch("app.services.job_queue.settings.job_retry_max_seconds", 30.0):
+        assert 5.0 <= job_queue.retry_delay(1) <= 10.0
+        assert 10.0 <= job_queue.retry_delay(2) <= 20.0
+        assert job_queue.retry_delay(10) <= 30.0
+
+
+def test_worker_respects_stage_limits():
+    worker = job_queue.PipelineWorker("w1", {"topic": 1, "research": 0, "summary": 1, "content": 1})
+    worker.in_flight["topic"] = 1
+    assert worker.free_stages() == ["summary", "content"]
+    assert job_queue.parse_stage_limits("research:4")["research"] == 4
+    with pytest.raises(ValueError):
+        job_queue.parse_stage_limits("publish:2")
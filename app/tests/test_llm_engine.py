@@ -0,0 +1,178 @@
+# app/tests/test_llm_engine.py
+
+"""
+Unit tests for llm/engine.py and llm/cache.py
+Covers: agenerate_completion, astream_completion, per-model concurrency limits, token bucket, response cache.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.llm import engine
+from app.llm import cache as response_cache
+from app.llm.engine import TokenBucket, agenerate_completion, astream_completion
+
+
+def _completion(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+class FakeCompletions:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return _completion(f"  reply to {kwargs['messages'][-1]['content']}  ")
+
+
+def test_async_resources_are_per_event_loop():
+    async def grab():
+        client = engine.get_async_client()
+        assert engine.get_async_client() is client
+        return client, engine._model_limits("gpt-4o")[0]
+
+    first = asyncio.run(grab())
+    second = asyncio.run(grab())
+    assert first[0] is not second[0]
+    assert first[1] is not second[1]
+
+
+def _client(completions):
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+
+def test_agenerate_completion_uses_agent_model():
+    completions = FakeCompletions()
+    with patch("app.llm.engine.get_async_client", return_value=_client(completions)):
+        result = asyncio.run(agenerate_completion("hello", agent="content_agent"))
+
+    assert result == "reply to hello"
+    assert completions.calls[0]["model"] == engine.DEFAULT_MODELS["content_agent"]
+
+
+def test_per_model_concurrency_is_bounded():
+    completions = FakeCompletions(delay=0.02)
+
+    async def run_many():
+        await asyncio.gather(*(agenerate_completion(f"p{i}", model_name="m") for i in range(10)))
+
+    with patch("app.llm.engine.get_async_client", return_value=_client(completions)), \
+         patch("app.llm.engine.settings.llm_max_concurrency_per_model", 3), \
+         patch("app.llm.engine.settings.llm_requests_per_minute", 60000):
+        asyncio.run(run_many())
+
+    assert len(completions.calls) == 10
+    assert completions.peak == 3
+
+
+def test_astream_completion_yields_deltas():
+    class FakeStream:
+        def __init__(self, deltas):
+            self.chunks = [SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=d))]) for d in deltas]
+            self.chunks.append(SimpleNamespace(choices=[]))
+
+        def __aiter__(self):
+            return self._gen()
+
+        async def _gen(self):
+            for chunk in self.chunks:
+                yield chunk
+
+    class StreamingCompletions:
+        async def create(self, **kwargs):
+            assert kwargs["stream"] is True
+            return FakeStream(["Hel", None, "lo"])
+
+    async def collect():
+        return [d async for d in astream_completion("hi", agent="content_agent")]
+
+    with patch("app.llm.engine.get_async_client", return_value=_client(StreamingCompletions())):
+        assert asyncio.run(collect()) == ["Hel", "lo"]
+
+
+def test_token_bucket_throttles_after_burst():
+    async def take(n):
+        bucket = TokenBucket(rate=50.0, capacity=2)
+        start = time.monotonic()
+        for _ in range(n):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(take(2)) < 0.01
+    # 3 tokens beyond the burst at 50/s take ~60ms
+    assert asyncio.run(take(5)) >= 0.05
+
+
+# --------------------------
+# Response cache
+# --------------------------
+
+@pytest.fixture
+def memory_cache():
+    store = response_cache.MemoryResponseStore(max_size=16)
+    response_cache.set_response_store(store)
+    response_cache.reset_llm_cache_stats()
+    yield store
+    response_cache.set_response_store(None)
+
+
+@patch("app.llm.engine.openai")
+def test_opted_in_agent_hits_cache(mock_openai, memory_cache):
+    mock_openai.chat.completions.create.return_value = _completion("Relevant.")
+
+    with patch("app.llm.cache.settings.llm_cache_agents", "research_agent"):
+        first = engine.generate_completion("same prompt", agent="research_agent")
+        second = engine.generate_completion("same prompt", agent="research_agent")
+
+    assert first == second == "Relevant."
+    assert mock_openai.chat.completions.create.call_count == 1
+    stats = response_cache.llm_cache_stats()
+    assert stats["by_agent"]["research_agent"] == {"hits": 1, "misses": 1}
+
+
+@patch("app.llm.engine.openai")
+def test_agents_not_opted_in_bypass_cache(mock_openai, memory_cache):
+    mock_openai.chat.completions.create.return_value = _completion("Draft.")
+
+    with patch("app.llm.cache.settings.llm_cache_agents", "research_agent"):
+        engine.generate_completion("same prompt", agent="content_agent")
+        engine.generate_completion("same prompt", agent="content_agent")
+
+    assert mock_openai.chat.completions.create.call_count == 2
+    assert response_cache.llm_cache_stats()["hits"] == 0
+
+
+def test_async_path_shares_cache(memory_cache):
+    completions = FakeCompletions()
+    with patch("app.llm.engine.get_async_client", return_value=_client(completions)):
+        first = asyncio.run(agenerate_completion("p", agent="summary_agent", use_cache=True))
+        second = asyncio.run(agenerate_completion("p", agent="summary_agent", use_cache=True))
+
+    assert first == second
+    assert len(completions.calls) == 1
+
+
+def test_memory_store_expires_entries():
+    store = response_cache.MemoryResponseStore(max_size=4)
+    store.set("k", "v", ttl=-1)
+    assert store.get("k") is None
+
+
+def test_sqlite_store_round_trip(tmp_path):
+    store = response_cache.SQLiteResponseStore(str(tmp_path / "cache.sqlite3"))
+    store.set("k", "v", ttl=60)
+    assert store.get("k") == "v"
+    store.set("old", "v", ttl=-1)
+    assert store.get("old") is None
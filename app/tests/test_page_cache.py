@@ -0,0 +1,104 @@
+# app/tests/test_page_cache.py
+
+"""
+Unit tests for page_cache.py and its use in fetch_page()
+Covers: fresh hits skip the network, stale entries revalidate, counters.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch, MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.page_cache import PageCache
+from app.services import page_cache
+from app.services.source_verification import fetch_page
+
+TEST_DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+HTML = b"<html><head><title>Cached Page</title></head><body><p>Body text.</p></body></html>"
+
+
+@pytest.fixture(autouse=True)
+def cache_db():
+    PageCache.__table__.create(bind=engine)
+    page_cache.reset_page_cache_stats()
+    with patch("app.services.page_cache.SessionLocal", TestingSessionLocal):
+        yield
+    PageCache.__table__.drop(bind=engine)
+
+
+def _mock_response(status_code=200, body=HTML, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.url = "https://example.com/page"
+    response.headers = headers or {"ETag": '"v1"'}
+    response.iter_content.return_value = [body]
+    response.__enter__.return_value = response
+    return response
+
+
+# --- Second fetch is served from cache with no request ---
+@patch("app.services.source_verification.http_session")
+def test_fresh_hit_skips_network(mock_session):
+    mock_session.get.return_value = _mock_response()
+
+    first = fetch_page("https://Example.com/page/", use_cache=True)
+    second = fetch_page("https://example.com/page", use_cache=True)
+
+    assert mock_session.get.call_count == 1
+    assert first["from_cache"] is False
+    assert second["from_cache"] is True
+    assert second["metadata"]["title"] == "Cached Page"
+    assert page_cache.page_cache_stats()["hits"] == 1
+
+
+# --- Stale entries are revalidated with If-None-Match ---
+@patch("app.services.source_verification.http_session")
+def test_stale_entry_revalidates_with_etag(mock_session):
+    mock_session.get.return_value = _mock_response()
+    fetch_page("https://example.com/page", use_cache=True)
+
+    db = TestingSessionLocal()
+    db.query(PageCache).update({"expires_at": datetime.utcnow() - timedelta(seconds=1)})
+    db.commit()
+    db.close()
+
+    mock_session.get.return_value = _mock_response(status_code=304, body=b"")
+    page = fetch_page("https://example.com/page", use_cache=True)
+
+    assert mock_session.get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+    assert page["from_cache"] is True
+    assert page["metadata"]["title"] == "Cached Page"
+    assert page_cache.page_cache_stats()["revalidated"] == 1
+
+
+# --- Failed fetches are not cached ---
+@patch("app.services.source_verification.http_session")
+def test_errors_are_not_cached(mock_session):
+    mock_session.get.return_value = _mock_response(status_code=500)
+
+    fetch_page("https://example.com/page", use_cache=True)
+    fetch_page("https://example.com/page", use_cache=True)
+
+    assert mock_session.get.call_count == 2
+    assert page_cache.page_cache_stats()["stores"] == 0
+
+
+def test_purge_removes_old_entries():
+    db = TestingSessionLocal()
+    db.add(PageCache(
+        url_hash="x" * 64,
+        url="https://old.example.com/",
+        status_code=200,
+        fetched_at=datetime.utcnow() - timedelta(days=30),
+        expires_at=datetime.utcnow() - timedelta(days=29),
+    ))
+    db.commit()
+    db.close()
+
+    assert page_cache.purge_expired_pages() == 1
@@ -0,0 +1,75 @@
+# app/tests/test_pagination.py
+
+"""
+Unit tests for utils/pagination.py
+Covers: keyset pages over ties, cursor round trip, field selection.
+"""
+
+import datetime
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.content_requests import REQUEST_LIST_FIELDS
+from app.models.requests import Request
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_page, select_fields
+
+TEST_DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+BASE = datetime.datetime(2025, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def db():
+    Request.__table__.create(bind=engine)
+    session = TestingSessionLocal()
+    for i in range(1, 8):
+        # Pairs of rows share a timestamp, so pages must break ties on id
+        session.add(Request(id=i, user_id=1, original_topic=f"T{i}", content_type="thread",
+                            status="pending", platform="x", created_at=BASE + datetime.timedelta(minutes=i // 2)))
+    session.add(Request(id=99, user_id=2, original_topic="Other", content_type="thread", created_at=BASE))
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+        Request.__table__.drop(bind=engine)
+
+
+def _page(db, cursor=None, fields=None):
+    selected = select_fields(fields, REQUEST_LIST_FIELDS, ["status", "created_at"])
+    return keyset_page(
+        lambda columns: db.query(*columns).filter(Request.user_id == 1),
+        REQUEST_LIST_FIELDS, selected, sort_key="created_at", cursor=cursor, limit=3, descending=True
+    )
+
+
+def test_keyset_pages_cover_all_rows_once(db):
+    seen, cursor = [], None
+    while True:
+        rows, cursor = _page(db, cursor)
+        seen.extend(r["id"] for r in rows)
+        if not cursor:
+            break
+    assert seen == [7, 6, 5, 4, 3, 2, 1]
+
+
+def test_only_selected_fields_are_returned(db):
+    rows, _ = _page(db, fields="original_topic")
+    assert set(rows[0]) == {"id", "original_topic"}
+
+
+def test_unknown_field_rejected():
+    with pytest.raises(HTTPException) as e:
+        select_fields("password_hash", REQUEST_LIST_FIELDS, [])
+    assert e.value.status_code == 400
+
+
+def test_cursor_round_trip_and_validation():
+    assert decode_cursor(encode_cursor(BASE, 5)) == (BASE, 5)
+    with pytest.raises(HTTPException):
+        decode_cursor("not-a-cursor")
@@ -0,0 +1,88 @@
+# app/tests/test_pipeline_runner.py
+
+"""
+Unit tests for services/pipeline_runner.py
+Covers: stage order and status updates, failure recording, duplicate submissions.
+"""
+
+import threading
+from unittest.mock import patch
+
+from app.services import pipeline_runner
+from app.services.pipeline_runner import PipelineStageError, run_pipeline, submit_pipeline
+
+
+def _record_statuses():
+    statuses = []
+    return statuses, lambda request_id, status, error_message=None: statuses.append((status, error_message))
+
+
+def test_run_pipeline_advances_status_through_stages():
+    calls = []
+    statuses, fake_status = _record_statuses()
+    runners = {stage: (lambda stage: lambda rid, uid: calls.append(stage))(stage) for stage in pipeline_runner.PIPELINE_STAGES}
+
+    with patch.dict(pipeline_runner.STAGE_RUNNERS, runners), \
+         patch("app.services.pipeline_runner.set_request_status", side_effect=fake_status):
+        assert run_pipeline(1, 2) is True
+
+    assert calls == ["topic", "research", "summary", "content"]
+    assert [s for s, _ in statuses] == [
+        "generating_topic", "researching", "summarising", "generating_content", "completed"
+    ]
+
+
+def test_run_pipeline_stops_and_records_failure():
+    calls = []
+    statuses, fake_status = _record_statuses()
+
+    def failing_research(rid, uid):
+        raise PipelineStageError("No verified sources found")
+
+    runners = {
+        "topic": lambda rid, uid: calls.append("topic"),
+        "research": failing_research,
+        "summary": lambda rid, uid: calls.append("summary"),
+        "content": lambda rid, uid: calls.append("content"),
+    }
+    with patch.dict(pipeline_runner.STAGE_RUNNERS, runners), \
+         patch("app.services.pipeline_runner.set_request_status", side_effect=fake_status):
+        assert run_pipeline(1, 2) is False
+
+    assert calls == ["topic"]
+    assert statuses[-1] == ("failed", "research: No verified sources found")
+
+
+def test_run_pipeline_can_resume_from_stage():
+    calls = []
+    runners = {stage: (lambda stage: lambda rid, uid: calls.append(stage))(stage) for stage in pipeline_runner.PIPELINE_STAGES}
+
+    with patch.dict(pipeline_runner.STAGE_RUNNERS, runners), \
+         patch("app.services.pipeline_runner.set_request_status"):
+        run_pipeline(1, 2, start_stage="summary")
+
+    assert calls == ["summary", "content"]
+
+
+def test_submit_pipeline_rejects_duplicate_runs():
+    release = threading.Event()
+    finished = threading.Event()
+
+    def blocking_run(request_id, user_id, start_stage):
+        release.wait(2)
+        finished.set()
+        return True
+
+    with patch("app.services.pipeline_runner.run_pipeline", side_effect=blocking_run), \
+         patch("app.services.pipeline_runner.set_request_status"):
+        assert submit_pipeline(99, 1) is True
+        assert submit_pipeline(99, 1) is False
+        release.set()
+        assert finished.wait(2)
+
+    # Slot is released once the run finishes
+    for _ in range(100):
+        if not pipeline_runner.is_pipeline_running(99):
+            break
+        threading.Event().wait(0.01)
+    assert not pipeline_runner.is_pipeline_running(99)
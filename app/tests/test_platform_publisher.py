@@ -2,16 +2,47 @@
 
 """
 Unit tests for platform_publisher.py
-Covers: Typefully integration (success + failure)
+Covers: Typefully integration (success + failure), retries, idempotency
 """
 
 import pytest
-from unittest.mock import patch
-from app.services.platform_publisher import post_to_typefully
+import requests
+from unittest.mock import patch, MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.models.publish_ledger import PublishLedger
+from app.services import platform_publisher
+from app.services.platform_publisher import post_to_typefully, parse_retry_after
 from datetime import datetime
 
+engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def ledger_db():
+    PublishLedger.__table__.create(bind=engine)
+    with patch("app.services.platform_publisher.SessionLocal", TestingSessionLocal):
+        yield
+    PublishLedger.__table__.drop(bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    with patch("app.services.platform_publisher.time.sleep") as sleep:
+        yield sleep
+
+
+def _response(status_code, body=None, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = body or {}
+    response.text = str(body)
+    response.headers = headers or {}
+    return response
+
 # --- Success case ---
-@patch("app.services.platform_publisher.requests.post")
+@patch("app.services.platform_publisher.http_session.post")
 def test_post_to_typefully_success(mock_post):
     mock_response = mock_post.return_value
     mock_response.status_code = 200
@@ -27,7 +58,7 @@ def test_post_to_typefully_success(mock_post):
     assert mock_post.called
 
 # --- 400 error case ---
-@patch("app.services.platform_publisher.requests.post")
+@patch("app.services.platform_publisher.http_session.post")
 def test_post_to_typefully_failure(mock_post):
     mock_response = mock_post.return_value
     mock_response.status_code = 400
@@ -37,3 +68,66 @@ def test_post_to_typefully_failure(mock_post):
         post_to_typefully("Bad content")
 
     assert "Typefully API error 400" in str(e.value)
+
+
+# --- 429 is retried after Retry-After ---
+@patch("app.services.platform_publisher.http_session.post")
+def test_rate_limited_post_honours_retry_after(mock_post, no_sleep):
+    mock_post.side_effect = [_response(429, headers={"Retry-After": "7"}), _response(200, {"id": "d1"})]
+
+    result = post_to_typefully("Hello")
+
+    assert result["platform_posted_id"] == "d1"
+    no_sleep.assert_called_once_with(7.0)
+    assert mock_post.call_args.kwargs["timeout"] == (5.0, 30.0)
+
+
+# --- 5xx is never retried: the post may have been accepted ---
+@patch("app.services.platform_publisher.http_session.post")
+def test_server_error_is_not_retried(mock_post):
+    mock_post.side_effect = [_response(502), _response(200, {"id": "d2"})]
+    with pytest.raises(platform_publisher.PublishError) as e:
+        post_to_typefully("Hello", idempotency_key="content-5")
+    assert e.value.status_code == 502
+    assert mock_post.call_count == 1
+    assert mock_post.call_args.kwargs["headers"]["Idempotency-Key"] == "content-5"
+
+
+# --- A repeated call with the same key does not post again ---
+@patch("app.services.platform_publisher.http_session.post")
+def test_idempotent_repeat_is_not_resent(mock_post):
+    mock_post.return_value = _response(200, {"id": "d3"})
+
+    first = post_to_typefully("Hello", idempotency_key="content-9")
+    second = post_to_typefully("Hello", idempotency_key="content-9")
+
+    assert first == second
+    assert mock_post.call_count == 1
+
+
+# --- The ledger is in the database, so a post recorded by another process is not resent ---
+@patch("app.services.platform_publisher.http_session.post")
+def test_post_recorded_elsewhere_is_not_resent(mock_post):
+    with TestingSessionLocal() as db:
+        db.add(PublishLedger(idempotency_key="content-4", platform="Typefully", response='{"id": "d4"}'))
+        db.commit()
+
+    result = post_to_typefully("Hello", idempotency_key="content-4")
+
+    assert result["platform_posted_id"] == "d4"
+    assert not mock_post.called
+
+
+# --- Read timeouts are not retried: the post may have gone through ---
+@patch("app.services.platform_publisher.http_session.post")
+def test_read_timeout_is_not_retried(mock_post):
+    mock_post.side_effect = requests.ReadTimeout("slow")
+    with pytest.raises(platform_publisher.PublishError):
+        post_to_typefully("Hello", idempotency_key="content-1")
+    assert mock_post.call_count == 1
+
+
+def test_parse_retry_after_formats():
+    assert parse_retry_after("12") == 12.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
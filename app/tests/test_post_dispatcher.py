@@ -0,0 +1,163 @@
+# app/tests/test_post_dispatcher.py
+
+"""
+Unit tests for services/post_dispatcher.py
+Covers: claiming due rows, concurrent dispatch, stale recovery, lag reporting.
+"""
+
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.content_queue import ContentQueue
+from app.services import post_dispatcher
+from app.services.post_dispatcher import (
+    claim_due_posts,
+    dispatch_due_posts,
+    dispatch_history,
+    dispatcher_stats,
+    recover_stale_posts,
+    scheduled_backlog,
+)
+
+# File-backed so dispatch threads share one database
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+
+@pytest.fixture(autouse=True)
+def dispatch_db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'dispatch.db'}", connect_args={"check_same_thread": False})
+    TestingSessionLocal.configure(bind=engine)
+    ContentQueue.__table__.create(bind=engine)
+    post_dispatcher.reset_dispatcher_stats()
+    with patch("app.services.post_dispatcher.SessionLocal", TestingSessionLocal):
+        yield
+    engine.dispose()
+
+
+def _add(status="scheduled", minutes=-5, user_id=1, **kwargs):
+    with TestingSessionLocal() as db:
+        row = ContentQueue(
+            request_id=1, user_id=user_id, content_type="article", generated_content="Hello",
+            status=status, platform="typefully",
+            scheduled_for=datetime.utcnow() + timedelta(minutes=minutes), **kwargs
+        )
+        db.add(row)
+        db.commit()
+        return row.id
+
+
+def _status(content_id):
+    with TestingSessionLocal() as db:
+        return db.get(ContentQueue, content_id).status
+
+
+def test_claim_only_takes_due_rows_once():
+    due = _add()
+    _add(minutes=30)
+    _add(status="scheduled_deleted", deleted_at=datetime.utcnow())
+
+    assert claim_due_posts(10) == [due]
+    assert _status(due) == "posting"
+    assert claim_due_posts(10) == []
+
+
+def test_dispatch_posts_batch_and_records_lag():
+    ids = [_add(minutes=-1) for _ in range(3)]
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        result = dispatch_due_posts(executor, batch_size=10, dry_run=True)
+
+    assert result == {"claimed": 3, "posted": 3, "deferred": 0, "failed": 0}
+    assert all(_status(i) == "posted" for i in ids)
+    stats = dispatcher_stats()
+    assert stats["posted"] == 3
+    assert stats["lag_seconds"]["max"] >= 60
+
+
+def test_stale_posting_rows_fail_without_repost():
+    stuck = _add(status="posting", dispatch_started_at=datetime.utcnow() - timedelta(hours=1))
+    fresh = _add(status="posting", dispatch_started_at=datetime.utcnow())
+
+    assert recover_stale_posts() == 1
+    assert _status(stuck) == "failed"
+    assert _status(fresh) == "posting"
+
+
+def test_backlog_reports_oldest_overdue():
+    _add(minutes=-10)
+    _add(minutes=-2)
+    with TestingSessionLocal() as db:
+        backlog = scheduled_backlog(db)
+    assert backlog["due"] == 2
+    assert backlog["oldest_overdue_seconds"] >= 600
+
+
+def test_backlog_is_scoped_to_user():
+    _add(minutes=-10)
+    _add(minutes=-2, user_id=2)
+    with TestingSessionLocal() as db:
+        assert scheduled_backlog(db, user_id=2)["due"] == 1
+        assert scheduled_backlog(db, user_id=3)["due"] == 0
+
+
+def test_history_reads_lag_from_the_queue():
+    # Posted by "another process": nothing goes through this module's counters
+    now = datetime.utcnow()
+    _add(status="posted", minutes=-3, posted_at=now - timedelta(minutes=1))
+    _add(status="posted", minutes=-10, posted_at=now, user_id=2)
+    _add(status="posting", dispatch_started_at=now - timedelta(seconds=30))
+
+    with TestingSessionLocal() as db:
+        mine = dispatch_history(db, user_id=1, now=now)
+        everyone = dispatch_history(db, now=now)
+
+    assert mine["posted"] == 1 and mine["lag_seconds"]["max"] == pytest.approx(120, abs=1)
+    assert mine["posting"] == 1 and mine["oldest_posting_seconds"] == 30
+    assert everyone["posted"] == 2 and everyone["lag_seconds"]["max"] == pytest.approx(600, abs=1)
+    assert dispatcher_stats()["posted"] == 0
+
+
+def test_rate_limiter_reports_wait_after_burst():
+    limiter = post_dispatcher.RateLimiter(per_minute=60)  # 1/s
+    assert limiter.try_acquire() == 0.0
+    assert 0.0 < limiter.try_acquire() <= 1.0
+
+
+def test_rate_limited_post_is_deferred_not_waited_on():
+    due = _add()
+    claim_due_posts(10)
+    limiter = post_dispatcher.RateLimiter(per_minute=1)
+    limiter.try_acquire()  # Spend the only token
+
+    with patch("app.services.post_dispatcher.get_rate_limiter", return_value=limiter), \
+         patch("app.services.post_dispatcher.publish_content") as publish:
+        result = post_dispatcher.dispatch_post(due)
+
+    assert result["deferred"] is True
+    assert not publish.called
+    with TestingSessionLocal() as db:
+        row = db.get(ContentQueue, due)
+        assert row.status == "scheduled"
+        assert row.scheduled_for > datetime.utcnow() + timedelta(seconds=30)
+        assert row.dispatch_started_at is None
+    assert dispatcher_stats()["deferred"] == 1
+
+
+def test_stale_clock_starts_when_the_send_does():
+    due = _add(minutes=-120)
+    claim_due_posts(10, now=datetime.utcnow() - timedelta(hours=1))
+    started = []
+
+    def publish(content, db, dry_run=False):
+        started.append(content.dispatch_started_at)
+        return {"success": False, "message": "boom"}
+
+    with patch("app.services.post_dispatcher.get_rate_limiter", return_value=None), \
+         patch("app.services.post_dispatcher.publish_content", side_effect=publish):
+        post_dispatcher.dispatch_post(due)
+
+    assert started[0] > datetime.utcnow() - timedelta(minutes=1)
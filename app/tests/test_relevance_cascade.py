@@ -0,0 +1,153 @@
+# app/tests/test_relevance_cascade.py
+
+"""
+Unit tests for relevance_cascade.py and its use in research_agent.py
+Covers: BM25 scoring, LLM verdicts, stage order and rejection counters.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.agents.research_agent import run_verification_stage, summarise_candidate
+from app.services import relevance_cascade
+from app.services.relevance_cascade import bm25_scores, cascade_stats, is_relevant_verdict
+
+TOPIC = "AI diagnostics in medicine"
+SNIPPETS = [
+    "Hospitals are adopting AI diagnostics: models flag anomalies in medical scans before radiologists review them.",
+    "A short history of medicine in the nineteenth century, from anaesthesia to antiseptics.",
+    "The football club confirmed the transfer of its striker after a medical on Tuesday.",
+]
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats():
+    relevance_cascade.reset_cascade_stats()
+    yield
+    relevance_cascade.reset_cascade_stats()
+
+
+def test_bm25_ranks_on_topic_snippet_first():
+    scores = bm25_scores(TOPIC, SNIPPETS)
+
+    assert scores[0] > scores[1] > 0.0
+    assert scores[2] == 0.0
+    assert all(0.0 <= s <= 1.0 for s in scores)
+
+
+def test_bm25_prefix_stemming_matches_inflections():
+    assert bm25_scores("diagnosis", ["new diagnostic tools", "weather report"])[0] > 0.0
+
+
+def test_bm25_long_snippet_with_only_a_common_term_scores_low_but_nonzero():
+    # "medicine" is in most snippets (low IDF) and this one is long, so it
+    # normalises far below the on-topic page, but it still shares a topic term
+    long_snippet = "Medicine " + "and a lengthy aside about the history of the hospital building " * 6
+    scores = bm25_scores(TOPIC, SNIPPETS[:2] + [long_snippet, "medicine news"])
+
+    assert 0.0 < scores[2] < 0.05
+
+
+def test_bm25_edge_cases():
+    assert bm25_scores(TOPIC, []) == []
+    assert bm25_scores("the of and", ["anything"]) == [0.0]
+
+
+@pytest.mark.parametrize("verdict,expected", [
+    ("Relevant: covers AI diagnostics in hospitals.", True),
+    ("  relevant. Covers AI diagnostics.", True),
+    ("Not relevant.", False),
+    ("Not relevant: a football transfer story.", False),
+    ("Irrelevant", False),
+    ("No, this is not directly relevant", False),
+    ("Highly relevant: covers AI diagnostics in hospitals.", False),
+    ("Unknown", False),
+    ("", False),
+])
+def test_llm_verdict(verdict, expected):
+    assert is_relevant_verdict(verdict) is expected
+
+
+def _fetched(source, *args):
+    return {"outcome": "fetched", "meta": {"title": "t", "snippet": source["snippet"]}}
+
+
+@pytest.fixture(autouse=True)
+def batch_summaries():
+    with patch("app.agents.research_agent.summarise_sources", side_effect=lambda texts: [("s", ["p"])] * len(texts)) as mock:
+        yield mock
+
+
+def _verified(source, fetched, topic, cancel_event):
+    return {"outcome": "verified", "meta": fetched["meta"], "relevance_score": fetched["relevance_score"]}
+
+
+@patch("app.agents.research_agent.judge_candidate", side_effect=_verified)
+@patch("app.agents.research_agent.score_texts_against")
+@patch("app.agents.research_agent.fetch_candidate", side_effect=_fetched)
+def test_lexical_rejects_before_embedding(mock_fetch, mock_score, mock_summarise):
+    mock_score.side_effect = lambda q, texts: [0.9 if "AI" in t else 0.1 for t in texts]
+    candidates = [{"url": f"https://example.com/{i}", "snippet": s} for i, s in enumerate(SNIPPETS)]
+
+    results = run_verification_stage(candidates, TOPIC, limit=3, max_workers=1)
+
+    # The football page never reaches the embedding call
+    assert mock_score.call_args.args[1] == SNIPPETS[:2]
+    assert [results[i]["outcome"] for i in range(3)] == ["verified", "skipped", "skipped"]
+    assert mock_summarise.call_count == 1
+
+    stages = cascade_stats()["stages"]
+    assert stages["lexical"] == {"evaluated": 3, "rejected": 1}
+    assert stages["embedding"] == {"evaluated": 2, "rejected": 1}
+
+
+@patch("app.agents.research_agent.judge_candidate", side_effect=_verified)
+@patch("app.agents.research_agent.score_texts_against", side_effect=lambda q, texts: [0.9] * len(texts))
+@patch("app.agents.research_agent.fetch_candidate", side_effect=_fetched)
+def test_lexical_keeps_any_snippet_sharing_a_topic_term(mock_fetch, mock_score, mock_summarise):
+    long_snippet = "Medicine " + "and a lengthy aside about the history of the hospital building " * 6
+    snippets = SNIPPETS[:2] + [long_snippet, "medicine news", SNIPPETS[2]]
+    candidates = [{"url": f"https://example.com/{i}", "snippet": s} for i, s in enumerate(snippets)]
+
+    results = run_verification_stage(candidates, TOPIC, limit=5, max_workers=1)
+
+    # The long snippet scores under 0.05 but still reaches the embedding call
+    assert mock_score.call_args.args[1] == snippets[:4]
+    assert [results[i]["outcome"] for i in range(5)] == ["verified"] * 4 + ["skipped"]
+
+
+@patch("app.agents.research_agent.judge_candidate", side_effect=_verified)
+@patch("app.agents.research_agent.score_texts_against", side_effect=lambda q, texts: [0.9] * len(texts))
+@patch("app.agents.research_agent.fetch_candidate", side_effect=_fetched)
+def test_lexical_abstains_when_no_snippet_shares_a_term(mock_fetch, mock_score, mock_summarise):
+    snippets = ["Machine learning reads scans.", "Football transfer news."]
+    candidates = [{"url": f"https://example.com/{i}", "snippet": s} for i, s in enumerate(snippets)]
+
+    run_verification_stage(candidates, TOPIC, limit=2, max_workers=1)
+
+    assert mock_score.call_args.args[1] == snippets
+    assert cascade_stats()["stages"]["lexical"] == {"evaluated": 2, "rejected": 0}
+
+
+@patch("app.agents.research_agent.generate_completion")
+@patch("app.agents.research_agent.check_relevance_with_ai", return_value="Not relevant")
+def test_llm_verdict_rejects_before_summary(mock_relevance, mock_completion):
+    fetched = {"meta": {"snippet": SNIPPETS[1]}, "relevance_score": 0.8}
+
+    result = summarise_candidate({"url": "https://example.com"}, fetched, TOPIC)
+
+    assert result["outcome"] == "skipped"
+    assert not mock_completion.called
+    assert cascade_stats()["stages"]["llm"] == {"evaluated": 1, "rejected": 1}
+
+
+@patch("app.agents.research_agent.generate_completion", return_value="Summary: s\nKey Points:\n- p")
+@patch("app.agents.research_agent.check_relevance_with_ai", return_value="Not relevant")
+def test_llm_verdict_can_be_ignored(mock_relevance, mock_completion):
+    fetched = {"meta": {"snippet": SNIPPETS[1]}, "relevance_score": 0.8}
+
+    with patch("app.agents.research_agent.settings.cascade_llm_verdict", False):
+        result = summarise_candidate({"url": "https://example.com"}, fetched, TOPIC)
+
+    assert result["outcome"] == "verified"
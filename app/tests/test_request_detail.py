@@ -0,0 +1,90 @@
+# app/tests/test_request_detail.py
+
+"""
+Unit tests for services/request_detail.py
+Covers: ETag caching, 304 without a query, invalidation on commit.
+"""
+
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.requests import Request
+from app.services import request_detail
+from app.services.request_detail import cached_detail_etag, etag_matches, get_request_detail
+
+TEST_DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+PAYLOAD = {"success": True, "data": {"request": {"id": 1, "status": "pending"}}}
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    request_detail.clear_request_detail_cache()
+    yield
+    request_detail.clear_request_detail_cache()
+
+
+def test_fresh_entry_is_served_without_query():
+    with patch("app.services.request_detail.load_request_detail", return_value=PAYLOAD) as load:
+        first, etag = get_request_detail(None, 1, 1)
+        second, same_etag = get_request_detail(None, 1, 1)
+
+    assert load.call_count == 1
+    assert first == second and etag == same_etag
+    assert cached_detail_etag(1, 1) == etag
+    assert cached_detail_etag(1, 2) is None
+
+
+def test_expired_entry_is_reloaded():
+    with patch("app.services.request_detail.load_request_detail", return_value=PAYLOAD) as load, \
+         patch("app.services.request_detail.settings.request_detail_cache_ttl_seconds", -1):
+        get_request_detail(None, 1, 1)
+        get_request_detail(None, 1, 1)
+
+    assert load.call_count == 2
+    assert cached_detail_etag(1, 1) is None
+
+
+def test_missing_request_is_not_cached():
+    with patch("app.services.request_detail.load_request_detail", return_value=None):
+        assert get_request_detail(None, 5, 1) == (None, None)
+    assert cached_detail_etag(5, 1) is None
+
+
+def test_etag_changes_with_payload():
+    changed = {"success": True, "data": {"request": {"id": 1, "status": "completed"}}}
+    assert request_detail.compute_etag(PAYLOAD) != request_detail.compute_etag(changed)
+
+
+def test_etag_matching():
+    etag = 'W/"abc"'
+    assert etag_matches('W/"abc"', etag)
+    assert etag_matches('"xyz", "abc"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('W/"xyz"', etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('W/"abc"', None)
+
+
+def test_commit_touching_request_invalidates_cache():
+    Request.__table__.create(bind=engine)
+    db = TestingSessionLocal()
+    try:
+        db.add(Request(id=1, user_id=1, original_topic="T", content_type="thread", status="pending"))
+        db.commit()
+
+        with patch("app.services.request_detail.load_request_detail", return_value=PAYLOAD):
+            get_request_detail(db, 1, 1)
+        assert cached_detail_etag(1, 1)
+
+        db.query(Request).filter_by(id=1).first().status = "completed"
+        db.commit()
+        assert cached_detail_etag(1, 1) is None
+    finally:
+        db.close()
+        Request.__table__.drop(bind=engine)
@@ -0,0 +1,164 @@
+# app/tests/test_research_verification.py
+
+"""
+Unit tests for the concurrent verification stage in research_agent.py
+Covers: early stop at limit, batched scoring, candidate ordering, cancellation.
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.agents.research_agent import run_verification_stage, fetch_candidate, summarise_candidate
+
+
+def _candidates(n):
+    return [{"url": f"https://example.com/{i}", "source": "google"} for i in range(n)]
+
+
+def _fetched(source, *args):
+    return {"outcome": "fetched", "meta": {"title": "t", "snippet": source["url"]}}
+
+
+@pytest.fixture(autouse=True)
+def batch_summaries():
+    with patch("app.agents.research_agent.summarise_sources", side_effect=lambda texts: [("s", ["p"])] * len(texts)) as mock:
+        yield mock
+
+
+def _verified(source, fetched, topic, cancel_event):
+    time.sleep(0.02)
+    return {"outcome": "verified", "url": source["url"], "meta": fetched["meta"], "relevance_score": fetched["relevance_score"]}
+
+
+# --- Stops once enough sources have passed ---
+@patch("app.agents.research_agent.judge_candidate", side_effect=_verified)
+@patch("app.agents.research_agent.score_texts_against", side_effect=lambda q, texts: [0.9] * len(texts))
+@patch("app.agents.research_agent.fetch_candidate", side_effect=_fetched)
+def test_verification_stops_at_limit(mock_fetch, mock_score, mock_summarise, batch_summaries):
+    results = run_verification_stage(_candidates(10), "AI in education", limit=2, max_workers=1)
+
+    verified = [r for r in results.values() if r["outcome"] == "verified"]
+    assert len(verified) == 2
+    assert mock_summarise.call_count < 10
+    # Both verified sources are summarised together
+    assert batch_summaries.call_count == 1
+    assert len(batch_summaries.call_args.args[0]) == 2
+    assert all(r["summary"] == "s" for r in verified)
+
+
+# --- A source that could not be summarised is dropped, not fatal ---
+@patch("app.agents.research_agent.judge_candidate", side_effect=_verified)
+@patch("app.agents.research_agent.score_texts_against", side_effect=lambda q, texts: [0.9] * len(texts))
+@patch("app.agents.research_agent.fetch_candidate", side_effect=_fetched)
+def test_unsummarised_source_is_dropped(mock_fetch, mock_score, mock_summarise, batch_summaries):
+    batch_summaries.side_effect = lambda texts: [None] + [("s", ["p"])] * (len(texts) - 1)
+
+    with patch("app.agents.research_agent.summarise_fallback", return_value=None):
+        results = run_verification_stage(_candidates(2), "AI in education", limit=2, max_workers=1)
+
+    assert [r["outcome"] for _, r in sorted(results.items())] == ["skipped", "verified"]
+
+
+# --- Sources a batch missed are summarised one by one on the worker pool ---
+@patch("app.agents.research_agent.judge_candidate", side_effect=_verified)
+@patch("app.agents.research_agent.score_texts_against", side_effect=lambda q, texts: [0.9] * len(texts))
+@patch("app.agents.research_agent.fetch_candidate", side_effect=_fetched)
+def test_batch_misses_fall_back_in_parallel(mock_fetch, mock_score, mock_summarise, batch_summaries):
+    batch_summaries.side_effect = lambda texts: [None] * len(texts)
+    barrier = threading.Barrier(3, timeout=2)
+
+    def fallback(text, cancel_event):
+        barrier.wait()  # Only passes if all three run at once
+        return ("fallback", [text])
+
+    with patch("app.agents.research_agent.summarise_fallback", side_effect=fallback):
+        results = run_verification_stage(_candidates(3), "AI in education", limit=3, max_workers=3)
+
+    assert all(r["outcome"] == "verified" and r["summary"] == "fallback" for r in results.values())
+
+
+# --- Topic and all snippets are scored in one batch ---
+@patch("app.agents.research_agent.judge_candidate", side_effect=_verified)
+@patch("app.agents.research_agent.score_texts_against")
+@patch("app.agents.research_agent.fetch_candidate", side_effect=_fetched)
+def test_snippets_scored_in_one_batch(mock_fetch, mock_score, mock_summarise):
+    mock_score.side_effect = lambda q, texts: [0.9 if t.endswith("/1") else 0.1 for t in texts]
+
+    results = run_verification_stage(_candidates(4), "AI in education", limit=2, max_workers=4)
+
+    assert mock_score.call_count == 1
+    assert mock_score.call_args.args[1] == [f"https://example.com/{i}" for i in range(4)]
+    assert results[1]["outcome"] == "verified"
+    assert [results[i]["outcome"] for i in (0, 2, 3)] == ["skipped"] * 3
+
+
+# --- Results are keyed by candidate index regardless of completion order ---
+@patch("app.agents.research_agent.score_texts_against", return_value=[])
+@patch("app.agents.research_agent.fetch_candidate")
+def test_verification_results_keyed_by_candidate_index(mock_fetch, mock_score):
+    def slow_first(source, *args):
+        if source["url"].endswith("/0"):
+            time.sleep(0.05)
+        return {"outcome": "skipped", "url": source["url"]}
+
+    mock_fetch.side_effect = slow_first
+    candidates = _candidates(4)
+
+    results = run_verification_stage(candidates, "AI in education", limit=2, max_workers=4)
+
+    assert sorted(results) == [0, 1, 2, 3]
+    for idx, result in results.items():
+        assert result["url"] == candidates[idx]["url"]
+
+
+# --- A set cancel event short-circuits before any network or LLM call ---
+@patch("app.agents.research_agent.fetch_page")
+def test_fetch_candidate_respects_cancel_event(mock_fetch):
+    cancel_event = threading.Event()
+    cancel_event.set()
+
+    result = fetch_candidate({"url": "https://example.com"}, cancel_event)
+
+    assert result["outcome"] == "cancelled"
+    assert not mock_fetch.called
+
+
+@patch("app.agents.research_agent.check_relevance_with_ai")
+def test_summarise_candidate_respects_cancel_event(mock_relevance):
+    cancel_event = threading.Event()
+    cancel_event.set()
+    fetched = {"meta": {"snippet": "text"}, "relevance_score": 0.9}
+
+    result = summarise_candidate({"url": "https://example.com"}, fetched, "AI", cancel_event)
+
+    assert result["outcome"] == "cancelled"
+    assert not mock_relevance.called
+
+
+# --- Redirect and near-duplicate copies are dropped before scoring ---
+@patch("app.agents.research_agent.judge_candidate", side_effect=_verified)
+@patch("app.agents.research_agent.score_texts_against", side_effect=lambda q, texts: [0.9] * len(texts))
+@patch("app.agents.research_agent.fetch_candidate")
+def test_duplicates_collapsed_before_scoring(mock_fetch, mock_score, mock_summarise):
+    article = ("Researchers trained a deep learning model on two million chest x-rays and found it "
+               "matched radiologists at spotting early signs of lung cancer in screening programmes.")
+    pages = {
+        "https://example.com/0": ("https://news.example.com/story", article),
+        "https://example.com/1": ("http://www.news.example.com/story/amp", "Different text entirely about football."),
+        "https://example.com/2": ("https://mirror.example.org/copy", article + " Share this."),
+        "https://example.com/3": ("https://example.com/3", "A separate article on renewable energy adoption."),
+    }
+
+    def fetch(source, *args):
+        final_url, snippet = pages[source["url"]]
+        return {"outcome": "fetched", "meta": {"title": "t", "snippet": snippet}, "final_url": final_url}
+
+    mock_fetch.side_effect = fetch
+
+    results = run_verification_stage(_candidates(4), "AI in medicine", limit=4, max_workers=2)
+
+    assert mock_score.call_args.args[1] == [article, pages["https://example.com/3"][1]]
+    assert [results[i]["outcome"] for i in range(4)] == ["verified", "skipped", "skipped", "verified"]
@@ -0,0 +1,205 @@
+# app/tests/test_source_discovery.py
+
+"""
+Unit tests for source_discovery.py and google_search.py
+Covers: concurrent providers, per-provider timeouts, parallel Google pages,
+provider registry, result cache, arXiv parsing, offline fixture provider.
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import pytest
+
+from app.services import google_search, source_discovery
+from app.services.source_discovery import (
+    DiscoveryProvider,
+    LocalFixtureProvider,
+    discover_sources,
+    get_discovery_provider,
+    parse_arxiv_feed,
+)
+
+
+class FakeProvider(DiscoveryProvider):
+    def __init__(self, name, result=None, delay=0.0, timeout=5, error=None):
+        self.name = name
+        self.result = result or []
+        self.delay = delay
+        self._timeout = timeout
+        self.error = error
+        self.calls = 0
+
+    @property
+    def timeout(self):
+        return self._timeout
+
+    def search(self, content_topic, limit, preference):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [dict(r) for r in self.result]
+
+
+@pytest.fixture(autouse=True)
+def empty_result_cache():
+    source_discovery.result_cache.clear()
+    yield
+    source_discovery.result_cache.clear()
+
+
+@contextmanager
+def _use(*providers):
+    by_name = {p.name: p for p in providers}
+    with patch("app.services.source_discovery.get_discovery_provider", side_effect=by_name.__getitem__), \
+         patch("app.services.source_discovery.settings.discovery_providers", ",".join(by_name)):
+        yield
+
+
+def test_providers_run_concurrently_in_order():
+    ai = FakeProvider("ai", [{"url": "https://a"}], delay=0.2)
+    google = FakeProvider("google", [{"url": "https://g"}], delay=0.2)
+    with _use(ai, google):
+        start = time.monotonic()
+        sources = discover_sources("AI", 2)
+        elapsed = time.monotonic() - start
+
+    assert [s["url"] for s in sources] == ["https://a", "https://g"]
+    assert elapsed < 0.35
+
+
+def test_slow_provider_is_dropped_at_its_timeout():
+    ai = FakeProvider("ai", [{"url": "https://a"}], delay=1.0, timeout=0.1)
+    google = FakeProvider("google", [{"url": "https://g"}])
+    with _use(ai, google):
+        start = time.monotonic()
+        sources = discover_sources("AI", 2)
+
+    assert [s["url"] for s in sources] == ["https://g"]
+    assert time.monotonic() - start < 0.5
+
+
+def test_failing_provider_adds_nothing():
+    ai = FakeProvider("ai", error=RuntimeError("quota"))
+    google = FakeProvider("google", [{"url": "https://g"}])
+    with _use(ai, google):
+        assert discover_sources("AI", 2) == [{"url": "https://g"}]
+
+
+def test_repeat_queries_are_served_from_cache():
+    google = FakeProvider("google", [{"url": "https://g"}])
+    with _use(google):
+        first = discover_sources("AI in  Medicine", 2)
+        first[0]["url"] = "mutated by caller"
+        second = discover_sources("ai in medicine", 2)
+        discover_sources("ai in medicine", 5)
+
+    assert second == [{"url": "https://g"}]
+    assert google.calls == 2  # the limit=5 query is a different key
+
+
+def test_failures_and_empty_results_are_not_cached():
+    empty = FakeProvider("google", [])
+    with _use(empty):
+        discover_sources("AI", 2)
+        discover_sources("AI", 2)
+    assert empty.calls == 2
+
+
+def test_registry_returns_shared_instances():
+    assert get_discovery_provider("arxiv") is get_discovery_provider("arxiv")
+    with pytest.raises(ValueError):
+        get_discovery_provider("bing")
+
+
+def test_local_fixture_provider_ranks_by_overlap(tmp_path):
+    fixture = tmp_path / "sources.json"
+    fixture.write_text(json.dumps([
+        {"title": "Football transfers", "url": "https://f", "snippet": "striker signs"},
+        {"title": "AI in medicine", "url": "https://m", "snippet": "diagnosis with artificial intelligence"},
+        {"title": "Medicine costs", "url": "https://c", "snippet": "drug prices"},
+    ]))
+    provider = LocalFixtureProvider(str(fixture))
+
+    results = provider.search("AI in medicine", 5, "balanced")
+
+    assert [r["url"] for r in results] == ["https://m", "https://c"]
+    assert results[0]["source"] == "local"
+
+
+def test_bundled_fixture_loads():
+    with patch("app.services.source_discovery.store_page"):
+        assert LocalFixtureProvider().search("artificial intelligence in healthcare", 2, "balanced")
+
+
+def test_local_fixture_pages_are_served_from_the_page_cache(tmp_path):
+    (tmp_path / "m.html").write_text(
+        "<html><head><title>AI in medicine</title></head><body><p>Models flag anomalies in scans.</p></body></html>"
+    )
+    fixture = tmp_path / "sources.json"
+    fixture.write_text(json.dumps([
+        {"title": "AI in medicine", "url": "https://m", "snippet": "diagnosis", "page": "m.html"},
+    ]))
+
+    with patch("app.services.source_discovery.store_page") as store:
+        results = LocalFixtureProvider(str(fixture)).search("AI in medicine", 5, "balanced")
+
+    assert "page" not in results[0]
+    url, page = store.call_args.args
+    assert url == "https://m" and page["accessible"]
+    assert "Models flag anomalies" in page["metadata"]["snippet"]
+
+
+def test_parse_arxiv_feed():
+    feed = """<?xml version="1.0"?>
+    <feed xmlns="http://www.w3.org/2005/Atom">
+      <entry>
+        <id>http://arxiv.org/abs/1706.03762v7</id>
+        <published>2017-06-12T17:57:34Z</published>
+        <title>Attention Is All
+          You Need</title>
+        <summary>The dominant sequence transduction models...</summary>
+        <author><name>Ashish Vaswani</name></author>
+        <author><name>Noam Shazeer</name></author>
+      </entry>
+    </feed>"""
+
+    [source] = parse_arxiv_feed(feed)
+
+    assert source["url"] == "http://arxiv.org/abs/1706.03762v7"
+    assert source["title"] == "Attention Is All You Need"
+    assert source["authors"] == "Ashish Vaswani, Noam Shazeer"
+    assert source["date"] == "2017-06-12"
+
+
+def _page(query, start, num):
+    time.sleep(0.1)
+    return [{"link": f"https://r/{start + i}", "title": "t", "snippet": "s"} for i in range(num)]
+
+
+@patch.multiple("app.services.google_search", GOOGLE_API_KEY="k", GOOGLE_CSE_ID="cx")
+def test_google_pages_fetched_in_parallel():
+    with patch("app.services.google_search._fetch_page", side_effect=_page) as fetch:
+        start = time.monotonic()
+        results = google_search.get_google_search_results("AI", limit=25)
+        elapsed = time.monotonic() - start
+
+    assert sorted(c.args[1:] for c in fetch.call_args_list) == [(1, 10), (11, 10), (21, 5)]
+    assert [r["url"] for r in results] == [f"https://r/{i}" for i in range(1, 26)]
+    assert elapsed < 0.25
+
+
+@patch.multiple("app.services.google_search", GOOGLE_API_KEY="k", GOOGLE_CSE_ID="cx")
+def test_google_results_stop_at_failed_page():
+    def flaky(query, start, num):
+        if start == 11:
+            raise RuntimeError("429")
+        return _page(query, start, num)
+
+    with patch("app.services.google_search._fetch_page", side_effect=flaky):
+        results = google_search.get_google_search_results("AI", limit=30)
+
+    assert len(results) == 10
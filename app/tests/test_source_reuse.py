@@ -0,0 +1,200 @@
+# app/tests/test_source_reuse.py
+
+"""
+Unit tests for source_reuse.py
+Covers: batched usage prefetch, single-statement upsert, threshold checks,
+overused-key cache and write-behind buffer.
+"""
+
+import threading
+from collections import Counter
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import sessionmaker
+
+from app.models.topic_source_usage import TopicSourceUsage
+from app.utils.hash import hash_string
+from app.services.source_reuse import (
+    SOURCE_REUSE_THRESHOLD,
+    OverusedKeys,
+    UsageBuffer,
+    buffer_source_usage,
+    fetch_usage_counts,
+    get_usage_counts,
+    is_overused_count,
+    record_source_usage,
+)
+
+TEST_DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+TOPIC = "AI in medicine"
+URLS = [f"https://example.com/{i}" for i in range(5)]
+
+
+@pytest.fixture
+def db():
+    TopicSourceUsage.__table__.create(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        TopicSourceUsage.__table__.drop(bind=engine)
+
+
+@pytest.fixture
+def statements():
+    seen = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    yield seen
+    event.remove(engine, "before_cursor_execute", count)
+
+
+def test_unused_urls_count_zero(db):
+    assert fetch_usage_counts(db, 1, TOPIC, URLS[:2]) == {URLS[0]: 0, URLS[1]: 0}
+    assert fetch_usage_counts(db, 1, TOPIC, []) == {}
+
+
+def test_prefetch_is_one_query(db, statements):
+    record_source_usage(db, 1, TOPIC, URLS)
+    db.commit()
+    statements.clear()
+
+    counts = fetch_usage_counts(db, 1, TOPIC, URLS)
+
+    assert counts == {url: 1 for url in URLS}
+    assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 1
+
+
+def test_upsert_is_one_statement_and_accumulates(db, statements):
+    record_source_usage(db, 1, TOPIC, URLS)
+    db.commit()
+    statements.clear()
+
+    record_source_usage(db, 1, TOPIC, [URLS[0], URLS[0], URLS[1]])
+    db.commit()
+
+    assert len([s for s in statements if s.lstrip().upper().startswith("INSERT")]) == 1
+    counts = fetch_usage_counts(db, 1, TOPIC, URLS[:3])
+    assert counts == {URLS[0]: 3, URLS[1]: 2, URLS[2]: 1}
+    assert db.query(TopicSourceUsage).count() == len(URLS)
+
+
+def test_counts_are_scoped_to_user_and_topic(db):
+    record_source_usage(db, 1, TOPIC, URLS[:1])
+    db.commit()
+
+    assert fetch_usage_counts(db, 2, TOPIC, URLS[:1]) == {URLS[0]: 0}
+    assert fetch_usage_counts(db, 1, "Other topic", URLS[:1]) == {URLS[0]: 0}
+
+
+def test_legacy_raw_url_counts_still_apply(db):
+    raw = "http://www.example.com/story?utm_source=feed"
+    db.add(TopicSourceUsage(
+        user_id=1, content_topic_hash=hash_string(TOPIC), source_url_hash=hash_string(raw), usage_count=2
+    ))
+    db.commit()
+    record_source_usage(db, 1, TOPIC, ["https://example.com/story"])
+    db.commit()
+
+    assert fetch_usage_counts(db, 1, TOPIC, [raw]) == {raw: 3}
+    assert fetch_usage_counts(db, 1, TOPIC, ["https://example.com/story"]) == {"https://example.com/story": 1}
+
+
+def test_rollback_discards_increments(db):
+    record_source_usage(db, 1, TOPIC, URLS[:1])
+    db.rollback()
+
+    assert fetch_usage_counts(db, 1, TOPIC, URLS[:1]) == {URLS[0]: 0}
+
+
+def test_threshold():
+    assert not is_overused_count(SOURCE_REUSE_THRESHOLD - 1)
+    assert is_overused_count(SOURCE_REUSE_THRESHOLD)
+
+
+# --------------------------
+# Per-process cache and write-behind buffer
+# --------------------------
+
+@pytest.fixture
+def file_db(tmp_path):
+    file_engine = create_engine(f"sqlite:///{tmp_path / 'reuse.db'}", connect_args={"check_same_thread": False})
+    TopicSourceUsage.__table__.create(bind=file_engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=file_engine)
+    yield factory
+    file_engine.dispose()
+
+
+@pytest.fixture
+def buffer(file_db):
+    usage_buffer = UsageBuffer(file_db, flush_interval=3600, flush_batch_size=1000)
+    overused = OverusedKeys(max_size=100)
+    with patch("app.services.source_reuse.usage_buffer", usage_buffer), \
+         patch("app.services.source_reuse.overused_keys", overused):
+        yield usage_buffer
+
+
+def test_pending_increments_count_before_flush(file_db, buffer):
+    db = file_db()
+    for _ in range(SOURCE_REUSE_THRESHOLD):
+        buffer_source_usage(1, TOPIC, URLS[:1])
+
+    assert fetch_usage_counts(db, 1, TOPIC, URLS[:1]) == {URLS[0]: 0}
+    assert get_usage_counts(db, 1, TOPIC, URLS[:1]) == {URLS[0]: SOURCE_REUSE_THRESHOLD}
+
+    assert buffer.flush() == 1
+    assert fetch_usage_counts(db, 1, TOPIC, URLS[:1]) == {URLS[0]: SOURCE_REUSE_THRESHOLD}
+    db.close()
+
+
+def test_overused_verdict_skips_the_db(file_db, buffer):
+    db = file_db()
+    buffer_source_usage(1, TOPIC, [URLS[0]] * SOURCE_REUSE_THRESHOLD)
+    buffer.flush()
+    get_usage_counts(db, 1, TOPIC, URLS[:2])
+
+    with patch("app.services.source_reuse.fetch_usage_counts", wraps=fetch_usage_counts) as fetch:
+        counts = get_usage_counts(db, 1, TOPIC, URLS[:2])
+
+    # Only the URL below the threshold is re-read, since another worker may have used it
+    assert fetch.call_args.args[3] == [URLS[1]]
+    assert is_overused_count(counts[URLS[0]]) and counts[URLS[1]] == 0
+    db.close()
+
+
+def test_concurrent_writers_match_direct_upserts(file_db, buffer):
+    def worker():
+        for _ in range(25):
+            buffer_source_usage(1, TOPIC, URLS)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    flusher = threading.Thread(target=lambda: [buffer.flush() for _ in range(20)])
+    for t in threads + [flusher]:
+        t.start()
+    for t in threads + [flusher]:
+        t.join()
+    buffer.flush()
+
+    db = file_db()
+    assert fetch_usage_counts(db, 1, TOPIC, URLS) == {url: 100 for url in URLS}
+    db.close()
+
+
+def test_failed_flush_keeps_increments(file_db):
+    broken = UsageBuffer(file_db, flush_interval=3600, flush_batch_size=1000)
+    broken.add(Counter({(1, "t", "u"): 2}))
+    with patch("app.services.source_reuse.upsert_usage", side_effect=SQLAlchemyError("down")):
+        assert broken.flush() == 0
+    assert broken.pending((1, "t", "u")) == 2
+    assert broken.flush() == 1
@@ -0,0 +1,93 @@
+# app/tests/test_source_verification.py
+
+"""
+Unit tests for source_verification.py
+Covers: single-fetch page pipeline (status, metadata, body cap)
+"""
+
+from unittest.mock import patch, MagicMock
+
+import pytest
+import requests
+
+from app.services.source_verification import fetch_page, parse_page_metadata
+
+HTML = (
+    b"<html><head><title>AI in Schools</title>"
+    b"<meta name='description' content='How AI tutors help'></head>"
+    b"<body><p>First paragraph.</p><p>Second paragraph.</p></body></html>"
+)
+
+
+@pytest.fixture(autouse=True)
+def no_page_cache():
+    with patch("app.services.source_verification.settings.enable_page_cache", False):
+        yield
+
+
+def _mock_response(status_code=200, body=HTML, url="https://example.com/final"):
+    response = MagicMock()
+    response.status_code = status_code
+    response.url = url
+    response.headers = {"Content-Type": "text/html"}
+    response.iter_content.return_value = [body[i:i + 16] for i in range(0, len(body), 16)]
+    response.__enter__.return_value = response
+    return response
+
+
+# --- One request returns status and metadata together ---
+@patch("app.services.source_verification.http_session")
+def test_fetch_page_success(mock_session):
+    mock_session.get.return_value = _mock_response()
+
+    page = fetch_page("https://example.com")
+
+    assert mock_session.get.call_count == 1
+    assert mock_session.get.call_args.kwargs["stream"] is True
+    assert page["accessible"] is True
+    assert page["status"] == "OK"
+    assert page["final_url"] == "https://example.com/final"
+    assert page["metadata"]["title"] == "AI in Schools"
+    assert "Second paragraph." in page["metadata"]["snippet"]
+
+
+# --- HTTP errors are reported without parsing ---
+@patch("app.services.source_verification.http_session")
+def test_fetch_page_http_error(mock_session):
+    mock_session.get.return_value = _mock_response(status_code=404)
+
+    page = fetch_page("https://example.com/missing")
+
+    assert page["accessible"] is False
+    assert page["status"] == "HTTP 404"
+    assert page["metadata"] == {}
+
+
+# --- Network errors map to the legacy status string ---
+@patch("app.services.source_verification.http_session")
+def test_fetch_page_request_error(mock_session):
+    mock_session.get.side_effect = requests.exceptions.ConnectTimeout("timed out")
+
+    page = fetch_page("https://slow.example.com")
+
+    assert page["accessible"] is False
+    assert page["status"].startswith("Request error:")
+
+
+# --- Only the first max_bytes of the body are read ---
+@patch("app.services.source_verification.http_session")
+def test_fetch_page_caps_body(mock_session):
+    response = _mock_response()
+    mock_session.get.return_value = response
+
+    with patch("app.services.source_verification.parse_page_metadata") as mock_parse:
+        mock_parse.return_value = {"title": "", "description": "", "snippet": ""}
+        fetch_page("https://example.com", max_bytes=32)
+
+    assert len(mock_parse.call_args.args[0]) == 32
+
+
+def test_parse_page_metadata_handles_missing_title():
+    meta = parse_page_metadata("<html><body><p>Only text</p></body></html>")
+    assert meta["title"] == ""
+    assert "Only text" in meta["snippet"]
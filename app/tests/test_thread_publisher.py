@@ -0,0 +1,125 @@
+# app/tests/test_thread_publisher.py
+
+"""
+Unit tests for services/thread_publisher.py and X posting in publish_content()
+Covers: reply chaining, resume after partial failure, rate-limit deferral.
+"""
+
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.content_queue import ContentQueue
+from app.models.thread_metadata import ThreadMetadata
+from app.models.user_configurations import UserConfiguration
+from app.services import thread_publisher
+from app.services.content_queue import post_content
+from app.services.platform_publisher import PublishError
+
+TEST_DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+TABLES = [ContentQueue.__table__, ThreadMetadata.__table__, UserConfiguration.__table__]
+
+
+@pytest.fixture
+def db():
+    for table in TABLES:
+        table.create(bind=engine)
+    thread_publisher._blocked_until.clear()
+    session = TestingSessionLocal()
+    session.add(UserConfiguration(user_id=1, x_access_token="token"))
+    content = ContentQueue(
+        id=1, request_id=1, user_id=1, content_type="thread", generated_content="a\n\nb\n\nc",
+        status="approved", platform="x"
+    )
+    session.add(content)
+    session.add(ThreadMetadata(
+        content_queue_id=1, requested_tweet_count=3, actual_tweet_count=3,
+        thread_structure=[{"tweet": "a"}, {"tweet": "b"}, {"tweet": "c"}]
+    ))
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+        for table in reversed(TABLES):
+            table.drop(bind=engine)
+
+
+def _poster(fail_on=None, error=None):
+    calls = []
+
+    def post(text, access_token, in_reply_to_id=None, idempotency_key=None, retry_rate_limits=True):
+        calls.append((text, in_reply_to_id))
+        if text == fail_on:
+            raise error
+        return {"platform_posted_id": f"id-{text}", "post_response": "{}"}
+    return calls, post
+
+
+def _structure(db):
+    db.expire_all()
+    return db.query(ThreadMetadata).filter_by(content_queue_id=1).one().thread_structure
+
+
+def test_thread_is_posted_as_reply_chain(db):
+    calls, post = _poster()
+    with patch("app.services.thread_publisher.post_to_x", side_effect=post):
+        result = post_content(1, db)
+
+    assert result["success"] is True
+    assert calls == [("a", None), ("b", "id-a"), ("c", "id-b")]
+    assert [e["tweet_id"] for e in _structure(db)] == ["id-a", "id-b", "id-c"]
+    assert db.get(ContentQueue, 1).platform_posted_id == "id-a"
+
+
+def test_partial_failure_resumes_from_last_posted(db):
+    calls, post = _poster(fail_on="b", error=PublishError("Twitter API error 500", status_code=500))
+    with patch("app.services.thread_publisher.post_to_x", side_effect=post):
+        result = post_content(1, db)
+
+    assert result["success"] is False
+    assert db.get(ContentQueue, 1).status == "partially_posted"
+    assert _structure(db)[0]["tweet_id"] == "id-a"
+
+    calls, post = _poster()
+    with patch("app.services.thread_publisher.post_to_x", side_effect=post):
+        assert post_content(1, db)["success"] is True
+    assert calls == [("b", "id-a"), ("c", "id-b")]
+
+
+def test_rate_limit_defers_instead_of_blocking(db):
+    calls, post = _poster(fail_on="a", error=PublishError("Twitter API error 429", status_code=429, retry_after=120))
+    with patch("app.services.thread_publisher.post_to_x", side_effect=post):
+        result = post_content(1, db)
+
+    content = db.get(ContentQueue, 1)
+    assert result["deferred"] is True
+    assert content.status == "scheduled"
+    assert content.scheduled_for is not None
+    # The user's window is remembered: no request is made until it resets
+    with patch("app.services.thread_publisher.post_to_x") as mock_post:
+        assert post_content(1, db)["deferred"] is True
+    assert not mock_post.called
+
+
+def test_missing_token_fails_cleanly(db):
+    db.query(UserConfiguration).delete()
+    db.commit()
+    with patch("app.services.thread_publisher.post_to_x") as mock_post:
+        result = post_content(1, db)
+    assert not mock_post.called
+    assert result["success"] is False
+    assert "access token" in result["error"]
+
+
+def test_config_response_hides_token(db):
+    from app.schemas.user_configurations import UserConfigOut
+
+    data = UserConfigOut.from_config(db.query(UserConfiguration).first()).dict()
+    assert data["x_account_connected"] is True
+    assert "token" not in data.values() and "x_access_token" not in data
@@ -0,0 +1,94 @@
+# app/tests/test_url_canonicalization.py
+
+"""
+Unit tests for utils/url.py canonicalize_url and utils/simhash.py
+Covers: scheme/host/AMP/tracking variants, query ordering, near-duplicate fingerprints.
+"""
+
+import pytest
+
+from app.config import settings
+from app.utils.simhash import hamming_distance, simhash
+from app.utils.url import canonicalize_url
+
+CANONICAL = "https://example.com/news/story"
+
+
+@pytest.mark.parametrize("variant", [
+    "http://example.com/news/story",
+    "https://www.example.com/news/story/",
+    "https://m.example.com/news/story",
+    "https://example.com/news/story/amp",
+    "https://example.com/amp/news/story",
+    "https://amp.example.com/news/story",
+    "https://EXAMPLE.com:443/news/story#comments",
+    "https://example.com/news/story?utm_source=twitter&utm_medium=social",
+    "https://example.com/news/story?fbclid=abc&amp=1",
+])
+def test_variants_share_canonical_form(variant):
+    assert canonicalize_url(variant) == CANONICAL
+
+
+def test_content_params_are_kept_and_sorted():
+    assert canonicalize_url("https://example.com/search?q=ai&page=2&utm_campaign=x") == \
+        "https://example.com/search?page=2&q=ai"
+
+
+def test_ref_param_is_kept():
+    # e.g. GitHub's ?ref= picks the branch whose file is shown
+    assert canonicalize_url("https://github.com/org/repo/blob/x.py?ref=v2") == \
+        "https://github.com/org/repo/blob/x.py?ref=v2"
+
+
+def test_distinct_paths_stay_distinct():
+    assert canonicalize_url("https://example.com/a") != canonicalize_url("https://example.com/b")
+    # Bare two-label hosts keep their prefix ("m.com" is a domain, not a mobile site)
+    assert canonicalize_url("https://m.com/x") == "https://m.com/x"
+
+
+def test_unparseable_url_returned_as_is():
+    assert canonicalize_url(" not a url ") == "not a url"
+
+
+ARTICLE = (
+    "Researchers at the university trained a deep learning model on two million chest x-rays "
+    "and found it matched radiologists at spotting early signs of lung cancer in screening programmes."
+)
+
+
+# Search-result style snippets. Copies of ARTICLE land 4-7 bits away; separate
+# articles on the same story or subject land 22+ bits away. The default of
+# 8 bits sits in that gap: 3-4 would miss truncated or lightly edited copies.
+NEAR_DUPLICATES = [
+    "Advertisement. " + ARTICLE + " Read more.",
+    ARTICLE + " - BBC News",
+    ARTICLE[:-30] + "...",
+    ARTICLE.replace("two million", "2 million"),
+]
+DISTINCT_SOURCES = [
+    "A deep learning model trained on two million chest x-rays matched radiologists at detecting "
+    "early lung cancer, university researchers said.",
+    "AI tools are being used in hospitals to read chest x-rays, flag early signs of lung cancer "
+    "and cut waiting times for screening results.",
+    "The NHS is trialling an AI system that screens chest x-rays for lung cancer, aiming to speed "
+    "up diagnosis for patients referred by their GP.",
+    "Researchers trained a new model on MRI scans and found it outperformed neurologists "
+    "at spotting early signs of dementia in older patients.",
+    "The football club confirmed the transfer of its striker after a medical on Tuesday evening.",
+]
+
+
+def test_simhash_near_duplicates_are_close():
+    assert hamming_distance(simhash(ARTICLE), simhash(ARTICLE)) == 0
+    for copy in NEAR_DUPLICATES:
+        assert hamming_distance(simhash(ARTICLE), simhash(copy)) <= settings.near_duplicate_max_distance
+
+
+def test_simhash_distinct_sources_are_far_apart():
+    for other in DISTINCT_SOURCES:
+        # Twice the threshold: a clear margin, not a near miss
+        assert hamming_distance(simhash(ARTICLE), simhash(other)) > 2 * settings.near_duplicate_max_distance
+
+
+def test_simhash_empty_text():
+    assert simhash("") == 0
@@ -0,0 +1,98 @@
+# app/utils/pagination.py
+"""
+Keyset pagination and field selection for listing endpoints.
+
+Pages are ordered by (sort column, id) and the cursor is an opaque token
+holding the last row's pair, so each page is a single index range scan no
+matter how deep the client has paged. Only the selected columns are queried;
+rows are returned as plain dicts rather than ORM objects.
+"""
+
+import base64
+import json
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(sort_value, row_id: int) -> str:
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps({"v": sort_value, "id": row_id}).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Returns (sort value, id) from a cursor. Raises HTTPException(400) if it is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        value = data["v"]
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        return value, int(data["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def select_fields(fields: str, allowed: dict, default: list[str]) -> list[str]:
+    """
+    Parses a comma-separated ?fields= value against the allowed columns.
+    "id" is always included.
+    """
+    if not fields:
+        names = list(default)
+    else:
+        names = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in names if f not in allowed]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+            )
+    return ["id"] + [f for f in dict.fromkeys(names) if f != "id"]
+
+
+def keyset_page(query_fn, allowed: dict, fields: list[str], sort_key: str, cursor: str = None,
+                limit: int = 50, descending: bool = False) -> tuple[list[dict], str]:
+    """
+    Runs one page of a column-only keyset query.
+
+    Args:
+        query_fn: Callable taking a list of columns and returning a filtered query
+        allowed (dict): Field name -> column
+        fields (list): Field names to return
+        sort_key (str): Field to order by (ties broken by id)
+        cursor (str): Cursor from the previous page, if any
+        limit (int): Page size, capped at MAX_PAGE_SIZE
+        descending (bool): Newest first
+
+    Returns:
+        tuple: (rows as dicts, next cursor or None)
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    sort_col, id_col = allowed[sort_key], allowed["id"]
+    columns = [allowed[f].label(f) for f in fields]
+    if sort_key not in fields:
+        columns.append(sort_col.label(sort_key))
+
+    query = query_fn(columns)
+    if cursor:
+        value, last_id = decode_cursor(cursor)
+        key = tuple_(sort_col, id_col)
+        query = query.filter(key < tuple_(value, last_id) if descending else key > tuple_(value, last_id))
+
+    order = (sort_col.desc(), id_col.desc()) if descending else (sort_col.asc(), id_col.asc())
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_more:
+        last = rows[-1]._mapping
+        next_cursor = encode_cursor(last[sort_key], last["id"])
+    return [{f: row._mapping[f] for f in fields} for row in rows], next_cursor
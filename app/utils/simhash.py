@@ -0,0 +1,40 @@
+# app/utils/simhash.py
+"""
+64-bit SimHash over word shingles, for spotting near-duplicate text
+(syndicated copies, AMP/mobile renderings, lightly edited reposts).
+Similar texts give fingerprints a small Hamming distance apart.
+"""
+
+import hashlib
+import re
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def simhash(text: str, shingle_size: int = 2) -> int:
+    """
+    Returns the 64-bit SimHash of a text's word shingles (0 for empty text).
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    if not tokens:
+        return 0
+    if len(tokens) < shingle_size:
+        shingles = [" ".join(tokens)]
+    else:
+        shingles = [" ".join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)]
+
+    weights = [0] * 64
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+        for bit in range(64):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
@@ -0,0 +1,70 @@
+# app/utils/url.py
+"""
+URL helpers shared by the research services.
+"""
+
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+def normalize_url(url: str) -> str:
+    """
+    Returns a stable form of a URL for use as a lookup key:
+    lowercases scheme and host, drops default ports and the fragment,
+    and strips a trailing slash from non-root paths.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+
+    path = parts.path or "/"
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/")
+
+    return urlunsplit((scheme, host, path, parts.query, ""))
+
+
+# Query parameters that only track the visit, never select content.
+# Bare "ref" is not here: some sites use it to pick the page (a git ref, a record id).
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "ref_src", "ref_url", "_hsenc", "_hsmi", "amp", "outputtype",
+})
+HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Returns the form used to decide whether two URLs are the same source.
+    On top of normalize_url(): https scheme, no www./m./mobile./amp. host
+    prefix, no AMP path segment, no utm_* or other tracking parameters, and
+    the remaining query parameters sorted.
+    Not for fetching: the result may not resolve.
+    """
+    parts = urlsplit(normalize_url(url))
+    if not parts.netloc:
+        return url.strip()
+
+    scheme = "https" if parts.scheme in ("http", "https") else parts.scheme
+
+    host = parts.netloc
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix) and host.count(".") > 1:
+            host = host[len(prefix):]
+            break
+
+    segments = [s for s in parts.path.split("/") if s]
+    if segments and segments[-1] in ("amp", "amp.html"):
+        segments.pop()
+    if segments and segments[0] == "amp":
+        segments.pop(0)
+    path = "/" + "/".join(segments)
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
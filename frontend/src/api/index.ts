@@ -18,10 +18,17 @@ export const submitTopic = async (payload: any) => {
   return response.data;
 };
 
+// The list is paged: follow X-Next-Cursor until the last page
 export const fetchContentRequests = async () => {
-  const response = await api.get("/content/requests");
-  if (!Array.isArray(response.data)) throw new Error("Invalid response");
-  return response.data;
+  const requests: any[] = [];
+  let cursor: string | undefined;
+  do {
+    const response = await api.get("/content/requests", { params: { limit: 200, cursor } });
+    if (!Array.isArray(response.data)) throw new Error("Invalid response");
+    requests.push(...response.data);
+    cursor = response.headers["x-next-cursor"];
+  } while (cursor);
+  return requests;
 };
 
 export const fetchUsageStats = async () => {
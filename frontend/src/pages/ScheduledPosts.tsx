@@ -39,26 +39,32 @@ function ScheduledPosts() {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
 
-  const fetchPosts = () => {
-    fetch("/content/queue/scheduled", {
-      headers: {
-        Authorization: `Bearer ${localStorage.getItem("token")}`,
-        "Content-Type": "application/json"
-      }
-    })
-      .then((res) => {
+  // The endpoint is paged: follow next_cursor until the last page
+  const fetchPosts = async () => {
+    try {
+      const all: ScheduledPost[] = [];
+      let cursor: string | null = null;
+      do {
+        const params = new URLSearchParams({ limit: "200" });
+        if (cursor) params.set("cursor", cursor);
+        const res = await fetch(`/content/queue/scheduled?${params}`, {
+          headers: {
+            Authorization: `Bearer ${localStorage.getItem("token")}`,
+            "Content-Type": "application/json"
+          }
+        });
         if (!res.ok) throw new Error("Failed to fetch scheduled posts");
-        return res.json();
-      })
-      .then((data) => {
-        setPosts(data.data || []);
-        setLoading(false);
-      })
-      .catch((err) => {
-        console.error(err);
-        setError("Unable to load scheduled posts.");
-        setLoading(false);
-      });
+        const data = await res.json();
+        all.push(...(data.data || []));
+        cursor = data.next_cursor || null;
+      } while (cursor);
+      setPosts(all);
+    } catch (err) {
+      console.error(err);
+      setError("Unable to load scheduled posts.");
+    } finally {
+      setLoading(false);
+    }
   };
 
   useEffect(() => {
@@ -0,0 +1,107 @@
+# scripts/benchmark_embeddings.py
+
+"""
+Benchmark for embedding backends used in research relevance scoring.
+
+Scores a fixed set of (topic, snippet) pairs with the local hashing backend
+and, when OPENAI_API_KEY is set, the remote OpenAI backend. Reports:
+- throughput (texts embedded per second)
+- agreement with the remote backend (Pearson / Spearman on scores, and how
+  often both backends make the same keep/reject decision at their thresholds)
+
+Usage:
+    python scripts/benchmark_embeddings.py [--repeat N]
+"""
+
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Root
+
+import numpy as np
+from app.config import settings
+from app.services.embedding_similarity import get_embedding_backend, cosine_similarity_matrix
+
+PAIRS = [
+    ("Impact of AI on education systems",
+     "Artificial intelligence is being used to personalise learning for students by adapting content to their pace."),
+    ("Impact of AI on education systems",
+     "Schools are piloting AI tutors that give pupils instant feedback on homework and reading."),
+    ("Impact of AI on education systems",
+     "The recipe calls for two cups of flour, sugar, butter and a pinch of salt baked for forty minutes."),
+    ("Impact of AI on education systems",
+     "Teachers report that generative AI tools change how essays are assessed in secondary education."),
+    ("Renewable energy adoption in Europe",
+     "Solar and wind generation overtook fossil fuels in the European Union electricity mix last year."),
+    ("Renewable energy adoption in Europe",
+     "Germany expanded offshore wind capacity while grid operators invested in storage for renewable energy."),
+    ("Renewable energy adoption in Europe",
+     "The football club confirmed the transfer of its striker after a medical on Tuesday."),
+    ("Renewable energy adoption in Europe",
+     "Heat pump sales in Europe rose sharply as households replaced gas boilers with renewable heating."),
+    ("AI in medical diagnostics",
+     "Deep learning models detect diabetic retinopathy in retinal scans with accuracy comparable to specialists."),
+    ("AI in medical diagnostics",
+     "Radiologists use machine learning to flag suspicious nodules on chest CT images for earlier diagnosis."),
+    ("AI in medical diagnostics",
+     "The city council approved a new bike lane network along the river embankment."),
+    ("AI in medical diagnostics",
+     "A hospital trial found AI triage reduced time to diagnosis for stroke patients arriving at emergency."),
+]
+
+
+def score_pairs(backend_name: str, repeat: int) -> tuple[np.ndarray, float]:
+    """
+    Embeds every topic and snippet with one backend (bypassing caches)
+    and returns (scores, texts per second).
+    """
+    backend = get_embedding_backend(backend_name)
+    texts = [t for pair in PAIRS for t in pair]
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        vectors = backend.embed(texts)
+    elapsed = time.perf_counter() - start
+
+    topics = np.array(vectors[0::2], dtype=np.float32)
+    snippets = np.array(vectors[1::2], dtype=np.float32)
+    scores = np.diag(cosine_similarity_matrix(topics, snippets))
+    return scores, (len(texts) * repeat) / elapsed
+
+
+def spearman(a: np.ndarray, b: np.ndarray) -> float:
+    ranks_a = np.argsort(np.argsort(a))
+    ranks_b = np.argsort(np.argsort(b))
+    return float(np.corrcoef(ranks_a, ranks_b)[0, 1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare embedding backends")
+    parser.add_argument("--repeat", type=int, default=20, help="Local embedding passes to time")
+    args = parser.parse_args()
+
+    local = get_embedding_backend("hashing")
+    local_scores, local_tps = score_pairs("hashing", args.repeat)
+    print(f"⚡ hashing: {local_tps:,.0f} texts/sec (threshold {local.relevance_threshold})")
+
+    if not settings.openai_api_key:
+        print("⚠️ OPENAI_API_KEY not set; skipping remote comparison.")
+        for (topic, snippet), score in zip(PAIRS, local_scores):
+            print(f"  {score:.2f}  {topic[:30]:<30} | {snippet[:60]}")
+        sys.exit(0)
+
+    remote = get_embedding_backend("openai")
+    remote_scores, remote_tps = score_pairs("openai", 1)
+    print(f"🌐 openai:  {remote_tps:,.1f} texts/sec (threshold {remote.relevance_threshold})")
+
+    local_keep = local_scores >= local.relevance_threshold
+    remote_keep = remote_scores >= remote.relevance_threshold
+    print(f"\n📈 Speed-up: {local_tps / remote_tps:,.0f}x")
+    print(f"🔗 Pearson:  {np.corrcoef(local_scores, remote_scores)[0, 1]:.3f}")
+    print(f"🔗 Spearman: {spearman(local_scores, remote_scores):.3f}")
+    print(f"✅ Decision agreement: {np.mean(local_keep == remote_keep):.0%}")
+
+    print("\n  local  remote  pair")
+    for (topic, snippet), ls, rs in zip(PAIRS, local_scores, remote_scores):
+        print(f"  {ls:.2f}   {rs:.2f}   {topic[:30]:<30} | {snippet[:50]}")
@@ -0,0 +1,151 @@
+# scripts/benchmark_indexes.py
+
+"""
+Benchmark for the composite and partial indexes on the hot query paths.
+
+Creates a throwaway Postgres schema, seeds it with synthetic data (1M rows
+each in content_queue and research_sources by default), then runs the
+queries behind the request detail, request list, scheduled list and post
+dispatcher twice: with only the primary-key indexes, and with the model
+indexes. Prints each query's plan and median latency for both runs.
+
+Needs DATABASE_URL pointing at a Postgres database you can create schemas in.
+
+Usage:
+    python scripts/benchmark_indexes.py [--rows 1000000] [--repeat 20] [--keep]
+"""
+
+import sys
+import os
+import time
+import argparse
+import statistics
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Root
+
+from sqlalchemy import text
+from app.database import engine
+from app.models import User, Request, ResearchSource, Summary, ContentQueue
+
+SCHEMA = "bench_indexes"
+TABLES = [User.__table__, Request.__table__, ResearchSource.__table__, Summary.__table__, ContentQueue.__table__]
+INDEXES = [index for table in TABLES for index in table.indexes if not index.name.endswith("_id")]
+
+QUERIES = {
+    "detail: sources": (
+        "SELECT * FROM research_sources WHERE request_id = :rid AND user_id = :uid "
+        "AND verification_status = 'verified'"
+    ),
+    "detail: summary": "SELECT * FROM summaries WHERE request_id = :rid AND user_id = :uid LIMIT 1",
+    "detail: content": "SELECT * FROM content_queue WHERE request_id = :rid AND user_id = :uid LIMIT 1",
+    "request list": (
+        "SELECT id, original_topic, status, created_at FROM requests WHERE user_id = :uid "
+        "ORDER BY created_at DESC, id DESC LIMIT 20"
+    ),
+    "scheduled list": (
+        "SELECT id, status, scheduled_for FROM content_queue WHERE user_id = :uid "
+        "AND status IN ('scheduled', 'scheduled_deleted') ORDER BY scheduled_for"
+    ),
+    "dispatcher claim": (
+        "SELECT id FROM content_queue WHERE status = 'scheduled' AND scheduled_for <= now() "
+        "AND deleted_at IS NULL ORDER BY scheduled_for LIMIT 50"
+    ),
+}
+
+
+def seed(conn, rows: int):
+    users = max(10, rows // 1000)
+    requests = max(100, rows // 10)
+    print(f"🌱 Seeding {users:,} users, {requests:,} requests, {rows:,} sources and {rows:,} content rows...")
+    start = time.perf_counter()
+    conn.execute(text(
+        "INSERT INTO users (id, email, password_hash) "
+        "SELECT i, 'user' || i || '@bench.test', 'x' FROM generate_series(1, :n) i"
+    ), {"n": users})
+    conn.execute(text(
+        "INSERT INTO requests (id, user_id, original_topic, content_type, status, created_at) "
+        "SELECT i, 1 + i % :users, 'Topic ' || i, 'thread', 'completed', "
+        "now() - (i || ' minutes')::interval FROM generate_series(1, :n) i"
+    ), {"n": requests, "users": users})
+    conn.execute(text(
+        "INSERT INTO summaries (request_id, user_id, combined_summary, combined_key_points, source_count) "
+        "SELECT i, 1 + i % :users, 'Summary', ARRAY['point'], 3 FROM generate_series(1, :n) i"
+    ), {"n": requests, "users": users})
+    conn.execute(text(
+        "INSERT INTO research_sources (request_id, user_id, source_type, url, verification_status) "
+        "SELECT 1 + i % :requests, 1 + (i % :requests) % :users, 'google', 'https://example.com/' || i, "
+        "CASE WHEN i % 3 = 0 THEN 'verified' ELSE 'failed' END FROM generate_series(1, :n) i"
+    ), {"n": rows, "requests": requests, "users": users})
+    conn.execute(text(
+        "INSERT INTO content_queue (request_id, user_id, content_type, generated_content, status, platform, "
+        "scheduled_for) "
+        "SELECT 1 + i % :requests, 1 + (i % :requests) % :users, 'thread', repeat('tweet ', 50), "
+        "CASE WHEN i % 50 = 0 THEN 'scheduled' WHEN i % 50 = 1 THEN 'scheduled_deleted' ELSE 'posted' END, "
+        "'typefully', now() + ((i % 20000 - 10000) || ' minutes')::interval FROM generate_series(1, :n) i"
+    ), {"n": rows, "requests": requests, "users": users})
+    conn.execute(text("ANALYZE"))
+    print(f"   done in {time.perf_counter() - start:.1f}s")
+    return {"rid": requests // 2, "uid": (requests // 2) % users}
+
+
+def run_queries(conn, params: dict, repeat: int) -> dict:
+    results = {}
+    for name, sql in QUERIES.items():
+        plan = [row[0] for row in conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"), params)]
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(text(sql), params).fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+        results[name] = (statistics.median(timings), plan)
+    return results
+
+
+def print_results(label: str, results: dict):
+    print(f"\n===== {label} =====")
+    for name, (median_ms, plan) in results.items():
+        print(f"\n▶ {name}: {median_ms:.2f} ms (median)")
+        for line in plan:
+            print(f"    {line}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark hot-path indexes")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows in content_queue and research_sources")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query")
+    parser.add_argument("--keep", action="store_true", help=f"Keep the {SCHEMA} schema afterwards")
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        conn.execute(text(f"SET search_path TO {SCHEMA}"))
+        try:
+            for table in TABLES:
+                table.create(conn)
+            for index in INDEXES:
+                index.drop(conn)
+            params = seed(conn, args.rows)
+            conn.commit()
+
+            before = run_queries(conn, params, args.repeat)
+            print_results("Without composite/partial indexes", before)
+
+            print(f"\n🔧 Creating {len(INDEXES)} indexes: {', '.join(i.name for i in INDEXES)}")
+            for index in INDEXES:
+                index.create(conn)
+            conn.execute(text("ANALYZE"))
+            conn.commit()
+
+            after = run_queries(conn, params, args.repeat)
+            print_results("With indexes", after)
+
+            print("\n📊 Median latency (ms)")
+            print(f"  {'query':<18} {'before':>10} {'after':>10} {'speed-up':>9}")
+            for name in QUERIES:
+                b, a = before[name][0], after[name][0]
+                print(f"  {name:<18} {b:>10.2f} {a:>10.2f} {b / a if a else 0:>8.0f}x")
+        finally:
+            conn.rollback()
+            if not args.keep:
+                conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+                conn.commit()
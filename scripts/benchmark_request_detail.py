@@ -0,0 +1,100 @@
+# scripts/benchmark_request_detail.py
+
+"""
+Benchmark for the request detail read path (GET /content/requests/{id}).
+
+Times three ways of serving one existing request, read-only:
+- legacy:      the previous four queries (request, sources, summary, content)
+- single:      load_request_detail(), one joined query
+- conditional: a repeat poll with a matching If-None-Match inside the cache TTL,
+               which answers 304 from the in-process read model
+
+Prints median/p95 latency and the number of SQL statements each path issues.
+
+Needs DATABASE_URL pointing at a database with at least one completed request.
+
+Usage:
+    python scripts/benchmark_request_detail.py --request-id 42 --user-id 1 [--repeat 200]
+"""
+
+import sys
+import os
+import time
+import argparse
+import statistics
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Root
+
+from sqlalchemy import event
+from app.database import SessionLocal, engine
+from app.models import Request, ResearchSource, Summary, ContentQueue
+from app.services import request_detail
+
+statements = 0
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count(conn, cursor, statement, parameters, context, executemany):
+    global statements
+    statements += 1
+
+
+def legacy_detail(db, request_id: int, user_id: int):
+    request = db.query(Request).filter_by(id=request_id, user_id=user_id).first()
+    sources = db.query(ResearchSource).filter_by(
+        request_id=request_id, user_id=user_id, verification_status="verified"
+    ).all()
+    summary = db.query(Summary).filter_by(request_id=request_id, user_id=user_id).first()
+    content = db.query(ContentQueue).filter_by(request_id=request_id, user_id=user_id).first()
+    return request, sources, summary, content
+
+
+def single_detail(db, request_id: int, user_id: int):
+    return request_detail.load_request_detail(db, request_id, user_id)
+
+
+def conditional_detail(db, request_id: int, user_id: int):
+    etag = request_detail.cached_detail_etag(request_id, user_id)
+    if request_detail.etag_matches(if_none_match, etag):
+        return 304
+    return request_detail.get_request_detail(db, request_id, user_id)
+
+
+def measure(fn, db, request_id: int, user_id: int, repeat: int):
+    global statements
+    fn(db, request_id, user_id)  # warm up
+    db.expunge_all()
+    statements = 0
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(db, request_id, user_id)
+        timings.append((time.perf_counter() - start) * 1000)
+        db.expunge_all()
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1], statements / repeat
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the request detail read path")
+    parser.add_argument("--request-id", type=int, required=True)
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--repeat", type=int, default=200, help="Timed runs per path")
+    args = parser.parse_args()
+
+    # Long TTL so every conditional poll lands inside the cache window
+    request_detail.settings.request_detail_cache_ttl_seconds = 3600
+
+    db = SessionLocal()
+    try:
+        payload, if_none_match = request_detail.get_request_detail(db, args.request_id, args.user_id)
+        if payload is None:
+            sys.exit(f"❌ Request {args.request_id} not found for user {args.user_id}")
+        print(f"🔎 Request {args.request_id}: {len(payload['data']['sources'])} verified sources, ETag {if_none_match}")
+
+        print(f"\n📊 {args.repeat} runs per path")
+        print(f"  {'path':<12} {'median ms':>10} {'p95 ms':>10} {'queries':>8}")
+        for name, fn in (("legacy", legacy_detail), ("single", single_detail), ("conditional", conditional_detail)):
+            median_ms, p95_ms, per_call = measure(fn, db, args.request_id, args.user_id, args.repeat)
+            print(f"  {name:<12} {median_ms:>10.3f} {p95_ms:>10.3f} {per_call:>8.1f}")
+    finally:
+        db.close()
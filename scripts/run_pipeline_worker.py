@@ -0,0 +1,43 @@
+# scripts/run_pipeline_worker.py
+
+"""
+Standalone worker that runs pipeline stages from the pipeline_jobs queue.
+Start as many as needed, on any host that can reach the database:
+
+    python scripts/run_pipeline_worker.py
+    python scripts/run_pipeline_worker.py --stages research --limits research:8
+
+SIGINT/SIGTERM stop claiming new jobs and wait for running ones to finish.
+"""
+
+import argparse
+import signal
+import sys
+import os
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Root
+
+from app.services.job_queue import PipelineWorker, parse_stage_limits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run pipeline stage jobs from the queue.")
+    parser.add_argument("--stages", help="Comma-separated stages to serve (default: all)")
+    parser.add_argument("--limits", help="Per-stage limits, e.g. research:4,content:8 (default: settings)")
+    parser.add_argument("--worker-id", help="Identifier stored on leased jobs (default: host:pid)")
+    args = parser.parse_args()
+
+    limits = parse_stage_limits(args.limits)
+    if args.stages:
+        served = {s.strip() for s in args.stages.split(",") if s.strip()}
+        limits = {stage: limit for stage, limit in limits.items() if stage in served}
+
+    stop_event = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+
+    PipelineWorker(args.worker_id, limits).run_forever(stop_event)
+
+
+if __name__ == "__main__":
+    main()
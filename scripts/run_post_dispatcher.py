@@ -0,0 +1,38 @@
+# scripts/run_post_dispatcher.py
+
+"""
+Standalone daemon that posts scheduled content when it falls due, including
+rows queued by POST /content/queue/bulk/post. Nothing is published without it.
+Safe to run as several replicas against the same database.
+
+    python scripts/run_post_dispatcher.py
+    python scripts/run_post_dispatcher.py --dry-run
+
+SIGINT/SIGTERM finish the current batch, then exit.
+"""
+
+import argparse
+import signal
+import sys
+import os
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Root
+
+from app.services.post_dispatcher import run_dispatcher, dispatcher_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dispatch due scheduled posts.")
+    parser.add_argument("--dry-run", action="store_true", help="Mark posts as sent without calling platforms")
+    args = parser.parse_args()
+
+    stop_event = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+
+    run_dispatcher(stop_event, dry_run=args.dry_run)
+    print("📊 Dispatcher stats:", dispatcher_stats())
+
+
+if __name__ == "__main__":
+    main()